@@ -1,102 +1,741 @@
+import asyncio
 import json
 import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import Optional, Any, Dict
-from datetime import datetime, timedelta
+from typing import Optional, Any, Dict, Hashable, Iterator, Tuple, Callable
 
 load_dotenv()
 
-# In-memory cache for development
-_cache = {}
-_cache_expiry = {}
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache with hit/miss counters"""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it recently used) or None"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Current size and hit/miss counters"""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses
+            }
 
-class CacheManager:
+# Global budget for the shared cache
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "50000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Per-namespace entry limits; the namespace is the key prefix before the first ':'
+NAMESPACE_LIMITS = {
+    "roi_calculation": int(os.getenv("CACHE_MAX_CALCULATIONS", "20000")),
+    "user_preferences": 10000,
+    "market_data": 1000,
+    "tax_data": 1000,
+    "http_response": int(os.getenv("CACHE_MAX_RESPONSES", "5000")),
+}
+
+# Usage counters: sessions tracked at once, how long an idle session is kept, and
+# how often the background sweeper drops expired ones (seconds)
+USAGE_MAX_SESSIONS = int(os.getenv("CACHE_MAX_USAGE_COUNTERS", "20000"))
+USAGE_TTL = 86400
+USAGE_SWEEP_INTERVAL = float(os.getenv("USAGE_SWEEP_INTERVAL", "60"))
+
+# Seconds a computed entry may be served stale while one background refresh runs (0 disables)
+CACHE_STALE_WHILE_REVALIDATE = float(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "0"))
+
+# Full sweep for expired entries after this many writes
+PURGE_INTERVAL = 1000
+
+# Backend selection: "memory" (per process), "sqlite" (a file shared by the
+# workers on one host) or "redis" (shared across hosts)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_URL = os.getenv("CACHE_URL", "")
+
+# With a shared backend, keep hot keys in process for up to this many seconds (0 disables)
+CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", "0"))
+
+# Reference-data version. It is the factor tables' content fingerprint, so every
+# worker serving the same data reports the same version (and ETags) even with
+# process-local stores, and a reseed that changes the data changes it. When the
+# fingerprint cannot be computed every worker falls back to version 0.
+DATA_VERSION_KEY = "data_version:reference"
+DATA_VERSION_TTL = 365 * 86400
+
+# In-process cache contents are written here on shutdown and reloaded on startup
+# ("" disables). The data version and the responses cached under it are left out:
+# a restored version would outlive a reseed made while the process was down, and
+# those response bodies carry its ETag, so both are rebuilt from the current data.
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "cache_snapshot.bin")
+SNAPSHOT_EXCLUDED_NAMESPACES = ("data_version", "http_response")
+
+# Snapshot layout: header (magic, format version, wall-clock save time), then a
+# zlib stream of records (key length, remaining ttl, kind, value length, key, value)
+_SNAPSHOT_MAGIC = b"IRCS"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<4sBd")
+_SNAPSHOT_RECORD = struct.Struct("<HdBI")
+_SNAPSHOT_BYTES, _SNAPSHOT_JSON = 0, 1
+
+def _approximate_size(value: Any) -> int:
+    """Serialized size of a value in bytes, used for the byte budget"""
+    if isinstance(value, bytes):
+        return len(value)
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "touched")
+    
+    def __init__(self, value: Any, expires_at: float, size: int, touched: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.touched = touched
+
+class TTLCache:
+    """Bounded, thread-safe cache with per-key TTL and LRU eviction.
+    
+    Keys are strings of the form "namespace:rest". Entries expire on a monotonic
+    clock; when a namespace or the whole cache runs over its entry or byte budget
+    the least recently used entries are evicted first.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        namespace_limits: Optional[Dict[str, int]] = None,
+        clock=time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_limits = dict(namespace_limits or {})
+        self.clock = clock
+        self._namespaces: Dict[str, "OrderedDict[str, _Entry]"] = {}
+        self._entries = 0
+        self._bytes = 0
+        self._tick = 0
+        self._writes = 0
+        self._lock = threading.RLock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+    
+    @staticmethod
+    def namespace(key: str) -> str:
+        return key.split(":", 1)[0]
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live value (marking it recently used) or None"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            return entry.value
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds"""
+        size = _approximate_size(value)
+        with self._lock:
+            self._store(key, value, ttl, size)
+    
+    def incr(self, key: str, amount: int = 1, ttl: float = 86400) -> int:
+        """Atomically add to an integer value (missing or expired counts as 0).
+        
+        ttl only applies when the key is created; increments keep the existing expiry.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                value = amount
+            else:
+                value = entry.value + amount
+                ttl = entry.expires_at - self.clock()
+            self._store(key, value, ttl, _approximate_size(value))
+            return value
+    
+    def delete(self, key: str) -> bool:
+        """Remove a key; returns whether it was present"""
+        with self._lock:
+            entries = self._namespaces.get(self.namespace(key))
+            if entries is None or key not in entries:
+                return False
+            self._remove(entries, key)
+            return True
+    
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any]]:
+        """Snapshot of the live (key, value) pairs in a namespace"""
+        with self._lock:
+            now = self.clock()
+            entries = self._namespaces.get(namespace, {})
+            return iter([(key, entry.value) for key, entry in entries.items() if entry.expires_at > now])
+    
+    def purge_expired(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        with self._lock:
+            now = self.clock()
+            removed = 0
+            for entries in self._namespaces.values():
+                for key in [key for key, entry in entries.items() if entry.expires_at <= now]:
+                    self._remove(entries, key)
+                    removed += 1
+            self._counters["expirations"] += removed
+            return removed
+    
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._namespaces.clear()
+            self._entries = 0
+            self._bytes = 0
+    
+    def stats(self, detailed: bool = False) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size, overall and per namespace"""
+        with self._lock:
+            return {
+                "backend": "memory",
+                **self._counters,
+                "entries": self._entries,
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "namespaces": {
+                    namespace: {
+                        "entries": len(entries),
+                        "limit": self.namespace_limits.get(namespace),
+                    }
+                    for namespace, entries in self._namespaces.items()
+                },
+            }
+    
+    def dump(self, path: str, exclude: Tuple[str, ...] = ()) -> int:
+        """Write live entries to a file, least recently used first; returns how many.
+        
+        Values that are neither bytes nor JSON-serializable are skipped. The file is
+        replaced atomically, so workers sharing a path never read a partial snapshot.
+        """
+        with self._lock:
+            now = self.clock()
+            live = sorted(
+                (
+                    (entry.touched, key, entry.expires_at - now, entry.value)
+                    for namespace, entries in self._namespaces.items() if namespace not in exclude
+                    for key, entry in entries.items() if entry.expires_at > now
+                ),
+                key=lambda item: item[0]
+            )
+        
+        records = []
+        for _, key, remaining, value in live:
+            if isinstance(value, bytes):
+                kind, data = _SNAPSHOT_BYTES, value
+            else:
+                try:
+                    kind, data = _SNAPSHOT_JSON, json.dumps(value, separators=(",", ":")).encode()
+                except (TypeError, ValueError):
+                    continue
+            key_data = key.encode()
+            records.append(_SNAPSHOT_RECORD.pack(len(key_data), remaining, kind, len(data)) + key_data + data)
+        
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as snapshot:
+            snapshot.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, time.time()))
+            snapshot.write(zlib.compress(b"".join(records), 1))
+        os.replace(temporary, path)
+        return len(records)
+    
+    def load(self, path: str, batch_size: int = 500) -> int:
+        """Restore a dump() file, minus the time since it was written; returns how many.
+        
+        Keys already present are left alone since they are newer than the snapshot.
+        Entries go in in small batches so requests are not blocked behind the load.
+        """
+        with open(path, "rb") as snapshot:
+            magic, version, saved_at = _SNAPSHOT_HEADER.unpack(snapshot.read(_SNAPSHOT_HEADER.size))
+            if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported cache snapshot in {path}")
+            data = zlib.decompress(snapshot.read())
+        
+        elapsed = max(0.0, time.time() - saved_at)
+        loaded, offset, batch = 0, 0, []
+        while offset < len(data):
+            key_length, remaining, kind, value_length = _SNAPSHOT_RECORD.unpack_from(data, offset)
+            offset += _SNAPSHOT_RECORD.size
+            key = data[offset:offset + key_length].decode()
+            value = data[offset + key_length:offset + key_length + value_length]
+            offset += key_length + value_length
+            if remaining - elapsed > 0:
+                batch.append((key, value if kind == _SNAPSHOT_BYTES else json.loads(value), remaining - elapsed))
+            if len(batch) >= batch_size or (offset >= len(data) and batch):
+                with self._lock:
+                    for key, value, ttl in batch:
+                        if self._lookup(key) is None:
+                            self._store(key, value, ttl, _approximate_size(value))
+                            loaded += 1
+                batch = []
+        return loaded
+    
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        """Live entry for a key, touched for LRU; expired entries are dropped. Lock held."""
+        entries = self._namespaces.get(self.namespace(key))
+        if entries is None:
+            return None
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self.clock():
+            self._remove(entries, key)
+            self._counters["expirations"] += 1
+            return None
+        self._tick += 1
+        entry.touched = self._tick
+        entries.move_to_end(key)
+        return entry
+    
+    def _store(self, key: str, value: Any, ttl: float, size: int):
+        namespace = self.namespace(key)
+        entries = self._namespaces.setdefault(namespace, OrderedDict())
+        if key in entries:
+            self._remove(entries, key)
+        self._tick += 1
+        entries[key] = _Entry(value, self.clock() + ttl, size, self._tick)
+        self._entries += 1
+        self._bytes += size
+        
+        self._writes += 1
+        if self._writes % PURGE_INTERVAL == 0:
+            self.purge_expired()
+        
+        limit = self.namespace_limits.get(namespace)
+        while limit is not None and len(entries) > limit:
+            self._evict(entries)
+        while self._entries > self.max_entries or self._bytes > self.max_bytes:
+            # Globally least recently used: the oldest head across namespaces
+            oldest = min(
+                (candidate for candidate in self._namespaces.values() if candidate),
+                key=lambda candidate: next(iter(candidate.values())).touched
+            )
+            self._evict(oldest)
+    
+    def _evict(self, entries: "OrderedDict[str, _Entry]"):
+        key = next(iter(entries))
+        self._remove(entries, key)
+        self._counters["evictions"] += 1
+    
+    def _remove(self, entries: "OrderedDict[str, _Entry]", key: str):
+        entry = entries.pop(key)
+        self._entries -= 1
+        self._bytes -= entry.size
+
+class UsageTracker:
+    """Per-session usage counters with running totals.
+    
+    Every session shares one TTL, so keeping sessions in last-use order also keeps
+    them in expiry order: expired sessions are always at the front and sweeping
+    costs O(expired). Totals are maintained incrementally and read in O(1).
+    """
+    
+    def __init__(self, ttl: float = USAGE_TTL, max_sessions: int = USAGE_MAX_SESSIONS, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions: "OrderedDict[str, list]" = OrderedDict()  # session_id -> [count, expires_at]
+        self._active_calls = 0
+        self._total_calls = 0
+        self._total_sessions = 0
+        self._expired_sessions = 0
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def increment(self, session_id: str, amount: int = 1) -> int:
+        """Count a use of a session and push its expiry out"""
+        with self._lock:
+            self._drop_expired(self.clock())
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                entry = [0, 0.0]
+                self._total_sessions += 1
+            entry[0] += amount
+            entry[1] = self.clock() + self.ttl
+            self._sessions[session_id] = entry
+            self._active_calls += amount
+            self._total_calls += amount
+            while len(self._sessions) > self.max_sessions:
+                self._pop_oldest()
+            return entry[0]
+    
+    def count(self, session_id: str) -> int:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return entry[0] if entry is not None and entry[1] > self.clock() else 0
+    
+    def discard(self, session_id: str):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._active_calls -= entry[0]
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Live per-session counts"""
+        with self._lock:
+            now = self.clock()
+            return {session_id: entry[0] for session_id, entry in self._sessions.items() if entry[1] > now}
+    
+    def totals(self) -> Dict[str, int]:
+        """Aggregate counters; active figures may include sessions that expired since the last sweep"""
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "active_calls": self._active_calls,
+                "total_sessions": self._total_sessions,
+                "total_calls": self._total_calls,
+                "expired_sessions": self._expired_sessions,
+            }
+    
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were removed"""
+        with self._lock:
+            return self._drop_expired(self.clock())
+    
+    def start_sweeper(self, interval: float = USAGE_SWEEP_INTERVAL):
+        """Sweep expired sessions every `interval` seconds in a daemon thread"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+        
+        def run():
+            while not self._stop.wait(interval):
+                self.sweep()
+        
+        self._sweeper = threading.Thread(target=run, name="usage-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self):
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+    
+    def _drop_expired(self, now: float) -> int:
+        removed = 0
+        while self._sessions:
+            entry = next(iter(self._sessions.values()))
+            if entry[1] > now:
+                break
+            self._pop_oldest()
+            self._expired_sessions += 1
+            removed += 1
+        return removed
+    
+    def _pop_oldest(self):
+        _, entry = self._sessions.popitem(last=False)
+        self._active_calls -= entry[0]
+
+class SingleFlight:
+    """Coalesces concurrent computations of the same key into one.
+    
+    The first caller for a key runs the computation; callers that arrive while it
+    is running wait for and share its result (or exception).
+    """
+    
     def __init__(self):
-        self.cache = _cache
-        self.expiry = _cache_expiry
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+    
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Future for the key's running computation and whether the caller leads it"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+    
+    def _finish(self, key: str, future: Future, compute: Callable[[], Any]) -> Any:
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+    
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+    
+    def do(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Run compute once for all concurrent callers with the same key (blocking)"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        return self._finish(key, future, compute)
+    
+    async def do_async(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Like do, for coroutines: compute runs in a worker thread so waiters keep the event loop free"""
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, self._finish_quietly, key, future, compute)
+        return await asyncio.wrap_future(future)
+    
+    def _finish_quietly(self, key: str, future: Future, compute: Callable[[], Any]):
+        try:
+            self._finish(key, future, compute)
+        except BaseException:
+            pass  # delivered to the waiters through the future
+
+def create_cache_backend(backend: str = CACHE_BACKEND, url: str = CACHE_URL, l1_ttl: float = CACHE_L1_TTL):
+    """Build the configured cache backend, optionally tiered behind an in-process L1"""
+    if backend == "memory":
+        return TTLCache(namespace_limits=NAMESPACE_LIMITS)
     
-    def set_calculation(self, session_id: str, calculation_data: Dict[str, Any], expire: int = 3600):
-        """Store ROI calculation in cache"""
-        key = f"roi_calculation:{session_id}"
-        self.cache[key] = calculation_data
-        self.expiry[key] = datetime.now() + timedelta(seconds=expire)
+    from app.cache_backends import SQLiteCache, RedisCache, RespClient, TieredCache
+    if backend == "sqlite":
+        shared = SQLiteCache(url.replace("sqlite:///", "", 1) if url else "./cache.db", max_entries=CACHE_MAX_ENTRIES)
+    elif backend == "redis":
+        shared = RedisCache(RespClient.from_url(url or "redis://localhost:6379/0"))
+    else:
+        raise ValueError(f"Unknown cache backend: {backend}")
+    
+    if l1_ttl > 0:
+        return TieredCache(TTLCache(namespace_limits=NAMESPACE_LIMITS), shared, l1_ttl=l1_ttl)
+    return shared
+
+class CacheManager:
+    def __init__(self, store=None, usage: Optional[UsageTracker] = None):
+        self.store = store if store is not None else create_cache_backend()
+        self.usage = usage if usage is not None else UsageTracker()
+        self.flights = SingleFlight()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+    
+    def _put_computed(self, key: str, value: Any, expire: float, stale_while_revalidate: float):
+        """Store a computed value with the time it stays fresh; it is kept stale for the grace period"""
+        envelope = {"value": value, "fresh_until": time.time() + expire}
+        self.store.set(key, envelope, expire + stale_while_revalidate)
+    
+    def _compute_and_put(self, key: str, compute: Callable[[], Any], expire: float, stale_while_revalidate: float) -> Any:
+        value = compute()
+        self._put_computed(key, value, expire, stale_while_revalidate)
+        return value
+    
+    def _cached_or_refresh(self, key: str, compute: Callable[[], Any], expire: float, stale_while_revalidate: float):
+        """(hit, value) for a key; a stale hit schedules a single background refresh"""
+        envelope = self.store.get(key)
+        if envelope is None:
+            return False, None
+        if envelope["fresh_until"] <= time.time() and not self.flights.in_flight(key):
+            self._refresher.submit(
+                self.flights.do, key,
+                lambda: self._compute_and_put(key, compute, expire, stale_while_revalidate)
+            )
+        return True, envelope["value"]
+    
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        expire: float,
+        stale_while_revalidate: float = CACHE_STALE_WHILE_REVALIDATE
+    ) -> Any:
+        """Cached value for a key, computing it once for all concurrent misses.
+        
+        With stale_while_revalidate > 0 an expired value keeps being served for
+        that many seconds while one background refresh replaces it.
+        """
+        hit, value = self._cached_or_refresh(key, compute, expire, stale_while_revalidate)
+        if hit:
+            return value
+        return self.flights.do(key, lambda: self._compute_and_put(key, compute, expire, stale_while_revalidate))
+    
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        expire: float,
+        stale_while_revalidate: float = CACHE_STALE_WHILE_REVALIDATE
+    ) -> Any:
+        """get_or_compute for async handlers; misses are computed in a worker thread"""
+        hit, value = self._cached_or_refresh(key, compute, expire, stale_while_revalidate)
+        if hit:
+            return value
+        return await self.flights.do_async(
+            key, lambda: self._compute_and_put(key, compute, expire, stale_while_revalidate)
+        )
+    
+    def set_calculation(
+        self,
+        session_id: str,
+        calculation_data: Dict[str, Any],
+        expire: int = 3600,
+        business_scenario_name: Optional[str] = None
+    ):
+        """Store ROI calculation in cache, packed into bytes (see result_codec)"""
+        from app.services.result_codec import encode_result
+        self.store.set(
+            f"roi_calculation:{session_id}",
+            encode_result(calculation_data, business_scenario_name),
+            expire
+        )
     
     def get_calculation(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve ROI calculation from cache"""
-        key = f"roi_calculation:{session_id}"
-        if key in self.cache and datetime.now() < self.expiry.get(key, datetime.min):
-            return self.cache[key]
-        return None
+        """Retrieve ROI calculation from cache, decoding it on read"""
+        from app.services.result_codec import decode_result
+        data = self.store.get(f"roi_calculation:{session_id}")
+        if isinstance(data, bytes):
+            return decode_result(data)
+        return data
     
     def set_user_preferences(self, session_id: str, preferences: Dict[str, Any], expire: int = 86400):
         """Store user preferences in cache"""
-        key = f"user_preferences:{session_id}"
-        self.cache[key] = preferences
-        self.expiry[key] = datetime.now() + timedelta(seconds=expire)
+        self.store.set(f"user_preferences:{session_id}", preferences, expire)
     
     def get_user_preferences(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve user preferences from cache"""
-        key = f"user_preferences:{session_id}"
-        if key in self.cache and datetime.now() < self.expiry.get(key, datetime.min):
-            return self.cache[key]
-        return None
+        return self.store.get(f"user_preferences:{session_id}")
     
     def set_market_data(self, scenario_id: int, market_data: Dict[str, Any], expire: int = 86400):
         """Store market data in cache"""
-        key = f"market_data:{scenario_id}"
-        self.cache[key] = market_data
-        self.expiry[key] = datetime.now() + timedelta(seconds=expire)
+        self._put_computed(f"market_data:{scenario_id}", market_data, expire, CACHE_STALE_WHILE_REVALIDATE)
     
     def get_market_data(self, scenario_id: int) -> Optional[Dict[str, Any]]:
-        """Retrieve market data from cache"""
-        key = f"market_data:{scenario_id}"
-        if key in self.cache and datetime.now() < self.expiry.get(key, datetime.min):
-            return self.cache[key]
-        return None
+        """Retrieve market data from cache (possibly stale within the revalidation window)"""
+        envelope = self.store.get(f"market_data:{scenario_id}")
+        return envelope["value"] if envelope is not None else None
+    
+    async def get_or_compute_market_data(
+        self, scenario_id: int, compute: Callable[[], Dict[str, Any]], expire: int = 86400
+    ) -> Dict[str, Any]:
+        """Market data from cache, computed once for concurrent misses"""
+        return await self.aget_or_compute(f"market_data:{scenario_id}", compute, expire)
     
     def set_tax_data(self, country_code: str, tax_data: Dict[str, Any], expire: int = 86400):
         """Store tax data in cache"""
-        key = f"tax_data:{country_code}"
-        self.cache[key] = tax_data
-        self.expiry[key] = datetime.now() + timedelta(seconds=expire)
+        self.store.set(f"tax_data:{country_code}", tax_data, expire)
     
     def get_tax_data(self, country_code: str) -> Optional[Dict[str, Any]]:
         """Retrieve tax data from cache"""
-        key = f"tax_data:{country_code}"
-        if key in self.cache and datetime.now() < self.expiry.get(key, datetime.min):
-            return self.cache[key]
-        return None
+        return self.store.get(f"tax_data:{country_code}")
+    
+    def get_data_version(self) -> int:
+        """Current reference-data version (see DATA_VERSION_KEY)"""
+        version = self.store.get(DATA_VERSION_KEY)
+        if version is None:
+            version = self._reference_fingerprint()
+            self.store.set(DATA_VERSION_KEY, version, DATA_VERSION_TTL)
+        return version
+    
+    def bump_data_version(self) -> int:
+        """Mark reference data as changed, e.g. after a reseed (call after reloading the factor tables)"""
+        # Unchanged content keeps its version, so cached responses and ETags stay valid
+        version = self._reference_fingerprint()
+        self.store.set(DATA_VERSION_KEY, version, DATA_VERSION_TTL)
+        return version
+    
+    def _reference_fingerprint(self) -> int:
+        try:
+            from app.services.factor_tables import get_factor_tables
+            return get_factor_tables().fingerprint
+        except Exception as e:
+            print(f"⚠️  Could not fingerprint reference data, using data version 0: {e}")
+            return 0
     
     def increment_usage_counter(self, session_id: str):
         """Increment usage counter for analytics"""
-        key = f"usage_counter:{session_id}"
-        if key in self.cache:
-            self.cache[key] += 1
-        else:
-            self.cache[key] = 1
-        self.expiry[key] = datetime.now() + timedelta(seconds=86400)
+        self.usage.increment(session_id)
     
     def get_usage_stats(self) -> Dict[str, int]:
         """Get usage statistics"""
-        stats = {}
-        for key in self.cache:
-            if key.startswith("usage_counter:") and datetime.now() < self.expiry.get(key, datetime.min):
-                session_id = key.split(":")[1]
-                stats[session_id] = self.cache[key]
-        return stats
+        return self.usage.snapshot()
+    
+    def get_usage_totals(self) -> Dict[str, int]:
+        """Aggregate usage counters, read in O(1)"""
+        return self.usage.totals()
     
     def clear_session_data(self, session_id: str):
         """Clear all session-related data"""
-        patterns = [
+        for key in (
             f"roi_calculation:{session_id}",
-            f"user_preferences:{session_id}",
-            f"usage_counter:{session_id}"
-        ]
-        for pattern in patterns:
-            if pattern in self.cache:
-                del self.cache[pattern]
-            if pattern in self.expiry:
-                del self.expiry[pattern]
+            f"user_preferences:{session_id}"
+        ):
+            self.store.delete(key)
+        self.usage.discard(session_id)
+    
+    def save_snapshot(self, path: str = CACHE_SNAPSHOT_PATH) -> int:
+        """Write the in-process cache to disk; shared backends already outlive the process"""
+        if not path or not hasattr(self.store, "dump"):
+            return 0
+        return self.store.dump(path, exclude=SNAPSHOT_EXCLUDED_NAMESPACES)
+    
+    def load_snapshot(self, path: str = CACHE_SNAPSHOT_PATH) -> int:
+        """Reload a snapshot written by save_snapshot, if there is one"""
+        if not path or not hasattr(self.store, "load") or not os.path.exists(path):
+            return 0
+        return self.store.load(path)
+    
+    def start_snapshot_load(self, path: str = CACHE_SNAPSHOT_PATH) -> threading.Thread:
+        """Load the snapshot in a background thread so startup is not held up"""
+        def run():
+            try:
+                loaded = self.load_snapshot(path)
+                if loaded:
+                    print(f"♻️ Restored {loaded} cache entries from {path}")
+            except Exception as e:
+                print(f"❌ Error loading cache snapshot: {e}")
+        
+        thread = threading.Thread(target=run, name="cache-snapshot-load", daemon=True)
+        thread.start()
+        return thread
+    
+    def stats(self, detailed: bool = False) -> Dict[str, Any]:
+        """Hit/miss/eviction statistics and size of the cache; detailed includes sizes that are costly to count"""
+        return {**self.store.stats(detailed), "coalesced": self.flights.coalesced}
 
 # Global cache manager instance
 cache_manager = CacheManager()
\ No newline at end of file
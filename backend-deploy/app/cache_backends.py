@@ -0,0 +1,404 @@
+import json
+import socket
+import sqlite3
+import threading
+import time
+from typing import Optional, Any, Dict, Iterator, List, Tuple
+from urllib.parse import urlparse, unquote
+
+# Marks raw bytes values in stores that otherwise hold JSON text
+BYTES_MARKER = b"\x00"
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+def _encode(value: Any):
+    """Stored form of a value: bytes are kept as they are, everything else becomes JSON"""
+    return value if isinstance(value, bytes) else _dumps(value)
+
+def _decode(data) -> Any:
+    return data if isinstance(data, bytes) else json.loads(data)
+
+class SQLiteCache:
+    """Cache stored in a SQLite file, shared by every worker on the host.
+
+    The file runs in WAL mode with a memory-mapped read path, so readers in other
+    processes do not block writers. Expiry uses the wall clock since monotonic
+    clocks are not comparable across processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 50000, purge_interval: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not thread-safe"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA mmap_size=67108864")
+            self._local.connection = connection
+        return connection
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return _decode(row[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, _encode(value), time.time() + ttl)
+        )
+        self._after_write()
+
+    def incr(self, key: str, amount: int = 1, ttl: float = 86400) -> int:
+        connection = self._connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            # The TTL only applies to a new key; increments keep the existing expiry
+            value, expires_at = (json.loads(row[0]) + amount, row[1]) if row is not None else (amount, now + ttl)
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, _dumps(value), expires_at)
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self._after_write()
+        return value
+
+    def delete(self, key: str) -> bool:
+        cursor = self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT key, value FROM cache_entries WHERE key >= ? AND key < ? AND expires_at > ?",
+            (f"{namespace}:", f"{namespace};", time.time())
+        ).fetchall()
+        return iter([(key, _decode(value)) for key, value in rows])
+
+    def purge_expired(self) -> int:
+        """Drop expired entries, then the soonest-expiring ones beyond max_entries"""
+        connection = self._connection()
+        expired = connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)).rowcount
+        overflow = connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+        evicted = 0
+        if overflow > 0:
+            evicted = connection.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)", (overflow,)
+            ).rowcount
+        self._count("expirations", expired)
+        self._count("evictions", evicted)
+        return expired
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entries")
+
+    def stats(self, detailed: bool = False) -> Dict[str, Any]:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries"
+        ).fetchone()
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            **counters,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+        }
+
+    def _after_write(self):
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.purge_interval == 0
+        if due:
+            self.purge_expired()
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+class RespClient:
+    """Minimal Redis (RESP2) client: one blocking connection per thread"""
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RespClient":
+        """redis://[:password@]host[:port][/db]"""
+        parsed = urlparse(url)
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=unquote(parsed.password) if parsed.password else None,
+        )
+
+    def _connect(self):
+        connection = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.socket = connection
+        self._local.reader = connection.makefile("rb")
+        if self.password:
+            self._call("AUTH", self.password)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def _disconnect(self):
+        connection = getattr(self._local, "socket", None)
+        self._local.socket = None
+        if connection is not None:
+            try:
+                self._local.reader.close()
+                connection.close()
+            except OSError:
+                pass
+
+    def execute(self, *args) -> Any:
+        """Send one command and return its decoded reply; reconnects once on a dropped connection"""
+        for attempt in (0, 1):
+            if getattr(self._local, "socket", None) is None:
+                self._connect()
+            try:
+                return self._call(*args)
+            except (ConnectionError, OSError):
+                self._disconnect()
+                if attempt:
+                    raise
+
+    def transaction(self, *commands: tuple) -> List[Any]:
+        """Run commands atomically in one MULTI/EXEC round trip; returns their replies"""
+        for attempt in (0, 1):
+            if getattr(self._local, "socket", None) is None:
+                self._connect()
+            try:
+                self._local.socket.sendall(b"".join(
+                    self._encode(*command) for command in (("MULTI",), *commands, ("EXEC",))
+                ))
+                # +OK for MULTI and +QUEUED per command. Every reply is read even after an
+                # error so the connection stays in step; a queueing error aborts EXEC.
+                error = None
+                for _ in range(len(commands) + 1):
+                    try:
+                        self._read_reply()
+                    except RespError as e:
+                        error = error or e
+                try:
+                    replies = self._read_reply()
+                except RespError as e:
+                    raise error or e
+                if replies is None:
+                    raise RespError("Transaction aborted")
+                for reply in replies:
+                    if isinstance(reply, RespError):
+                        raise reply
+                return replies
+            except (ConnectionError, OSError):
+                self._disconnect()
+                if attempt:
+                    raise
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _call(self, *args) -> Any:
+        self._local.socket.sendall(self._encode(*args))
+        return self._read_reply()
+
+    def _read_reply(self, nested: bool = False) -> Any:
+        """Decode one reply. Error replies raise RespError, except inside arrays
+        (e.g. EXEC results), where they are returned so the rest is still read."""
+        line = self._local.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            if nested:
+                return RespError(payload.decode())
+            raise RespError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._local.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [self._read_reply(nested=True) for _ in range(count)]
+        raise RespError(f"Unexpected reply: {line!r}")
+
+class RedisCache:
+    """Cache kept in a Redis-protocol server shared by every worker and host.
+
+    Keys are prefixed so clear() only touches this application's entries;
+    expiry and eviction are left to the server.
+    """
+
+    def __init__(self, client: RespClient, prefix: str = "investroi:"):
+        self.client = client
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.client.execute("GET", self.prefix + key)
+        if data is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        if data.startswith(BYTES_MARKER):
+            return data[1:]
+        return json.loads(data)
+
+    def set(self, key: str, value: Any, ttl: float):
+        data = BYTES_MARKER + value if isinstance(value, bytes) else _dumps(value)
+        self.client.execute("SET", self.prefix + key, data, "PX", max(1, int(ttl * 1000)))
+
+    def incr(self, key: str, amount: int = 1, ttl: float = 86400) -> int:
+        # SET NX creates a missing key as 0 with the TTL; INCRBY keeps whatever expiry is set.
+        # Both run in one MULTI/EXEC, so a key is never left without an expiry.
+        return self.client.transaction(
+            ("SET", self.prefix + key, 0, "PX", max(1, int(ttl * 1000)), "NX"),
+            ("INCRBY", self.prefix + key, amount),
+        )[-1]
+
+    def delete(self, key: str) -> bool:
+        return self.client.execute("DEL", self.prefix + key) > 0
+
+    def _scan(self, pattern: str) -> List[bytes]:
+        keys, cursor = [], b"0"
+        while True:
+            cursor, batch = self.client.execute("SCAN", cursor, "MATCH", pattern, "COUNT", 1000)
+            keys.extend(batch)
+            if cursor in (b"0", "0"):
+                return keys
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any]]:
+        keys = self._scan(f"{self.prefix}{namespace}:*")
+        if not keys:
+            return iter([])
+        values = self.client.execute("MGET", *keys)
+        start = len(self.prefix)
+        return iter([
+            (key.decode()[start:], value[1:] if value.startswith(BYTES_MARKER) else json.loads(value))
+            for key, value in zip(keys, values) if value is not None
+        ])
+
+    def clear(self):
+        keys = self._scan(f"{self.prefix}*")
+        for offset in range(0, len(keys), 500):
+            self.client.execute("DEL", *keys[offset:offset + 500])
+
+    def stats(self, detailed: bool = False) -> Dict[str, Any]:
+        """Counters; detailed adds the entry count, which SCANs every key under the prefix"""
+        with self._lock:
+            counters = dict(self._counters)
+        stats = {
+            "backend": "redis",
+            "server": f"{self.client.host}:{self.client.port}/{self.client.db}",
+            **counters,
+        }
+        if detailed:
+            stats["entries"] = len(self._scan(f"{self.prefix}*"))
+        return stats
+
+class TieredCache:
+    """Process-local L1 in front of a shared L2.
+
+    Reads are served from L1 when possible; L1 copies live at most l1_ttl seconds,
+    which bounds how stale another worker's write can look. Writes and counters
+    go to L2, the source of truth.
+    """
+
+    def __init__(self, l1, l2, l1_ttl: float = 5.0):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.l1.get(key)
+        if value is None:
+            value = self.l2.get(key)
+            if value is not None:
+                self.l1.set(key, value, self.l1_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.l2.set(key, value, ttl)
+        self.l1.set(key, value, min(ttl, self.l1_ttl))
+
+    def incr(self, key: str, amount: int = 1, ttl: float = 86400) -> int:
+        self.l1.delete(key)
+        return self.l2.incr(key, amount, ttl)
+
+    def delete(self, key: str) -> bool:
+        self.l1.delete(key)
+        return self.l2.delete(key)
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any]]:
+        return self.l2.items(namespace)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def stats(self, detailed: bool = False) -> Dict[str, Any]:
+        return {
+            "backend": "tiered",
+            "l1_ttl": self.l1_ttl,
+            "l1": self.l1.stats(detailed),
+            "l2": self.l2.stats(detailed),
+        }
@@ -1,5 +1,7 @@
 from sqlalchemy.orm import sessionmaker
 from app.database import engine, TaxCountry
+from app.services.factor_tables import reload_factor_tables
+from app.cache import cache_manager
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -228,6 +230,11 @@ def seed_all_countries():
         print("✅ All countries seeded successfully!")
         print(f"   - {len(countries_data)} countries with comprehensive tax data")
         
+        # Pick up the new country ids in the calculator
+        reload_factor_tables(db)
+        # and give reference endpoints new ETags
+        cache_manager.bump_data_version()
+        
         return len(countries_data)
         
     except Exception as e:
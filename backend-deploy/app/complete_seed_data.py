@@ -2,6 +2,8 @@ import json
 import re
 from sqlalchemy.orm import sessionmaker
 from app.database import engine, BusinessScenario, MiniScenario, TaxCountry
+from app.services.factor_tables import reload_factor_tables
+from app.cache import cache_manager
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -209,6 +211,11 @@ def seed_complete_database():
         print(f"   - {len(business_scenarios) * 6} mini scenarios (6 per business scenario)")
         print(f"   - {len(tax_countries)} countries with tax data")
         
+        # Pick up the new scenario and country ids in the calculator
+        reload_factor_tables(db)
+        # and give reference endpoints new ETags
+        cache_manager.bump_data_version()
+        
     except Exception as e:
         print(f"❌ Error seeding database: {e}")
         db.rollback()
@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Numeric
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Numeric, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool, AsyncAdaptedQueuePool
 from sqlalchemy.sql import func
+from typing import Dict, Any, Optional
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,11 +15,228 @@ load_dotenv()
 # Database URL - Use SQLite for development/testing
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 
+# Engine profiles: pool sizing and connection settings per kind of database.
+# DB_PROFILE picks one explicitly; otherwise it follows the URL.
+ENGINE_PROFILES = {
+    "postgres": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+    },
+    # One file shared by every connection; WAL lets readers run alongside the writer
+    "sqlite-file": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "busy_timeout_ms": 15000,
+    },
+    # Each connection would get its own empty database, so all sessions share one
+    "sqlite-memory": {
+        "pool_pre_ping": False,
+    },
+}
+
+# SQLite pragmas applied to every new connection
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+def engine_profile_name(url: str = DATABASE_URL) -> str:
+    """Profile for a database URL, unless DB_PROFILE overrides it"""
+    if os.getenv("DB_PROFILE"):
+        return os.getenv("DB_PROFILE")
+    if url.startswith("sqlite"):
+        return "sqlite-memory" if url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url else "sqlite-file"
+    return "postgres"
+
+def engine_settings(profile: str) -> Dict[str, Any]:
+    """A profile's settings with DB_POOL_* / DB_STATEMENT_TIMEOUT_MS environment overrides"""
+    settings = dict(ENGINE_PROFILES[profile])
+    overrides = {
+        "pool_size": ("DB_POOL_SIZE", int),
+        "max_overflow": ("DB_MAX_OVERFLOW", int),
+        "pool_timeout": ("DB_POOL_TIMEOUT", float),
+        "pool_recycle": ("DB_POOL_RECYCLE", int),
+        "pool_pre_ping": ("DB_POOL_PRE_PING", lambda value: value.lower() in ("1", "true", "yes")),
+        "statement_timeout_ms": ("DB_STATEMENT_TIMEOUT_MS", int),
+    }
+    for setting, (variable, parse) in overrides.items():
+        value = os.getenv(variable)
+        if value is not None:
+            settings[setting] = parse(value)
+    return settings
+
+class PoolStats:
+    """Checkout counters and time spent waiting for a pooled connection"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+    
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+    
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "wait_ms_avg": round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+            }
+
+# Global pool statistics instance (survives pool re-creation after dispose())
+pool_stats = PoolStats()
+
+class _TimedCheckout:
+    """Pool mixin that times every checkout, including waits for a free connection"""
+    
+    stats = pool_stats
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class TimedStaticPool(_TimedCheckout, StaticPool):
+    pass
+
+# Global pool statistics instance for the async engine
+async_pool_stats = PoolStats()
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    stats = async_pool_stats
+
+class TimedAsyncStaticPool(_TimedCheckout, StaticPool):
+    stats = async_pool_stats
+
+def async_database_url(url: str = DATABASE_URL) -> str:
+    """The same database through an asyncio driver (aiosqlite or asyncpg)"""
+    scheme, rest = url.split("://", 1)
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    return f"postgresql+asyncpg://{rest}"
+
+def _engine_options(profile: str, settings: Dict[str, Any], asynchronous: bool) -> Dict[str, Any]:
+    """create_engine arguments for a profile, for the blocking or the asyncio driver"""
+    if profile == "postgres":
+        statement_timeout = str(settings["statement_timeout_ms"])
+        if asynchronous:
+            connect_args = {"server_settings": {"statement_timeout": statement_timeout}}
+        else:
+            connect_args = {"options": f"-c statement_timeout={statement_timeout}"}
+    else:
+        connect_args = {"check_same_thread": False}
+        if "busy_timeout_ms" in settings:
+            connect_args["timeout"] = settings["busy_timeout_ms"] / 1000
+    
+    if profile == "sqlite-memory":
+        pool_options = {"poolclass": TimedAsyncStaticPool if asynchronous else TimedStaticPool}
+    else:
+        pool_options = {
+            "poolclass": TimedAsyncQueuePool if asynchronous else TimedQueuePool,
+            "pool_size": settings["pool_size"],
+            "max_overflow": settings["max_overflow"],
+            "pool_timeout": settings["pool_timeout"],
+            "pool_recycle": settings["pool_recycle"],
+        }
+    return {"connect_args": connect_args, "pool_pre_ping": settings["pool_pre_ping"], **pool_options}
+
+def _configure_connections(sync_engine, profile: str, settings: Dict[str, Any], stats: PoolStats):
+    """Count new connections and apply the SQLite pragmas to each of them"""
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.record_connect()
+        if profile.startswith("sqlite"):
+            cursor = dbapi_connection.cursor()
+            if profile == "sqlite-file":
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute(f"PRAGMA busy_timeout={settings['busy_timeout_ms']}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+            cursor.close()
+
+def create_profiled_engine(url: str = DATABASE_URL, profile: Optional[str] = None):
+    """Engine for a URL, configured by its engine profile"""
+    profile = profile or engine_profile_name(url)
+    settings = engine_settings(profile)
+    new_engine = create_engine(url, **_engine_options(profile, settings, asynchronous=False))
+    _configure_connections(new_engine, profile, settings, pool_stats)
+    return new_engine
+
+def create_profiled_async_engine(url: str = DATABASE_URL, profile: Optional[str] = None):
+    """Asyncio engine for a URL, with the same profile as create_profiled_engine.
+    
+    A plain sqlite :memory: database is private to its connection, so the async
+    engine cannot see the blocking engine's data; use a shared-cache URI
+    (sqlite:///file:name?mode=memory&cache=shared&uri=true) to share one.
+    """
+    profile = profile or engine_profile_name(url)
+    settings = engine_settings(profile)
+    new_engine = create_async_engine(async_database_url(url), **_engine_options(profile, settings, asynchronous=True))
+    _configure_connections(new_engine.sync_engine, profile, settings, async_pool_stats)
+    return new_engine
+
+def _pool_status(pool, stats: PoolStats) -> Dict[str, Any]:
+    status = {"pool": pool.__class__.__name__, **stats.snapshot()}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout": pool.timeout(),
+        })
+    return status
+
+def pool_status() -> Dict[str, Any]:
+    """Current pool occupancy plus checkout/wait statistics of both engines"""
+    return {
+        "profile": ENGINE_PROFILE,
+        "sync": _pool_status(engine.pool, pool_stats),
+        "async": _pool_status(async_engine.sync_engine.pool, async_pool_stats),
+    }
+
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+ENGINE_PROFILE = engine_profile_name()
+engine = create_profiled_engine(DATABASE_URL, ENGINE_PROFILE)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Dependency to get database session
+# Asyncio engine for handlers that query without blocking the event loop
+async_engine = create_profiled_async_engine(DATABASE_URL, ENGINE_PROFILE)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Dependency to get database session; handlers using it should be plain `def`
+# so FastAPI runs them in its threadpool
 def get_db():
     db = SessionLocal()
     try:
@@ -22,6 +244,11 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async database session for `async def` handlers
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def seed_subscription_plans():
     """Seed the database with subscription plans"""
     db = SessionLocal()
@@ -203,11 +430,15 @@ class TaxCountry(Base):
 
 class ROICalculation(Base):
     __tablename__ = "roi_calculations"
+    __table_args__ = (
+        # A user's calculations, newest first
+        Index("ix_roi_calculations_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Optional for guest users
     session_id = Column(String, index=True, nullable=True)  # For guest users
-    business_scenario_id = Column(Integer, ForeignKey("business_scenarios.id"))
+    business_scenario_id = Column(Integer, ForeignKey("business_scenarios.id"), index=True)
     mini_scenario_id = Column(Integer, ForeignKey("mini_scenarios.id"))
     country_id = Column(Integer, ForeignKey("tax_countries.id"))
     
@@ -234,7 +465,10 @@ class ROICalculation(Base):
     market_analysis = Column(Text)
     recommendations = Column(Text)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Full calculate_roi result as JSON, so the session can be served without recalculating
+    result_data = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationships
     user = relationship("User", back_populates="calculations", foreign_keys=[user_id])
@@ -244,6 +478,9 @@ class ROICalculation(Base):
 
 class ExportHistory(Base):
     __tablename__ = "export_history"
+    __table_args__ = (
+        Index("ix_export_history_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -326,6 +563,10 @@ class UserSubscription(Base):
 
 class UsageTracking(Base):
     __tablename__ = "usage_tracking"
+    __table_args__ = (
+        # The open billing period of a user has period_end IS NULL
+        Index("ix_usage_tracking_user_id_period_end", "user_id", "period_end"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -341,4 +582,3 @@ class UsageTracking(Base):
     
     # Relationships
     user = relationship("User", back_populates="usage")
-
@@ -0,0 +1,83 @@
+import functools
+import inspect
+import json
+import os
+from typing import Optional, Any, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.cache import cache_manager
+from app.services.executors import workload_pools
+
+# Reference data only changes on reseed; clients revalidate after this many seconds
+REFERENCE_MAX_AGE = int(os.getenv("REFERENCE_MAX_AGE", "60"))
+REFERENCE_CACHE_CONTROL = f"public, max-age={REFERENCE_MAX_AGE}, must-revalidate"
+
+def reference_etag(resource: str) -> str:
+    """Strong ETag for a reference-data resource at the current data version"""
+    return f'"{resource}-{cache_manager.get_data_version()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the client already holds this version, else None"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REFERENCE_CACHE_CONTROL})
+    return None
+
+def set_reference_headers(response: Response, etag: str):
+    """Attach the validator and caching policy to a full reference-data response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REFERENCE_CACHE_CONTROL
+
+def _default_key(**params: Any) -> str:
+    """Cache key from a handler's path and query parameters (dependencies are skipped)"""
+    return "&".join(
+        f"{name}={value}" for name, value in sorted(params.items())
+        if value is None or isinstance(value, (str, int, float, bool))
+    )
+
+def cached_response(ttl: float, key: Optional[Callable[..., str]] = None):
+    """Cache a GET handler's response body as encoded JSON bytes.
+
+    `key` receives the handler's keyword arguments and returns the part of the
+    cache key that identifies the response. Keys include the reference-data
+    version, so a reseed makes every cached body unreachable. A hit skips both
+    the handler and JSON encoding.
+    """
+    key = key or _default_key
+
+    def decorator(handler):
+        route = f"{handler.__module__.rsplit('.', 1)[-1]}.{handler.__name__}"
+
+        @functools.wraps(handler)
+        async def wrapper(**params):
+            cache_key = f"http_response:{route}:{cache_manager.get_data_version()}:{key(**params)}"
+            body = cache_manager.store.get(cache_key)
+            if body is None:
+                if inspect.iscoroutinefunction(handler):
+                    result = await handler(**params)
+                else:
+                    # Blocking handlers run on the db pool, as DBPoolRoute would run them unwrapped
+                    result = await workload_pools.run("db", handler, **params)
+                if isinstance(result, Response):
+                    return result
+                # Same encoding FastAPI's JSONResponse uses
+                body = json.dumps(
+                    jsonable_encoder(result), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+                ).encode("utf-8")
+                cache_manager.store.set(cache_key, body, ttl)
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
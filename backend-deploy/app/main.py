@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from contextlib import asynccontextmanager
@@ -21,9 +22,16 @@ try:
 except ImportError as e:
     print(f"⚠️  Complex auth not available: {e}")
     COMPLEX_AUTH_AVAILABLE = False
-from app.database import engine, Base
+from app.database import engine, async_engine, Base
+from app.migrations import run_migrations
 from app.complete_seed_data import seed_complete_database
 from app.complete_countries_data import seed_all_countries
+from app.services.ranking import get_ranking_index
+from app.cache import cache_manager
+from app.services.warmup import cache_warmer
+from app.services.executors import workload_pools, PoolSaturated
+from app.services.write_behind import calculation_writer
+from app.http_caching import reference_etag, not_modified, set_reference_headers
 
 # Optional dotenv import to prevent deployment failures
 try:
@@ -42,14 +50,42 @@ async def lifespan(app: FastAPI):
     # Create database tables
     print("📋 Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    run_migrations()
     
     # Seed database with comprehensive business scenarios
     print("🌱 Seeding database with all 35 business scenarios and mini-scenarios...")
     seed_complete_database()
     
+    # Precompute the scenario x mini scenario x country ranking
+    print(f"📊 Ranking index ready: {len(get_ranking_index())} combinations")
+    
     print("✅ Database initialized successfully!")
+    
+    # Resume with the previous process's cache contents, loaded in the background
+    cache_manager.start_snapshot_load()
+    
+    # Precompute market analysis, tax data and popular calculations; /ready waits for it
+    cache_warmer.start()
+    
+    # Calculations are saved in batches by a background writer
+    calculation_writer.start()
+    
+    # Drop expired usage counters in the background
+    cache_manager.usage.start_sweeper()
     yield
     # Shutdown
+    cache_manager.usage.stop_sweeper()
+    unwritten = calculation_writer.stop()
+    if unwritten:
+        print(f"❌ {unwritten} calculations were not saved before shutdown")
+    try:
+        saved = cache_manager.save_snapshot()
+        if saved:
+            print(f"💾 Saved {saved} cache entries for the next start")
+    except Exception as e:
+        print(f"❌ Error saving cache snapshot: {e}")
+    workload_pools.shutdown()
+    await async_engine.dispose()
     print("🛑 Shutting down InvestWise Pro...")
 
 app = FastAPI(
@@ -69,6 +105,11 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+@app.exception_handler(PoolSaturated)
+async def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    """Shed load when a workload pool's queue is full"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 # Include routers
 if SIMPLE_AUTH_AVAILABLE:
     app.include_router(simple_auth.router)
@@ -96,7 +137,7 @@ async def root():
     }
 
 @app.post("/reset-database")
-async def reset_database_endpoint():
+def reset_database_endpoint():
     """Reset and reseed the database with all 35 scenarios"""
     try:
         seed_complete_database()
@@ -111,7 +152,7 @@ async def reset_database_endpoint():
         }
 
 @app.post("/update-countries")
-async def update_countries_endpoint():
+def update_countries_endpoint():
     """Update database with all 25 countries"""
     try:
         count = seed_all_countries()
@@ -143,6 +184,13 @@ async def health_check():
             "error": str(e)
         }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the startup cache warm-up has finished"""
+    if not cache_warmer.ready.is_set():
+        return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": cache_warmer.stats})
+    return {"status": "ready", "warmup": cache_warmer.stats}
+
 @app.get("/test")
 async def test_endpoint():
     return {"message": "Test endpoint working", "timestamp": "2025-08-04"}
@@ -1432,8 +1480,13 @@ async def get_scenarios():
 
 # Tax data endpoint
 @app.get("/api/tax/countries")
-async def get_countries():
+async def get_countries(request: Request, response: Response):
     """Get available countries with tax data"""
+    etag = reference_etag("tax-countries")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_reference_headers(response, etag)
     return [
         {"code": "US", "name": "United States", "corporate_tax_rate": 21.0},
         {"code": "GB", "name": "United Kingdom", "corporate_tax_rate": 19.0},
@@ -0,0 +1,93 @@
+from typing import Callable, List, Set, Tuple
+
+from sqlalchemy import Column, Integer, String, DateTime, MetaData, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import func
+
+from app.database import Base, engine
+
+# create_all only creates missing tables. Changes to tables that already exist in
+# deployed databases are listed here and applied once each, in version order, on
+# startup. Models stay the source of truth; migrations bring old databases up to
+# them, and are idempotent because a fresh create_all already matches.
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+# Arbitrary key for the Postgres advisory lock that serializes workers starting together
+MIGRATION_LOCK_KEY = 7318046
+
+def add_column(connection: Connection, table_name: str, column_name: str):
+    """ALTER TABLE ... ADD COLUMN for a model column the table does not have yet"""
+    existing = {column["name"] for column in inspect(connection).get_columns(table_name)}
+    if column_name in existing:
+        return
+    column_type = Base.metadata.tables[table_name].c[column_name].type.compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+
+def create_index(connection: Connection, table_name: str, index_name: str):
+    """Create a model index that the table does not have yet"""
+    index = next(index for index in Base.metadata.tables[table_name].indexes if index.name == index_name)
+    index.create(connection, checkfirst=True)
+
+def _add_result_data(connection: Connection):
+    add_column(connection, "roi_calculations", "result_data")
+
+def _add_hot_query_indexes(connection: Connection):
+    for table_name, index_name in (
+        ("roi_calculations", "ix_roi_calculations_user_id_created_at"),
+        ("roi_calculations", "ix_roi_calculations_business_scenario_id"),
+        ("roi_calculations", "ix_roi_calculations_created_at"),
+        ("export_history", "ix_export_history_user_id_created_at"),
+        ("usage_tracking", "ix_usage_tracking_user_id_period_end"),
+    ):
+        create_index(connection, table_name, index_name)
+
+# (version, name, migration); append only, never renumber
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "roi_calculations.result_data", _add_result_data),
+    (2, "indexes for user history, analytics and usage queries", _add_hot_query_indexes),
+]
+
+def _lock_for_migration(connection: Connection):
+    """Serialize workers starting together before they check what is pending"""
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    elif connection.dialect.name == "sqlite":
+        # pysqlite defers BEGIN until the first write, after the schema checks;
+        # take the write lock up front instead
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def applied_versions(connection: Connection) -> Set[int]:
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+def run_migrations(bind: Engine = engine) -> List[int]:
+    """Apply every migration the database has not recorded yet; returns the versions applied"""
+    with bind.begin() as connection:
+        # IF NOT EXISTS: a checkfirst create races with other workers starting together
+        connection.execute(CreateTable(schema_migrations, if_not_exists=True))
+    with bind.connect() as connection:
+        pending = [migration for migration in MIGRATIONS if migration[0] not in applied_versions(connection)]
+
+    applied = []
+    for version, name, migrate in pending:
+        try:
+            with bind.begin() as connection:
+                _lock_for_migration(connection)
+                if version in applied_versions(connection):
+                    # Another worker applied it while this one waited for the lock
+                    continue
+                migrate(connection)
+                connection.execute(schema_migrations.insert().values(version=version, name=name))
+        except IntegrityError:
+            # Another worker recorded this version first
+            continue
+        applied.append(version)
+        print(f"📋 Applied migration {version}: {name}")
+    return applied
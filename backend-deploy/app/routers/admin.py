@@ -1,12 +1,16 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from app.database import get_db, BusinessScenario, MiniScenario, TaxCountry
+from app.database import get_db, pool_status, BusinessScenario, MiniScenario, TaxCountry
 from app.complete_seed_data import seed_complete_database
+from app.services.calculator import calculator_service
+from app.cache import cache_manager
+from app.services.executors import workload_pools, DBPoolRoute
+from app.services.write_behind import calculation_writer
 
-router = APIRouter()
+router = APIRouter(route_class=DBPoolRoute)
 
 @router.post("/reset-database")
-async def reset_database():
+def reset_database():
     """Reset and reseed the database with all scenarios"""
     try:
         seed_complete_database()
@@ -18,7 +22,7 @@ async def reset_database():
         raise HTTPException(status_code=500, detail=f"Failed to reset database: {str(e)}")
 
 @router.get("/database-status")
-async def get_database_status(db: Session = Depends(get_db)):
+def get_database_status(db: Session = Depends(get_db)):
     """Get current database status"""
     try:
         business_count = db.query(BusinessScenario).count()
@@ -35,7 +39,7 @@ async def get_database_status(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 @router.get("/scenarios-sample")
-async def get_scenarios_sample(db: Session = Depends(get_db)):
+def get_scenarios_sample(db: Session = Depends(get_db)):
     """Get a sample of scenarios to verify data"""
     try:
         scenarios = db.query(BusinessScenario).limit(10).all()
@@ -49,4 +53,37 @@ async def get_scenarios_sample(db: Session = Depends(get_db)):
             for s in scenarios
         ]
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+@router.get("/calculator-cache")
+async def get_calculator_cache_stats():
+    """Get hit/miss statistics of the ROI calculator's result caches"""
+    return calculator_service.cache_stats()
+
+@router.get("/usage")
+async def get_usage_stats(include_sessions: bool = False):
+    """Get aggregate usage counters, optionally with per-session counts"""
+    result = {"totals": cache_manager.get_usage_totals()}
+    if include_sessions:
+        result["sessions"] = cache_manager.get_usage_stats()
+    return result
+
+@router.get("/cache")
+async def get_cache_stats(detailed: bool = False):
+    """Get hit/miss/eviction statistics and size of the session cache (Redis keys are only counted when detailed)"""
+    return cache_manager.stats(detailed)
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """Get connection pool occupancy and checkout wait statistics"""
+    return pool_status()
+
+@router.get("/executors")
+async def get_executor_stats():
+    """Get queue depth and wait-time statistics for each workload pool"""
+    return workload_pools.stats()
+
+@router.get("/write-behind")
+async def get_write_behind_stats():
+    """Get buffer depth, batch and retry statistics for the calculation writer"""
+    return calculation_writer.stats()
@@ -5,8 +5,9 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.database import get_db, User, ROICalculation, BusinessScenario, MiniScenario, TaxCountry
+from app.services.executors import DBPoolRoute
 
-router = APIRouter(prefix="/api/admin", tags=["admin_data"])
+router = APIRouter(prefix="/api/admin", tags=["admin_data"], route_class=DBPoolRoute)
 
 # Pydantic models
 class UserSummary(BaseModel):
@@ -44,7 +45,7 @@ class ActivityItem(BaseModel):
     user_name: Optional[str] = None
 
 @router.get("/stats", response_model=AdminStats)
-async def get_admin_stats(db: Session = Depends(get_db)):
+def get_admin_stats(db: Session = Depends(get_db)):
     """Get comprehensive admin statistics from database"""
     try:
         # Get current time for date calculations
@@ -98,7 +99,7 @@ async def get_admin_stats(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get admin stats: {str(e)}")
 
 @router.get("/users", response_model=List[UserSummary])
-async def get_all_users(db: Session = Depends(get_db)):
+def get_all_users(db: Session = Depends(get_db)):
     """Get all users with their calculation counts"""
     try:
         # Query users with their calculation counts
@@ -127,7 +128,7 @@ async def get_all_users(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get users: {str(e)}")
 
 @router.get("/calculations/analytics", response_model=List[CalculationAnalytics])
-async def get_calculation_analytics(db: Session = Depends(get_db)):
+def get_calculation_analytics(db: Session = Depends(get_db)):
     """Get calculation analytics by business scenario"""
     try:
         analytics = db.query(
@@ -158,7 +159,7 @@ async def get_calculation_analytics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get calculation analytics: {str(e)}")
 
 @router.get("/activity", response_model=List[ActivityItem])
-async def get_recent_activity(db: Session = Depends(get_db)):
+def get_recent_activity(db: Session = Depends(get_db)):
     """Get recent user activity"""
     try:
         # Get recent calculations with user info
@@ -210,7 +211,7 @@ async def get_recent_activity(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get activity: {str(e)}")
 
 @router.delete("/users/{user_id}")
-async def delete_user(user_id: int, db: Session = Depends(get_db)):
+def delete_user(user_id: int, db: Session = Depends(get_db)):
     """Delete a user and their calculations"""
     try:
         user = db.query(User).filter(User.id == user_id).first()
@@ -232,7 +233,7 @@ async def delete_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to delete user: {str(e)}")
 
 @router.get("/database/status")
-async def get_database_status(db: Session = Depends(get_db)):
+def get_database_status(db: Session = Depends(get_db)):
     """Get database status and table counts"""
     try:
         # Get table counts
@@ -275,7 +276,7 @@ async def get_database_status(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get database status: {str(e)}")
 
 @router.get("/test")
-async def test_admin_endpoints(db: Session = Depends(get_db)):
+def test_admin_endpoints(db: Session = Depends(get_db)):
     """Test endpoint to verify admin endpoints are working"""
     try:
         user_count = db.query(func.count(User.id)).scalar() or 0
@@ -5,6 +5,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from app.database import User, get_db
+from app.services.executors import DBPoolRoute
 from app.auth import (
     authenticate_user,
     create_access_token,
@@ -13,7 +14,7 @@ from app.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
-router = APIRouter(prefix="/api/auth", tags=["authentication"])
+router = APIRouter(prefix="/api/auth", tags=["authentication"], route_class=DBPoolRoute)
 
 # Pydantic models
 class UserRegister(BaseModel):
@@ -44,7 +45,7 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 @router.post("/register", response_model=Token)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+def register(user_data: UserRegister, db: Session = Depends(get_db)):
     """Register a new user"""
     
     # Check if user already exists
@@ -97,7 +98,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login user"""
     user = authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
@@ -126,7 +127,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
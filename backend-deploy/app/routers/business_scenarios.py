@@ -1,25 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
+from app.http_caching import reference_etag, not_modified, set_reference_headers, cached_response
+from app.services.executors import DBPoolRoute
 from app.schemas.roi import BusinessScenarioResponse, MiniScenarioResponse
 from app.database import BusinessScenario, MiniScenario
 from sqlalchemy import func
 
-router = APIRouter(prefix="/api/business-scenarios", tags=["Business Scenarios"])
+router = APIRouter(prefix="/api/business-scenarios", tags=["Business Scenarios"], route_class=DBPoolRoute)
 
 @router.get("/", response_model=List[BusinessScenarioResponse])
-async def get_business_scenarios(
+def get_business_scenarios(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     limit: Optional[int] = Query(100, ge=1, le=1000),
     offset: Optional[int] = Query(0, ge=0)
 ):
     """Get all business scenarios with pagination"""
+    etag = reference_etag(f"business-scenarios-{offset}-{limit}")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_reference_headers(response, etag)
     scenarios = db.query(BusinessScenario).offset(offset).limit(limit).all()
     return scenarios
 
 @router.get("/{scenario_id}", response_model=BusinessScenarioResponse)
-async def get_business_scenario(
+def get_business_scenario(
     scenario_id: int,
     db: Session = Depends(get_db)
 ):
@@ -30,7 +39,7 @@ async def get_business_scenario(
     return scenario
 
 @router.get("/{scenario_id}/mini-scenarios", response_model=List[MiniScenarioResponse])
-async def get_business_scenario_mini_scenarios(
+def get_business_scenario_mini_scenarios(
     scenario_id: int,
     db: Session = Depends(get_db)
 ):
@@ -48,7 +57,7 @@ async def get_business_scenario_mini_scenarios(
     return mini_scenarios
 
 @router.get("/popular/scenarios", response_model=List[BusinessScenarioResponse])
-async def get_popular_scenarios(
+def get_popular_scenarios(
     db: Session = Depends(get_db),
     limit: Optional[int] = Query(10, ge=1, le=50)
 ):
@@ -67,7 +76,7 @@ async def get_popular_scenarios(
     return scenarios
 
 @router.get("/search/scenarios")
-async def search_business_scenarios(
+def search_business_scenarios(
     query: str = Query(..., min_length=1, max_length=100),
     db: Session = Depends(get_db),
     limit: Optional[int] = Query(20, ge=1, le=100)
@@ -87,7 +96,8 @@ async def search_business_scenarios(
     }
 
 @router.get("/categories/overview")
-async def get_categories_overview(db: Session = Depends(get_db)):
+@cached_response(ttl=86400, key=lambda db: "all")
+def get_categories_overview(db: Session = Depends(get_db)):
     """Get an overview of business scenario categories"""
     total_scenarios = db.query(func.count(BusinessScenario.id)).scalar()
     total_mini_scenarios = db.query(func.count(MiniScenario.id)).scalar()
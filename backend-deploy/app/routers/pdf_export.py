@@ -4,7 +4,8 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional
 import os
 from sqlalchemy.orm import Session
-from ..services.pdf_generator import pdf_generator_service
+from ..services.pdf_generator import generate_simple_report
+from ..services.executors import workload_pools, PoolSaturated
 from ..database import get_db, ExportHistory
 
 router = APIRouter(prefix="/pdf", tags=["PDF Export"])
@@ -18,14 +19,25 @@ class PDFExportRequest(BaseModel):
     template_type: str = "standard"
 
 
+def record_export(db: Session, request: PDFExportRequest, filename: str, file_size: int):
+    """Track an export in the database"""
+    export_record = ExportHistory(
+        user_id=request.user_id,
+        calculation_id=request.calculation_id,
+        filename=filename,
+        template_type=request.template_type,
+        file_size=file_size,
+        download_count=1
+    )
+    db.add(export_record)
+    db.commit()
+
 @router.post("/export")
 async def export_pdf(request: PDFExportRequest, db: Session = Depends(get_db)):
     """Export ROI calculation as PDF"""
     try:
-        # Generate PDF using the service
-        pdf_file_path = pdf_generator_service.generate_simple_report(
-            request.calculation_data
-        )
+        # Generate PDF in the pdf worker pool; reportlab holds the GIL for the whole render
+        pdf_file_path = await workload_pools.run("pdf", generate_simple_report, request.calculation_data)
         
         # Get file size
         file_size = os.path.getsize(pdf_file_path) if os.path.exists(pdf_file_path) else 0
@@ -33,16 +45,7 @@ async def export_pdf(request: PDFExportRequest, db: Session = Depends(get_db)):
         
         # Track export in database if user is provided
         if request.user_id:
-            export_record = ExportHistory(
-                user_id=request.user_id,
-                calculation_id=request.calculation_id,
-                filename=filename,
-                template_type=request.template_type,
-                file_size=file_size,
-                download_count=1
-            )
-            db.add(export_record)
-            db.commit()
+            await workload_pools.run("db", record_export, db, request, filename, file_size)
         
         # Return the PDF file
         return FileResponse(
@@ -51,6 +54,8 @@ async def export_pdf(request: PDFExportRequest, db: Session = Depends(get_db)):
             filename=filename
         )
         
+    except PoolSaturated:
+        raise
     except Exception as e:
         print(f"PDF export error: {str(e)}")
         raise HTTPException(
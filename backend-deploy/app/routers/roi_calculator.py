@@ -1,14 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, Header
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Request, Response
 from typing import List, Optional, Dict, Any
+import json
 import math
 import uuid
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.cache import cache_manager
-from app.services.calculator import ROICalculatorService
+from app.http_caching import reference_etag, not_modified, set_reference_headers, cached_response
+from app.services.calculator import calculator_service, BATCH_RESULT_FIELDS, RESULT_SECTIONS, DEFAULT_DISCOUNT_RATE
+from app.services.factor_tables import get_factor_tables
+from app.services.simulation import simulation_service, DEFAULT_PERCENTILES
+from app.services.ranking import get_ranking_index
 from app.services.market_data import MarketDataService
-from app.database import get_db, BusinessScenario, MiniScenario, TaxCountry, ROICalculation
+from app.services.executors import workload_pools
+from app.services.write_behind import calculation_writer, BufferFull
+from app.database import get_db, get_async_db, BusinessScenario, MiniScenario, TaxCountry, ROICalculation
 
 # Try to import auth, but continue without it if there are issues
 try:
@@ -32,6 +41,122 @@ except ImportError:
 
 router = APIRouter()
 
+# Upper bound on rows accepted by /calculate/batch
+MAX_BATCH_ROWS = 100000
+
+# Upper bound on scenario/country pairs in one /compare request
+MAX_COMPARE_CELLS = 10000
+
+# Upper bounds for /sweep grids
+MAX_SWEEP_AXIS_STEPS = 500
+MAX_SWEEP_CELLS = 250000
+
+def parse_sweep_axis(spec: Any, name: str) -> List[float]:
+    """Expand a sweep axis given as a list, a single value or {"start", "stop", "steps"}"""
+    if isinstance(spec, dict):
+        steps = int(spec.get("steps", 10))
+        if not 1 <= steps <= MAX_SWEEP_AXIS_STEPS:
+            raise HTTPException(status_code=400, detail=f"{name} steps must be between 1 and {MAX_SWEEP_AXIS_STEPS}")
+        start = float(spec["start"])
+        stop = float(spec.get("stop", start))
+        if steps == 1:
+            return [start]
+        return [start + (stop - start) * i / (steps - 1) for i in range(steps)]
+    values = spec if isinstance(spec, list) else [spec]
+    if not 1 <= len(values) <= MAX_SWEEP_AXIS_STEPS:
+        raise HTTPException(status_code=400, detail=f"{name} must have between 1 and {MAX_SWEEP_AXIS_STEPS} values")
+    return [float(value) for value in values]
+
+def parse_result_projection(include: Optional[str], fields: Optional[str]):
+    """Resolve the include= and fields= query parameters of a calculation.
+
+    Returns (sections, fields): the result sections to compute (None means all)
+    and the result fields to return (None means everything computed).
+    """
+    def split(value: str, allowed, name: str) -> List[str]:
+        names = [part.strip() for part in value.split(",") if part.strip()]
+        unknown = [part for part in names if part not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown {name}: {', '.join(unknown)} (expected any of {', '.join(allowed)})"
+            )
+        return names
+
+    selected_fields = None
+    if fields is not None:
+        selected_fields = split(fields, BATCH_RESULT_FIELDS + RESULT_SECTIONS, "fields")
+    if include is not None:
+        sections = split(include, RESULT_SECTIONS, "sections")
+        if selected_fields is not None:
+            selected_fields = selected_fields + [s for s in sections if s not in selected_fields]
+    elif selected_fields is not None:
+        # Only compute the sections the projection keeps
+        sections = [field for field in selected_fields if field in RESULT_SECTIONS]
+    else:
+        sections = None
+    return sections, selected_fields
+
+def project_result(result: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested fields of a calculation result"""
+    if fields is None:
+        return result
+    return {field: result[field] for field in fields if field in result}
+
+# Row columns needed to restore a saved calculation (see restore_stored_result)
+STORED_RESULT_COLUMNS = (
+    ROICalculation.result_data,
+    ROICalculation.business_scenario_id,
+    ROICalculation.mini_scenario_id,
+    ROICalculation.country_id,
+    ROICalculation.initial_investment,
+    ROICalculation.additional_costs,
+    ROICalculation.time_period,
+    ROICalculation.time_unit,
+)
+
+def encode_stored_result(result: Dict[str, Any], country_code: str) -> str:
+    """result_data for a calculation: the result plus the sections it actually contains"""
+    return json.dumps({
+        "sections": [section for section in RESULT_SECTIONS if section in result],
+        "country_code": country_code,
+        "result": result
+    }, separators=(",", ":"))
+
+def restore_stored_result(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Full calculate_roi result from a saved row, computing any sections it was saved without.
+
+    Older rows hold the bare result and no country code; their missing sections are
+    filled in when the country is still known.
+    """
+    stored = json.loads(record["result_data"])
+    factor_tables = get_factor_tables()
+    if "result" in stored and "sections" in stored:
+        result, country_code = stored["result"], stored["country_code"]
+    else:
+        result, country_code = stored, factor_tables.country_code(record["country_id"])
+    
+    missing = [section for section in RESULT_SECTIONS if section not in result]
+    if not missing or country_code is None:
+        return result
+    sections = calculator_service.calculate_roi(
+        initial_investment=record["initial_investment"],
+        additional_costs=record["additional_costs"],
+        time_period=record["time_period"],
+        time_unit=record["time_unit"],
+        business_scenario_id=record["business_scenario_id"],
+        mini_scenario_id=record["mini_scenario_id"],
+        country_code=country_code,
+        business_scenario_name=factor_tables.scenario_name(record["business_scenario_id"]),
+        mini_scenario_name=factor_tables.mini_scenario_name(record["mini_scenario_id"]),
+        sections=missing
+    )
+    # Same key order as calculate_roi: numbers first, then the sections
+    restored = {field: value for field, value in result.items() if field not in RESULT_SECTIONS}
+    for section in RESULT_SECTIONS:
+        restored[section] = result[section] if section in result else sections[section]
+    return restored
+
 def get_current_user_from_token(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     """Get current user from Authorization header"""
     if not authorization or not AUTH_AVAILABLE:
@@ -60,9 +185,14 @@ def get_current_user_from_token(authorization: Optional[str] = Header(None), db:
         return None
 
 @router.get("/scenarios")
-async def get_business_scenarios(db: Session = Depends(get_db)):
+async def get_business_scenarios(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Get all business scenarios from database"""
-    scenarios = db.query(BusinessScenario).all()
+    etag = reference_etag("scenarios")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_reference_headers(response, etag)
+    scenarios = (await db.execute(select(BusinessScenario))).scalars().all()
     return [
         {
             "id": scenario.id,
@@ -84,9 +214,16 @@ async def get_business_scenarios(db: Session = Depends(get_db)):
     ]
 
 @router.get("/scenarios/{scenario_id}/mini-scenarios")
-async def get_mini_scenarios(scenario_id: int, db: Session = Depends(get_db)):
+async def get_mini_scenarios(scenario_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Get mini scenarios for a specific business scenario from database"""
-    mini_scenarios = db.query(MiniScenario).filter(MiniScenario.business_scenario_id == scenario_id).all()
+    etag = reference_etag(f"scenarios-{scenario_id}-mini-scenarios")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_reference_headers(response, etag)
+    mini_scenarios = (await db.execute(
+        select(MiniScenario).where(MiniScenario.business_scenario_id == scenario_id)
+    )).scalars().all()
     return [
         {
             "id": mini.id,
@@ -110,9 +247,14 @@ async def get_mini_scenarios(scenario_id: int, db: Session = Depends(get_db)):
           ]
 
 @router.get("/countries")
-async def get_countries(db: Session = Depends(get_db)):
+async def get_countries(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """Get all available countries with tax information"""
-    countries = db.query(TaxCountry).all()
+    etag = reference_etag("countries")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_reference_headers(response, etag)
+    countries = (await db.execute(select(TaxCountry))).scalars().all()
     return [
         {
             "country_code": country.country_code,
@@ -128,11 +270,14 @@ async def get_countries(db: Session = Depends(get_db)):
 @router.post("/calculate")
 async def calculate_roi(
     request: Dict[str, Any], 
-    db: Session = Depends(get_db),
+    include: Optional[str] = Query(None, description="Comma-separated result sections to compute"),
+    fields: Optional[str] = Query(None, description="Comma-separated result fields to return"),
     current_user = Depends(get_current_user_from_token)
 ):
     """Calculate ROI for a business investment"""
     
+    sections, selected_fields = parse_result_projection(include, fields)
+    
     # Extract parameters from request
     initial_investment = request.get("initial_investment", 0)
     additional_costs = request.get("additional_costs", 0)
@@ -142,21 +287,12 @@ async def calculate_roi(
     mini_scenario_id = request.get("mini_scenario_id", 1)
     country_code = request.get("country_code", "US")
     
-    # Map scenario IDs to names (simplified)
-    scenario_names = {
-        1: "E-commerce", 2: "SaaS", 3: "Freelancer", 4: "Agency", 
-        5: "Startup", 6: "Restaurant", 7: "Consulting"
-    }
-    
-    mini_scenario_names = {
-        1: "General", 2: "Specialized", 3: "Premium", 4: "Budget", 5: "Enterprise"
-    }
-    
-    business_scenario_name = scenario_names.get(business_scenario_id, "E-commerce")
-    mini_scenario_name = mini_scenario_names.get(mini_scenario_id, "General")
+    # Map scenario IDs to names via the reference data
+    factor_tables = get_factor_tables()
+    business_scenario_name = factor_tables.scenario_name(business_scenario_id)
+    mini_scenario_name = factor_tables.mini_scenario_name(mini_scenario_id)
     
     # Calculate ROI using the service
-    calculator_service = ROICalculatorService()
     result = calculator_service.calculate_roi(
         initial_investment=initial_investment,
         additional_costs=additional_costs,
@@ -166,60 +302,356 @@ async def calculate_roi(
         mini_scenario_id=mini_scenario_id,
         country_code=country_code,
         business_scenario_name=business_scenario_name,
-        mini_scenario_name=mini_scenario_name
+        mini_scenario_name=mini_scenario_name,
+        sections=sections
     )
     
     # Generate session ID
     session_id = str(uuid.uuid4())
     
-    # Store calculation in cache
-    cache_manager.set_calculation(session_id, result)
+    # Store calculation in cache. A projected result (include=/fields= skipped some
+    # sections) is not cached; its first read completes it from the saved row.
+    if all(section in result for section in RESULT_SECTIONS):
+        cache_manager.set_calculation(session_id, result, business_scenario_name=business_scenario_name)
     cache_manager.increment_usage_counter(session_id)
     
-    # Save calculation to database
+    # Queue the row for the background writer; the response does not wait for the commit
+    row = {
+        "user_id": current_user.id if current_user else None,
+        "session_id": session_id,
+        "business_scenario_id": business_scenario_id,
+        "mini_scenario_id": mini_scenario_id,
+        "country_id": factor_tables.country_id(country_code),
+        "initial_investment": initial_investment,
+        "additional_costs": additional_costs,
+        "time_period": time_period,
+        "time_unit": time_unit,
+        "final_value": result.get("total_investment", 0) + result.get("net_profit", 0),
+        "net_profit": result.get("net_profit", 0),
+        "roi_percentage": result.get("roi_percentage", 0),
+        "annualized_roi": result.get("annualized_roi", 0),
+        "total_investment": result.get("total_investment", 0),
+        "tax_amount": result.get("tax_amount", 0),
+        "after_tax_profit": result.get("after_tax_profit", 0),
+        "after_tax_roi": round(result["after_tax_profit"] / result["total_investment"] * 100, 2) if result.get("total_investment") else 0,
+        "risk_score": result.get("risk_score", 0),
+        "market_analysis": "",
+        "recommendations": "",
+        "result_data": encode_stored_result(result, country_code),
+        "created_at": datetime.utcnow()
+    }
+    if not calculation_writer.offer(row):
+        # Buffer full: wait for the writer to catch up, off the event loop
+        try:
+            await workload_pools.run("db", calculation_writer.put, row)
+        except BufferFull as e:
+            print(f"❌ Failed to save calculation: {e}")
+    
+    return {
+        "data": project_result(result, selected_fields),
+        "session_id": session_id,
+        "status": "success"
+    }
+
+
+@router.post("/calculate/batch")
+async def calculate_roi_batch(request: Dict[str, Any]):
+    """Calculate ROI for many investments in one vectorized pass.
+    
+    Every field accepts either a list (one value per row) or a single value that
+    applies to all rows. Results are returned as columns in the same row order.
+    """
+    defaults = {
+        "initial_investment": 0,
+        "additional_costs": 0,
+        "time_period": 1,
+        "time_unit": "years",
+        "business_scenario_id": 1,
+        "mini_scenario_id": 1,
+        "country_code": "US",
+    }
+    
+    list_lengths = {len(value) for value in request.values() if isinstance(value, list)}
+    if len(list_lengths) > 1:
+        raise HTTPException(status_code=400, detail="All list fields must have the same length")
+    row_count = list_lengths.pop() if list_lengths else 1
+    if row_count > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_ROWS} rows allowed per batch")
+    
+    columns = {}
+    for field, default in defaults.items():
+        value = request.get(field, default)
+        columns[field] = value if isinstance(value, list) else [value] * row_count
+    
+    factor_tables = get_factor_tables()
+    business_scenario_names = [factor_tables.scenario_name(scenario_id) for scenario_id in columns["business_scenario_id"]]
+    mini_scenario_names = [factor_tables.mini_scenario_name(mini_id) for mini_id in columns["mini_scenario_id"]]
+    
+    # Vectorized work runs on the compute pool so the event loop keeps serving requests
+    try:
+        results = await workload_pools.run(
+            "compute",
+            calculator_service.calculate_roi_batch,
+            initial_investments=columns["initial_investment"],
+            additional_costs=columns["additional_costs"],
+            time_periods=columns["time_period"],
+            time_units=columns["time_unit"],
+            business_scenario_ids=columns["business_scenario_id"],
+            mini_scenario_ids=columns["mini_scenario_id"],
+            country_codes=columns["country_code"],
+            business_scenario_names=business_scenario_names,
+            mini_scenario_names=mini_scenario_names
+        )
+    except (AttributeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch input: {str(e)}")
+    
+    return {
+        "data": results,
+        "status": "success"
+    }
+
+@router.post("/sweep")
+async def sweep_roi(request: Dict[str, Any]):
+    """Evaluate a scenario over a country x investment x time period grid.
+    
+    `initial_investment` and `time_period` take a list of values or a range
+    {"start", "stop", "steps"}; `country_codes` takes a list. Each requested metric
+    is returned as a matrix indexed [country][investment][period].
+    """
+    try:
+        initial_investments = parse_sweep_axis(request.get("initial_investment", 0), "initial_investment")
+        time_periods = parse_sweep_axis(request.get("time_period", 1), "time_period")
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sweep axis: {str(e)}")
+    
+    country_codes = request.get("country_codes", [request.get("country_code", "US")])
+    if not isinstance(country_codes, list) or not 1 <= len(country_codes) <= MAX_SWEEP_AXIS_STEPS:
+        raise HTTPException(status_code=400, detail=f"country_codes must be a list of 1 to {MAX_SWEEP_AXIS_STEPS} codes")
+    
+    cells = len(country_codes) * len(initial_investments) * len(time_periods)
+    if cells > MAX_SWEEP_CELLS:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_SWEEP_CELLS} grid cells allowed per sweep")
+    
+    business_scenario_id = request.get("business_scenario_id", 1)
+    mini_scenario_id = request.get("mini_scenario_id", 1)
+    time_unit = request.get("time_unit", "years")
+    factor_tables = get_factor_tables()
+    business_scenario_name = factor_tables.scenario_name(business_scenario_id)
+    
+    try:
+        result = await workload_pools.run(
+            "compute",
+            calculator_service.calculate_roi_sweep,
+            initial_investments=initial_investments,
+            time_periods=time_periods,
+            country_codes=country_codes,
+            additional_costs=float(request.get("additional_costs", 0)),
+            time_unit=time_unit,
+            business_scenario_name=business_scenario_name,
+            mini_scenario_name=factor_tables.mini_scenario_name(mini_scenario_id),
+            metrics=request.get("metrics", ["roi_percentage", "annualized_roi", "after_tax_profit", "risk_score"])
+        )
+    except (AttributeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sweep input: {str(e)}")
+    
+    return {
+        "data": {
+            "business_scenario_id": business_scenario_id,
+            "business_scenario_name": business_scenario_name,
+            "mini_scenario_id": mini_scenario_id,
+            "time_unit": time_unit,
+            "axes": {
+                "country_code": country_codes,
+                "initial_investment": initial_investments,
+                "time_period": time_periods
+            },
+            **result
+        },
+        "status": "success"
+    }
+
+@router.post("/simulate")
+async def simulate_roi(request: Dict[str, Any]):
+    """Monte Carlo simulation of ROI outcomes for a business investment"""
+    try:
+        result = await workload_pools.run(
+            "compute",
+            simulation_service.simulate,
+            initial_investment=float(request.get("initial_investment", 0)),
+            additional_costs=float(request.get("additional_costs", 0)),
+            time_period=float(request.get("time_period", 1)),
+            time_unit=request.get("time_unit", "years"),
+            business_scenario_id=request.get("business_scenario_id", 1),
+            mini_scenario_id=request.get("mini_scenario_id", 1),
+            country_code=request.get("country_code", "US"),
+            paths=int(request.get("paths", 10000)),
+            seed=request.get("seed"),
+            percentiles=request.get("percentiles", DEFAULT_PERCENTILES),
+            histogram_bins=int(request.get("histogram_bins", 20)),
+            market_volatility=float(request.get("market_volatility", 0.10)),
+            tax_volatility=float(request.get("tax_volatility", 2.0))
+        )
+    except (AttributeError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid simulation input: {str(e)}")
+    
+    return {
+        "data": result,
+        "status": "success"
+    }
+
+@router.post("/cash-flows")
+async def project_cash_flows(request: Dict[str, Any]):
+    """Per-period cash-flow projection with NPV, IRR and payback"""
+    business_scenario_id = request.get("business_scenario_id", 1)
+    mini_scenario_id = request.get("mini_scenario_id", 1)
+    factor_tables = get_factor_tables()
     try:
-        calculation_record = ROICalculation(
-            user_id=current_user.id if current_user else None,
-            session_id=session_id if not current_user else None,
+        result = await workload_pools.run(
+            "compute",
+            calculator_service.calculate_cash_flows,
+            initial_investment=float(request.get("initial_investment", 0)),
+            additional_costs=float(request.get("additional_costs", 0)),
+            time_period=float(request.get("time_period", 1)),
+            time_unit=request.get("time_unit", "years"),
             business_scenario_id=business_scenario_id,
             mini_scenario_id=mini_scenario_id,
-            country_id=None,  # We'll need to look this up by country_code
-            initial_investment=initial_investment,
-            additional_costs=additional_costs,
-            time_period=time_period,
-            time_unit=time_unit,
-            final_value=result.get("expected_return", 0),
-            net_profit=result.get("net_profit", 0),
-            roi_percentage=result.get("roi_percentage", 0),
-            annualized_roi=result.get("annual_return", 0),
-            total_investment=result.get("total_investment", 0),
-            tax_amount=result.get("tax_amount", 0),
-            after_tax_profit=result.get("after_tax_profit", 0),
-            after_tax_roi=result.get("after_tax_roi", 0),
-            risk_score=result.get("risk_adjusted_return", 0),
-            market_analysis="",
-            recommendations=""
+            country_code=request.get("country_code", "US"),
+            business_scenario_name=factor_tables.scenario_name(business_scenario_id),
+            mini_scenario_name=factor_tables.mini_scenario_name(mini_scenario_id),
+            frequency=request.get("frequency", "years"),
+            discount_rate=float(request.get("discount_rate", DEFAULT_DISCOUNT_RATE)),
+            cash_flow_growth=float(request.get("cash_flow_growth", 0))
         )
-        db.add(calculation_record)
-        db.commit()
-        print(f"✅ Saved calculation to database: {session_id}")
-    except Exception as e:
-        print(f"❌ Failed to save calculation: {e}")
-        db.rollback()
+    except (TypeError, ValueError, OverflowError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cash-flow input: {str(e)}")
+    
+    return {
+        "data": result,
+        "status": "success"
+    }
+
+@router.post("/cash-flows/evaluate")
+async def evaluate_cash_flows(request: Dict[str, Any]):
+    """NPV, IRR and payback for a portfolio of cash-flow vectors.
+
+    Body: {"cash_flows": [[-1000, 300, 400, 500], ...], "discount_rate": 8,
+    "periods_per_year": 1}. Each row starts with period 0.
+    """
+    cash_flows = request.get("cash_flows")
+    if not isinstance(cash_flows, list) or not cash_flows:
+        raise HTTPException(status_code=400, detail="cash_flows must be a non-empty list of lists")
+    if len(cash_flows) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=400, detail=f"Evaluation is limited to {MAX_BATCH_ROWS} rows")
+    try:
+        result = await workload_pools.run(
+            "compute",
+            calculator_service.evaluate_cash_flows,
+            cash_flows,
+            discount_rate=float(request.get("discount_rate", DEFAULT_DISCOUNT_RATE)),
+            periods_per_year=int(request.get("periods_per_year", 1))
+        )
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cash flows: {str(e)}")
+    
+    return {
+        "data": result,
+        "status": "success"
+    }
+
+@router.post("/goal-seek")
+async def goal_seek(request: Dict[str, Any]):
+    """Solve for the initial investment or time period that reaches a target.
+
+    Body: {"solve_for": "initial_investment" | "time_period", "target_metric": ...,
+    "target_value": ..., "country_codes": [...]} plus the usual calculation inputs
+    for everything that is held fixed.
+    """
+    if "target_value" not in request:
+        raise HTTPException(status_code=400, detail="target_value is required")
+    country_codes = request.get("country_codes") or [request.get("country_code", "US")]
+    if not isinstance(country_codes, list) or len(country_codes) > MAX_COMPARE_CELLS:
+        raise HTTPException(status_code=400, detail=f"country_codes must be a list of at most {MAX_COMPARE_CELLS} codes")
+    
+    factor_tables = get_factor_tables()
+    try:
+        result = await workload_pools.run(
+            "compute",
+            calculator_service.goal_seek,
+            solve_for=request.get("solve_for", "initial_investment"),
+            target_metric=request.get("target_metric", "after_tax_profit"),
+            target_value=float(request["target_value"]),
+            initial_investment=float(request.get("initial_investment", 0)),
+            additional_costs=float(request.get("additional_costs", 0)),
+            time_period=float(request.get("time_period", 1)),
+            time_unit=request.get("time_unit", "years"),
+            business_scenario_name=factor_tables.scenario_name(request.get("business_scenario_id", 1)),
+            mini_scenario_name=factor_tables.mini_scenario_name(request.get("mini_scenario_id", 1)),
+            country_codes=country_codes,
+            frequency=request.get("frequency", "years"),
+            discount_rate=float(request.get("discount_rate", DEFAULT_DISCOUNT_RATE)),
+            cash_flow_growth=float(request.get("cash_flow_growth", 0))
+        )
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid goal-seek input: {str(e)}")
     
     return {
         "data": result,
-        "session_id": session_id,
         "status": "success"
     }
 
+@router.get("/rankings")
+async def get_rankings(
+    k: int = Query(10, ge=1, le=1000),
+    sort_by: str = Query("after_tax_roi"),
+    budget_min: Optional[float] = Query(None, description="Lowest amount the user can invest"),
+    budget_max: Optional[float] = Query(None, description="Highest amount the user can invest"),
+    max_risk: Optional[float] = Query(None, description="Highest acceptable risk score"),
+    country_codes: Optional[List[str]] = Query(None)
+):
+    """Top scenario / mini-scenario / country combinations for a budget"""
+    try:
+        result = get_ranking_index().top(
+            k=k,
+            sort_by=sort_by,
+            budget_min=budget_min,
+            budget_max=budget_max,
+            max_risk=max_risk,
+            country_codes=country_codes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "data": result,
+        "status": "success"
+    }
 
 @router.get("/calculation/{session_id}")
-async def get_calculation(session_id: str):
-    """Get stored calculation by session ID"""
+async def get_calculation(session_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get stored calculation by session ID, falling back to the saved row"""
     calculation = cache_manager.get_calculation(session_id)
-    if not calculation:
+    if calculation:
+        return calculation
+    
+    # Expired, evicted or cached by another worker: rebuild from the saved row,
+    # which may still be waiting for the background writer
+    record = calculation_writer.pending(session_id)
+    if record is None:
+        record = (await db.execute(
+            select(*STORED_RESULT_COLUMNS)
+            .where(ROICalculation.session_id == session_id)
+            .order_by(ROICalculation.id.desc())
+            .limit(1)
+        )).first()
+        record = record._asdict() if record is not None else None
+    if record is None or not record["result_data"]:
         raise HTTPException(status_code=404, detail="Calculation not found")
+    
+    calculation = restore_stored_result(record)
+    cache_manager.set_calculation(
+        session_id, calculation,
+        business_scenario_name=get_factor_tables().scenario_name(record["business_scenario_id"])
+    )
     return calculation
 
 @router.get("/compare")
@@ -228,72 +660,66 @@ async def compare_scenarios(
     investment_amount: float = Query(...),
     time_period: float = Query(...),
     time_unit: str = Query(...),
-    country_code: str = Query(...)
+    country_code: Optional[str] = Query(None),
+    country_codes: Optional[List[str]] = Query(None, description="Compare every scenario in each of these countries"),
+    include: Optional[str] = Query(None, description="Comma-separated result sections to compute"),
+    fields: Optional[str] = Query(None, description="Comma-separated result fields to return")
 ):
-    """Compare multiple business scenarios"""
+    """Compare multiple business scenarios, optionally across several countries"""
     
-    calculator_service = ROICalculatorService()
-    comparison_results = []
+    sections, selected_fields = parse_result_projection(include, fields)
+    codes = list(country_codes or []) or ([country_code] if country_code else [])
+    if not codes:
+        raise HTTPException(status_code=400, detail="country_code or country_codes is required")
+    if len(scenario_ids) * len(codes) > MAX_COMPARE_CELLS:
+        raise HTTPException(status_code=400, detail=f"Comparison is limited to {MAX_COMPARE_CELLS} scenario/country pairs")
     
-    scenario_names = {
-        1: "E-commerce", 2: "SaaS", 3: "Freelancer", 4: "Agency", 
-        5: "Startup", 6: "Restaurant", 7: "Consulting"
-    }
+    rows = await workload_pools.run(
+        "compute",
+        calculator_service.calculate_roi_matrix,
+        business_scenario_ids=scenario_ids,
+        country_codes=codes,
+        initial_investment=investment_amount,
+        additional_costs=0,
+        time_period=time_period,
+        time_unit=time_unit,
+        mini_scenario_name="General",
+        sections=RESULT_SECTIONS if sections is None else sections
+    )
     
-    for scenario_id in scenario_ids:
-        business_scenario_name = scenario_names.get(scenario_id, "E-commerce")
-        
-        result = calculator_service.calculate_roi(
-            initial_investment=investment_amount,
-            additional_costs=0,
-            time_period=time_period,
-            time_unit=time_unit,
-            business_scenario_id=scenario_id,
-            mini_scenario_id=1,
-            country_code=country_code,
-            business_scenario_name=business_scenario_name,
-            mini_scenario_name="General"
-        )
-        
-        comparison_results.append({
-            "scenario_id": scenario_id,
-            "scenario_name": business_scenario_name,
-            "mini_scenario_name": "General",
-            **result
-        })
+    identity = ("scenario_id", "scenario_name", "mini_scenario_name", "country_code")
+    comparison_results = [
+        {
+            **{key: row[key] for key in identity},
+            **project_result({key: value for key, value in row.items() if key not in identity}, selected_fields)
+        }
+        for row in rows
+    ]
     
     return {
         "comparison_results": comparison_results,
         "investment_amount": investment_amount,
         "time_period": time_period,
         "time_unit": time_unit,
-        "country_code": country_code
+        "country_code": codes[0],
+        "country_codes": codes
     }
 
 @router.get("/market-analysis/{scenario_id}")
+@cached_response(ttl=3600, key=lambda scenario_id: str(scenario_id))
 async def get_market_analysis(scenario_id: int):
     """Get market analysis for a specific scenario"""
     
-    # Check cache first
-    cached_data = cache_manager.get_market_data(scenario_id)
-    if cached_data:
-        return cached_data
+    business_scenario_name = get_factor_tables().scenario_name(scenario_id)
     
-    # Get market data from service
-    market_service = MarketDataService()
-    scenario_names = {
-        1: "E-commerce", 2: "SaaS", 3: "Freelancer", 4: "Agency", 
-        5: "Startup", 6: "Restaurant", 7: "Consulting"
-    }
-    business_scenario_name = scenario_names.get(scenario_id, "E-commerce")
-    market_data = market_service.get_market_data(business_scenario_name)
-    
-    # Cache the result
-    cache_manager.set_market_data(scenario_id, market_data)
-    
-    return market_data
+    # Concurrent misses for one scenario share a single computation
+    return await cache_manager.get_or_compute_market_data(
+        scenario_id,
+        lambda: MarketDataService().get_market_data(business_scenario_name)
+    )
 
 @router.get("/risk-assessment/{scenario_id}")
+@cached_response(ttl=3600)
 async def get_risk_assessment(
     scenario_id: int,
     investment_amount: float,
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.database import get_db
 from app.simple_auth import register_user, login_user
+from app.services.executors import workload_pools, PoolSaturated
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
@@ -47,7 +48,10 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
                 detail="Full name must be at least 2 characters long"
             )
         
-        result = register_user(
+        # PBKDF2 hashing runs on the crypto pool, off the event loop
+        result = await workload_pools.run(
+            "crypto",
+            register_user,
             db, 
             user_data.email, 
             user_data.username, 
@@ -56,7 +60,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
         return result
         
-    except HTTPException:
+    except (HTTPException, PoolSaturated):
         raise
     except Exception as e:
         raise HTTPException(
@@ -68,9 +72,11 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
 async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login user"""
     try:
-        result = login_user(db, user_credentials.email, user_credentials.password)
+        result = await workload_pools.run(
+            "crypto", login_user, db, user_credentials.email, user_credentials.password
+        )
         return result
-    except HTTPException:
+    except (HTTPException, PoolSaturated):
         raise
     except Exception as e:
         raise HTTPException(
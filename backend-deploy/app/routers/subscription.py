@@ -7,8 +7,9 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 from app.database import get_db, User, SubscriptionPlan, UserSubscription, UsageTracking
+from app.services.executors import DBPoolRoute
 
-router = APIRouter(prefix="/api/subscription", tags=["subscription"])
+router = APIRouter(prefix="/api/subscription", tags=["subscription"], route_class=DBPoolRoute)
 
 # Pydantic models
 class SubscriptionPlanResponse(BaseModel):
@@ -116,7 +117,7 @@ def assign_free_plan(db: Session, user_id: int):
 
 # API Endpoints
 @router.get("/plans", response_model=List[SubscriptionPlanResponse])
-async def get_subscription_plans(db: Session = Depends(get_db)):
+def get_subscription_plans(db: Session = Depends(get_db)):
     """Get all available subscription plans"""
     try:
         plans = db.query(SubscriptionPlan).filter(SubscriptionPlan.is_active == True).all()
@@ -143,7 +144,7 @@ async def get_subscription_plans(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get plans: {str(e)}")
 
 @router.get("/user/{user_id}", response_model=UserSubscriptionResponse)
-async def get_user_subscription(user_id: int, db: Session = Depends(get_db)):
+def get_user_subscription(user_id: int, db: Session = Depends(get_db)):
     """Get user's current subscription"""
     try:
         user = get_current_user_simple(db, user_id)
@@ -188,7 +189,7 @@ async def get_user_subscription(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get subscription: {str(e)}")
 
 @router.get("/usage/{user_id}", response_model=UsageResponse)
-async def get_user_usage(user_id: int, db: Session = Depends(get_db)):
+def get_user_usage(user_id: int, db: Session = Depends(get_db)):
     """Get user's current usage statistics"""
     try:
         user = get_current_user_simple(db, user_id)
@@ -220,7 +221,7 @@ async def get_user_usage(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get usage: {str(e)}")
 
 @router.get("/check-usage/{user_id}", response_model=UsageCheckResponse)
-async def check_usage_limits(user_id: int, action: str, db: Session = Depends(get_db)):
+def check_usage_limits(user_id: int, action: str, db: Session = Depends(get_db)):
     """Check if user can perform an action (calculate, export, api_call)"""
     try:
         user = get_current_user_simple(db, user_id)
@@ -276,7 +277,7 @@ async def check_usage_limits(user_id: int, action: str, db: Session = Depends(ge
         raise HTTPException(status_code=500, detail=f"Failed to check usage: {str(e)}")
 
 @router.post("/increment-usage/{user_id}")
-async def increment_usage(user_id: int, action: str, db: Session = Depends(get_db)):
+def increment_usage(user_id: int, action: str, db: Session = Depends(get_db)):
     """Increment usage counter for user action"""
     try:
         user = get_current_user_simple(db, user_id)
@@ -301,7 +302,7 @@ async def increment_usage(user_id: int, action: str, db: Session = Depends(get_d
 
 # TODO: Implement Stripe integration endpoints
 @router.post("/create/{user_id}")
-async def create_subscription(user_id: int, request: SubscriptionCreateRequest, db: Session = Depends(get_db)):
+def create_subscription(user_id: int, request: SubscriptionCreateRequest, db: Session = Depends(get_db)):
     """Create a new subscription (TODO: Integrate with Stripe)"""
     # This would integrate with Stripe to create actual subscription
     # For now, return placeholder response
@@ -312,7 +313,7 @@ async def create_subscription(user_id: int, request: SubscriptionCreateRequest,
     }
 
 @router.post("/cancel/{user_id}")
-async def cancel_subscription(user_id: int, db: Session = Depends(get_db)):
+def cancel_subscription(user_id: int, db: Session = Depends(get_db)):
     """Cancel user's subscription"""
     # This would integrate with Stripe to cancel subscription
     # For now, return placeholder response
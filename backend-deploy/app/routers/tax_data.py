@@ -2,14 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
+from app.http_caching import cached_response
+from app.services.executors import DBPoolRoute
 from app.schemas.roi import TaxCountryResponse
 from app.database import TaxCountry
 from sqlalchemy import func
 
-router = APIRouter(prefix="/api/tax", tags=["Tax Data"])
+router = APIRouter(prefix="/api/tax", tags=["Tax Data"], route_class=DBPoolRoute)
 
 @router.get("/countries", response_model=List[TaxCountryResponse])
-async def get_countries(
+def get_countries(
     db: Session = Depends(get_db),
     limit: Optional[int] = Query(100, ge=1, le=1000),
     offset: Optional[int] = Query(0, ge=0)
@@ -19,7 +21,7 @@ async def get_countries(
     return countries
 
 @router.get("/countries/{country_code}", response_model=TaxCountryResponse)
-async def get_country_tax_data(
+def get_country_tax_data(
     country_code: str,
     db: Session = Depends(get_db)
 ):
@@ -34,7 +36,7 @@ async def get_country_tax_data(
     return country
 
 @router.get("/comparison")
-async def compare_tax_rates(
+def compare_tax_rates(
     countries: List[str] = Query(..., description="List of country codes to compare"),
     db: Session = Depends(get_db)
 ):
@@ -87,7 +89,8 @@ async def compare_tax_rates(
     }
 
 @router.get("/regions/overview")
-async def get_regions_overview(db: Session = Depends(get_db)):
+@cached_response(ttl=86400, key=lambda db: "all")
+def get_regions_overview(db: Session = Depends(get_db)):
     """Get tax overview by regions"""
     # Define regions and their countries
     regions = {
@@ -141,7 +144,8 @@ async def get_regions_overview(db: Session = Depends(get_db)):
     }
 
 @router.get("/rates/summary")
-async def get_tax_rates_summary(db: Session = Depends(get_db)):
+@cached_response(ttl=86400, key=lambda db: "all")
+def get_tax_rates_summary(db: Session = Depends(get_db)):
     """Get summary of tax rates across all countries"""
     countries = db.query(TaxCountry).all()
     
@@ -168,7 +172,7 @@ async def get_tax_rates_summary(db: Session = Depends(get_db)):
     }
 
 @router.get("/countries/{country_code}/details")
-async def get_country_tax_details(
+def get_country_tax_details(
     country_code: str,
     db: Session = Depends(get_db)
 ):
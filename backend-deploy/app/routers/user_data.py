@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-from app.database import get_db, User, ROICalculation, BusinessScenario, MiniScenario, TaxCountry, ExportHistory
+from app.database import get_async_db, User, ROICalculation, BusinessScenario, MiniScenario, TaxCountry, ExportHistory
 
 router = APIRouter(prefix="/api/user", tags=["user_data"])
 
@@ -40,18 +40,18 @@ class ExportResponse(BaseModel):
     calculation_scenario: Optional[str] = None
 
 # Helper function to get current user (simplified for now)
-def get_current_user_simple(db: Session, user_id: int) -> User:
+async def get_current_user_simple(db: AsyncSession, user_id: int) -> User:
     """Simple user lookup - in production this would use JWT token"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 @router.get("/profile/{user_id}")
-async def get_user_profile(user_id: int, db: Session = Depends(get_db)):
+async def get_user_profile(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get user profile information"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         return {
             "id": user.id,
             "email": user.email,
@@ -68,36 +68,36 @@ async def get_user_profile(user_id: int, db: Session = Depends(get_db)):
 async def update_user_profile(
     user_id: int, 
     profile_data: UserProfileUpdate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user profile information"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         
         # Update fields if provided
         if profile_data.full_name is not None:
             user.full_name = profile_data.full_name
         if profile_data.username is not None:
             # Check if username is already taken
-            existing_user = db.query(User).filter(
+            existing_user = (await db.execute(select(User).where(
                 User.username == profile_data.username,
                 User.id != user_id
-            ).first()
+            ))).scalars().first()
             if existing_user:
                 raise HTTPException(status_code=400, detail="Username already taken")
             user.username = profile_data.username
         if profile_data.email is not None:
             # Check if email is already taken
-            existing_user = db.query(User).filter(
+            existing_user = (await db.execute(select(User).where(
                 User.email == profile_data.email,
                 User.id != user_id
-            ).first()
+            ))).scalars().first()
             if existing_user:
                 raise HTTPException(status_code=400, detail="Email already registered")
             user.email = profile_data.email
         
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         
         return {
             "message": "Profile updated successfully",
@@ -113,16 +113,16 @@ async def update_user_profile(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update profile: {str(e)}")
 
 @router.get("/calculations/{user_id}", response_model=List[CalculationResponse])
-async def get_user_calculations(user_id: int, db: Session = Depends(get_db)):
+async def get_user_calculations(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get user's calculation history"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         
-        calculations = db.query(
+        calculations = (await db.execute(select(
             ROICalculation,
             BusinessScenario.name.label('scenario_name'),
             MiniScenario.name.label('mini_scenario_name'),
@@ -133,11 +133,11 @@ async def get_user_calculations(user_id: int, db: Session = Depends(get_db)):
             MiniScenario, ROICalculation.mini_scenario_id == MiniScenario.id
         ).outerjoin(
             TaxCountry, ROICalculation.country_id == TaxCountry.id
-        ).filter(
+        ).where(
             ROICalculation.user_id == user_id
         ).order_by(
             desc(ROICalculation.created_at)
-        ).all()
+        ))).all()
         
         return [
             CalculationResponse(
@@ -158,19 +158,19 @@ async def get_user_calculations(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get calculations: {str(e)}")
 
 @router.get("/stats/{user_id}", response_model=UserStatsResponse)
-async def get_user_stats(user_id: int, db: Session = Depends(get_db)):
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get user statistics"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         
         # Get calculation stats
-        stats = db.query(
+        stats = (await db.execute(select(
             func.count(ROICalculation.id).label('total_calculations'),
             func.avg(ROICalculation.roi_percentage).label('average_roi'),
             func.sum(ROICalculation.net_profit).label('total_profit')
-        ).filter(
+        ).where(
             ROICalculation.user_id == user_id
-        ).first()
+        ))).first()
         
         return UserStatsResponse(
             total_calculations=stats.total_calculations or 0,
@@ -187,49 +187,49 @@ async def get_user_stats(user_id: int, db: Session = Depends(get_db)):
 async def delete_user_calculation(
     user_id: int, 
     calculation_id: int, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a user's calculation"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         
-        calculation = db.query(ROICalculation).filter(
+        calculation = (await db.execute(select(ROICalculation).where(
             ROICalculation.id == calculation_id,
             ROICalculation.user_id == user_id
-        ).first()
+        ))).scalars().first()
         
         if not calculation:
             raise HTTPException(status_code=404, detail="Calculation not found")
         
-        db.delete(calculation)
-        db.commit()
+        await db.delete(calculation)
+        await db.commit()
         
         return {"message": "Calculation deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete calculation: {str(e)}")
 
 @router.get("/exports/{user_id}", response_model=List[ExportResponse])
-async def get_user_exports(user_id: int, db: Session = Depends(get_db)):
+async def get_user_exports(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get user's export history"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         
         # Get user's exports with calculation scenario info
-        exports = db.query(
+        exports = (await db.execute(select(
             ExportHistory,
             BusinessScenario.name.label('scenario_name')
         ).outerjoin(
             ROICalculation, ExportHistory.calculation_id == ROICalculation.id
         ).outerjoin(
             BusinessScenario, ROICalculation.business_scenario_id == BusinessScenario.id
-        ).filter(
+        ).where(
             ExportHistory.user_id == user_id
         ).order_by(
             desc(ExportHistory.created_at)
-        ).all()
+        ))).all()
         
         return [
             ExportResponse(
@@ -249,15 +249,15 @@ async def get_user_exports(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get exports: {str(e)}")
 
 @router.get("/test/{user_id}")
-async def test_user_endpoints(user_id: int, db: Session = Depends(get_db)):
+async def test_user_endpoints(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Test endpoint to verify user data access"""
     try:
-        user = get_current_user_simple(db, user_id)
+        user = await get_current_user_simple(db, user_id)
         
         # Get basic counts
-        calculation_count = db.query(func.count(ROICalculation.id)).filter(
+        calculation_count = (await db.execute(select(func.count(ROICalculation.id)).where(
             ROICalculation.user_id == user_id
-        ).scalar()
+        ))).scalar()
         
         return {
             "message": "User data endpoints working!",
@@ -1,57 +1,155 @@
 import math
-from typing import Dict, Any, Optional, List
+import os
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Iterable
 from datetime import datetime, timedelta
 import random
 
+import numpy as np
+
+from app.cache import LRUCache
+from app.services.factor_tables import get_factor_tables, MARKET_CONDITIONS, INDUSTRY_MULTIPLIERS
+from app.services.cash_flows import as_cash_flow_matrix, npv, irr, payback_period
+
+# Number of memoized calculate_roi results kept per process
+RESULT_CACHE_SIZE = int(os.getenv("ROI_RESULT_CACHE_SIZE", "4096"))
+
+# Numeric columns produced by calculate_roi_batch, in the order they appear in the scalar result
+BATCH_RESULT_FIELDS = (
+    'roi_percentage',
+    'net_profit',
+    'annualized_roi',
+    'total_investment',
+    'tax_amount',
+    'after_tax_profit',
+    'effective_tax_rate',
+    'risk_score',
+)
+
+# Cash-flow projection periods per year
+CASH_FLOW_FREQUENCIES = {
+    'years': 1,
+    'quarters': 4,
+    'months': 12,
+}
+
+# Annual discount rate (%) used for NPV when none is given
+DEFAULT_DISCOUNT_RATE = 8.0
+
+# Upper bound on periods in one cash-flow vector
+MAX_CASH_FLOW_PERIODS = 1200
+
+# Metrics goal_seek can target for each unknown; percentages such as roi_percentage
+# do not depend on the amount invested and are therefore not solvable for it
+GOAL_SEEK_TARGETS = {
+    'initial_investment': ('net_profit', 'tax_amount', 'after_tax_profit', 'total_investment', 'npv'),
+    'time_period': ('annualized_roi', 'after_tax_annualized_roi', 'npv'),
+}
+
+# Longest horizon, in years, the goal-seek bisection searches
+GOAL_SEEK_MAX_YEARS = 100
+
+# Recommendation texts by id; compact cached results refer to them by position
+RECOMMENDATIONS = {
+    'roi_excellent': "Excellent ROI potential - consider scaling up investment",
+    'roi_strong': "Strong ROI - proceed with recommended investment amount",
+    'roi_moderate': "Moderate ROI - consider optimization strategies",
+    'roi_low': "Low ROI - evaluate alternative investment opportunities",
+    'risk_high': "High risk profile - implement comprehensive risk mitigation",
+    'risk_moderate': "Moderate risk - consider diversification strategies",
+    'risk_low': "Low risk profile - suitable for conservative investors",
+    'profit_strong': "Strong after-tax returns - attractive for long-term investment",
+    'profit_decent': "Decent after-tax returns - monitor performance closely",
+    'profit_low': "Low after-tax returns - evaluate tax optimization strategies",
+    'tax_advantage': "Consider tax advantages in the selected jurisdiction",
+    'stable_regulation': "Stable regulatory environment - favorable for business growth",
+}
+
+# Optional, comparatively expensive sections of a calculate_roi result
+RESULT_SECTIONS = (
+    'market_analysis',
+    'recommendations',
+    'calculation_factors',
+)
+
+def _factorize(values: Sequence[Any]) -> Tuple[List[Any], np.ndarray]:
+    """Return the distinct values (in first-seen order) and an index array mapping each row to them"""
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(value, len(index)) for value in values),
+        dtype=np.intp,
+        count=len(values)
+    )
+    return list(index), codes
+
+def _round_column(values: np.ndarray) -> List[Optional[float]]:
+    """Round a result column exactly like the scalar path does (built-in round, 2 decimals).
+    
+    Values the scalar path cannot produce (it raises OverflowError) come back as None.
+    """
+    return [round(value, 2) if math.isfinite(value) else None for value in values.tolist()]
+
+def _round_matrix(values: np.ndarray) -> List[Any]:
+    """Round a result grid like _round_column, as nested lists (so grid cells match calculate_roi)"""
+    values = np.asarray(values)
+    rounded = _round_column(values.ravel())
+    for size in reversed(values.shape[1:]):
+        rounded = [rounded[start:start + size] for start in range(0, len(rounded), size)]
+    return rounded
+
+def _bisect(evaluate, low: np.ndarray, high: np.ndarray, target: float, iterations: int = 100) -> np.ndarray:
+    """Solve evaluate(x) == target for every element at once by bisection.
+    
+    `evaluate` maps an array of candidates to an array of values. Elements whose
+    [low, high] bracket has no sign change come back as NaN.
+    """
+    low = np.array(low, dtype=np.float64)
+    high = np.array(high, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        f_low = evaluate(low) - target
+        f_high = evaluate(high) - target
+        bracketed = np.sign(f_low) * np.sign(f_high) <= 0
+    for _ in range(iterations):
+        if np.all(high - low <= 1e-12 * (1 + np.abs(high))):
+            break
+        middle = (low + high) / 2
+        f_middle = evaluate(middle) - target
+        right = np.sign(f_middle) == np.sign(f_low)
+        low = np.where(right, middle, low)
+        f_low = np.where(right, f_middle, f_low)
+        high = np.where(right, high, middle)
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+def _level_npv(total_investment, returned, periods, period_rate: float, growth: float):
+    """NPV of investing total_investment at period 0 and getting `returned` back over
+    `periods` inflows that grow by the factor `growth` per period.
+    
+    Matches calculate_cash_flows for whole periods and interpolates between them.
+    """
+    periods = np.asarray(periods, dtype=np.float64)
+    if math.isclose(growth, 1.0):
+        weight_total = periods
+    else:
+        weight_total = (np.power(growth, periods) - 1) / (growth - 1)
+    ratio = growth / (1 + period_rate)
+    if math.isclose(ratio, 1.0):
+        discounted_weights = periods
+    else:
+        discounted_weights = (1 - np.power(ratio, periods)) / (1 - ratio)
+    return returned / weight_total * discounted_weights / (1 + period_rate) - total_investment
+
 class ROICalculatorService:
     """Service for calculating ROI with real-world business factors"""
     
     def __init__(self):
-        # Market condition factors (would be fetched from real APIs in production)
-        self.market_conditions = {
-            'bull_market': 1.15,  # 15% boost in bull market
-            'bear_market': 0.85,  # 15% reduction in bear market
-            'stable_market': 1.0,  # No change in stable market
-        }
-        
-        # Industry-specific multipliers
-        self.industry_multipliers = {
-            'E-commerce': 1.2,
-            'SaaS': 1.3,
-            'Freelancer': 1.1,
-            'Agency': 1.15,
-            'Startup': 1.25,
-            'SMB': 1.05,
-            'Enterprise': 1.1,
-            'Consulting': 1.12,
-            'Restaurant': 0.95,
-            'Retail': 1.0,
-            'Manufacturing': 1.08,
-            'Healthcare': 1.15,
-            'Education': 1.1,
-            'Real Estate': 1.2,
-            'Hospitality': 0.9,
-            'Fitness': 1.05,
-            'Media': 1.18,
-            'Entertainment': 1.22,
-            'Logistics': 1.1,
-            'FinTech': 1.35,
-            'HealthTech': 1.3,
-            'EdTech': 1.25,
-            'GreenTech': 1.2,
-            'Food & Beverage': 1.0,
-            'Fashion': 1.15,
-            'Beauty': 1.12,
-            'Gaming': 1.28,
-            'Travel': 0.85,
-            'Automotive': 1.1,
-            'Construction': 1.05,
-            'Agriculture': 1.08,
-            'Pet Services': 1.1,
-            'Event Planning': 1.05,
-            'Creative Services': 1.15,
-            'Non-profit': 0.8,
-        }
+        # Market condition factors and industry-specific multipliers are shared,
+        # read-only reference data (see app.services.factor_tables)
+        self.market_conditions = MARKET_CONDITIONS
+        self.industry_multipliers = INDUSTRY_MULTIPLIERS
+        
+        # calculate_roi is deterministic in its inputs, so results are memoized on a
+        # normalized key; market analysis only depends on the scenario and is shared
+        self._result_cache = LRUCache(maxsize=RESULT_CACHE_SIZE)
+        self._market_analysis_cache = LRUCache(maxsize=256)
     
     def calculate_roi(
         self,
@@ -63,9 +161,69 @@ class ROICalculatorService:
         mini_scenario_id: int,
         country_code: str,
         business_scenario_name: str,
-        mini_scenario_name: str
+        mini_scenario_name: str,
+        sections: Optional[Iterable[str]] = None
     ) -> Dict[str, Any]:
-        """Calculate comprehensive ROI with real-world factors"""
+        """Calculate comprehensive ROI with real-world factors.
+        
+        `sections` selects which of RESULT_SECTIONS to include (default: all);
+        sections that are not requested are never computed. Returns a fresh
+        top-level dict, but nested sections are shared between callers and
+        must be treated as read-only.
+        """
+        wanted = RESULT_SECTIONS if sections is None else tuple(sections)
+        unknown = [section for section in wanted if section not in RESULT_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+        
+        tables = get_factor_tables()
+        # Scenario names resolve to a factor row and time units to a divisor; the ids
+        # are not part of the calculation
+        key = (
+            tables.version,
+            float(initial_investment),
+            float(additional_costs),
+            float(time_period),
+            self._time_unit_divisor(time_unit),
+            tables.scenario_row(business_scenario_name),
+            tables.mini_column(mini_scenario_name),
+            country_code
+        )
+        result = self._result_cache.get(key)
+        if result is None or any(section not in result for section in wanted):
+            # Recompute with every section cached so far plus the requested ones;
+            # the numeric core is cheap and market analysis is shared
+            cached_sections = [section for section in RESULT_SECTIONS if result is not None and section in result]
+            result = self._compute_roi(
+                initial_investment, additional_costs, time_period, time_unit,
+                country_code, business_scenario_name, mini_scenario_name,
+                sections=set(wanted).union(cached_sections)
+            )
+            self._result_cache.set(key, result)
+        return {
+            field: value for field, value in result.items()
+            if field not in RESULT_SECTIONS or field in wanted
+        }
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and sizes of the memoization caches"""
+        return {
+            'results': self._result_cache.stats(),
+            'market_analysis': self._market_analysis_cache.stats()
+        }
+    
+    def _compute_roi(
+        self,
+        initial_investment: float,
+        additional_costs: float,
+        time_period: int,
+        time_unit: str,
+        country_code: str,
+        business_scenario_name: str,
+        mini_scenario_name: str,
+        sections: Iterable[str] = RESULT_SECTIONS
+    ) -> Dict[str, Any]:
+        """Uncached calculate_roi"""
         
         # Convert time to years for calculations
         time_in_years = self._convert_to_years(time_period, time_unit)
@@ -96,15 +254,7 @@ class ROICalculatorService:
             business_scenario_name, country_code, total_investment
         )
         
-        # Generate market analysis
-        market_analysis = self._generate_market_analysis(business_scenario_name, country_code)
-        
-        # Generate recommendations
-        recommendations = self._generate_recommendations(
-            base_roi, risk_score, after_tax_profit, total_investment, country_code
-        )
-        
-        return {
+        result = {
             'roi_percentage': round(base_roi, 2),
             'net_profit': round(net_profit, 2),
             'annualized_roi': round(annualized_roi, 2),
@@ -113,107 +263,495 @@ class ROICalculatorService:
             'after_tax_profit': round(after_tax_profit, 2),
             'effective_tax_rate': round(effective_tax_rate, 2),
             'risk_score': round(risk_score, 2),
-            'market_analysis': market_analysis,
-            'recommendations': recommendations,
-            'calculation_factors': {
+        }
+        
+        # Generate market analysis
+        if 'market_analysis' in sections:
+            result['market_analysis'] = self._generate_market_analysis(business_scenario_name, country_code)
+        
+        # Generate recommendations
+        if 'recommendations' in sections:
+            result['recommendations'] = self._generate_recommendations(
+                base_roi, risk_score, after_tax_profit, total_investment, country_code
+            )
+        
+        if 'calculation_factors' in sections:
+            result['calculation_factors'] = {
                 'base_roi_rate': base_roi_rate,
                 'market_factor': market_factor,
                 'time_in_years': time_in_years,
                 'industry_multiplier': self.industry_multipliers.get(business_scenario_name, 1.0)
             }
+        
+        return result
+    
+    def calculate_roi_batch(
+        self,
+        initial_investments: Sequence[float],
+        additional_costs: Sequence[float],
+        time_periods: Sequence[float],
+        time_units: Sequence[str],
+        business_scenario_ids: Sequence[int],
+        mini_scenario_ids: Sequence[int],
+        country_codes: Sequence[str],
+        business_scenario_names: Sequence[str],
+        mini_scenario_names: Sequence[str]
+    ) -> Dict[str, Any]:
+        """Calculate the numeric ROI results for many investments at once.
+        
+        Takes one column per calculate_roi argument (all of the same length) and
+        returns one column per field in BATCH_RESULT_FIELDS. Each row matches the
+        corresponding scalar calculate_roi result. Market analysis and
+        recommendations are not produced in batch mode.
+        """
+        columns = [
+            initial_investments, additional_costs, time_periods, time_units,
+            business_scenario_ids, mini_scenario_ids, country_codes,
+            business_scenario_names, mini_scenario_names
+        ]
+        row_count = len(initial_investments)
+        if any(len(column) != row_count for column in columns):
+            raise ValueError("All batch columns must have the same length")
+        
+        investments = np.asarray(initial_investments, dtype=np.float64)
+        costs = np.asarray(additional_costs, dtype=np.float64)
+        periods = np.asarray(time_periods, dtype=np.float64)
+        
+        # Factor lookups only depend on a few categorical inputs, so evaluate them
+        # once per distinct value and broadcast back to the rows
+        units, unit_codes = _factorize(time_units)
+        scenarios, scenario_codes = _factorize(business_scenario_names)
+        scenario_pairs, pair_codes = _factorize(list(zip(business_scenario_names, mini_scenario_names)))
+        tax_keys, tax_codes = _factorize(list(zip(country_codes, business_scenario_names)))
+        
+        unit_divisors = np.array([self._time_unit_divisor(unit) for unit in units], dtype=np.float64)
+        
+        # Resolve the distinct keys to factor table rows once, then gather per row
+        tables = get_factor_tables()
+        scenario_rows = np.array([tables.scenario_row(scenario) for scenario in scenarios], dtype=np.intp)
+        pair_rows = np.array([tables.scenario_row(scenario) for scenario, _ in scenario_pairs], dtype=np.intp)
+        pair_columns = np.array([tables.mini_column(mini) for _, mini in scenario_pairs], dtype=np.intp)
+        tax_country_rows = np.array([tables.country_row(country) for country, _ in tax_keys], dtype=np.intp)
+        tax_scenario_rows = np.array([tables.scenario_row(scenario) for _, scenario in tax_keys], dtype=np.intp)
+        
+        base_roi_rates = tables.base_roi_rate[pair_rows, pair_columns]
+        market_factors = tables.market_factor[scenario_rows]
+        tax_rates = tables.tax_rate[tax_country_rows, tax_scenario_rows]
+        # Risk depends on the same (country, scenario) pairs as taxes
+        base_risks = tables.base_risk[tax_country_rows, tax_scenario_rows]
+        
+        results = self._compute_vectorized(
+            total_investment=investments + costs,
+            time_in_years=periods / unit_divisors[unit_codes],
+            base_roi=base_roi_rates[pair_codes] * market_factors[scenario_codes],
+            effective_tax_rate=tax_rates[tax_codes],
+            base_risk=base_risks[tax_codes]
+        )
+        
+        return {
+            'count': row_count,
+            **{field: _round_column(results[field]) for field in BATCH_RESULT_FIELDS}
+        }
+    
+    def calculate_roi_sweep(
+        self,
+        initial_investments: Sequence[float],
+        time_periods: Sequence[float],
+        country_codes: Sequence[str],
+        additional_costs: float,
+        time_unit: str,
+        business_scenario_name: str,
+        mini_scenario_name: str,
+        metrics: Sequence[str] = BATCH_RESULT_FIELDS
+    ) -> Dict[str, Any]:
+        """Evaluate one scenario over the grid country x initial investment x time period.
+        
+        Each metric comes back as a nested list indexed [country][investment][period],
+        rounded to 2 decimals. Every factor is looked up once per axis value and the
+        grid is filled by broadcasting.
+        """
+        unknown = [metric for metric in metrics if metric not in BATCH_RESULT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        
+        tables = get_factor_tables()
+        scenario_row = tables.scenario_row(business_scenario_name)
+        mini_column = tables.mini_column(mini_scenario_name)
+        country_rows = np.array([tables.country_row(code) for code in country_codes], dtype=np.intp)
+        
+        investments = np.asarray(initial_investments, dtype=np.float64)
+        periods = np.asarray(time_periods, dtype=np.float64)
+        shape = (country_rows.size, investments.size, periods.size)
+        
+        results = self._compute_vectorized(
+            total_investment=(investments + additional_costs)[None, :, None],
+            time_in_years=(periods / self._time_unit_divisor(time_unit))[None, None, :],
+            base_roi=tables.base_roi_rate[scenario_row, mini_column] * tables.market_factor[scenario_row],
+            effective_tax_rate=tables.tax_rate[country_rows, scenario_row][:, None, None],
+            base_risk=tables.base_risk[country_rows, scenario_row][:, None, None]
+        )
+        
+        return {
+            'shape': list(shape),
+            'metrics': {
+                metric: _round_matrix(np.broadcast_to(results[metric], shape))
+                for metric in metrics
+            }
+        }
+    
+    def calculate_roi_matrix(
+        self,
+        business_scenario_ids: Sequence[int],
+        country_codes: Sequence[str],
+        initial_investment: float,
+        additional_costs: float,
+        time_period: float,
+        time_unit: str,
+        mini_scenario_name: str,
+        sections: Iterable[str] = RESULT_SECTIONS
+    ) -> List[Dict[str, Any]]:
+        """Compare scenarios across countries for one investment.
+        
+        Returns one calculate_roi-shaped row per (scenario, country) pair, scenario-major.
+        Per-scenario pieces (base rate, market factor, market analysis, calculation
+        factors) and per-country pieces are resolved once each; the numbers for the
+        whole scenarios x countries matrix come from a single vectorized pass.
+        """
+        sections = tuple(sections)
+        unknown = [section for section in sections if section not in RESULT_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+        if not business_scenario_ids or not country_codes:
+            raise ValueError("At least one scenario and one country are required")
+        
+        tables = get_factor_tables()
+        mini_column = tables.mini_column(mini_scenario_name)
+        scenario_names = [tables.scenario_name(scenario_id) for scenario_id in business_scenario_ids]
+        scenario_rows = np.array([tables.scenario_row(name) for name in scenario_names], dtype=np.intp)
+        country_rows = np.array([tables.country_row(code) for code in country_codes], dtype=np.intp)
+        
+        total_investment = initial_investment + additional_costs
+        time_in_years = self._convert_to_years(time_period, time_unit)
+        base_roi_rate = tables.base_roi_rate[scenario_rows, mini_column]
+        market_factor = tables.market_factor[scenario_rows]
+        
+        results = self._compute_vectorized(
+            total_investment=np.float64(total_investment),
+            time_in_years=np.float64(time_in_years),
+            base_roi=(base_roi_rate * market_factor)[:, None],
+            effective_tax_rate=tables.tax_rate[np.ix_(country_rows, scenario_rows)].T,
+            base_risk=tables.base_risk[np.ix_(country_rows, scenario_rows)].T
+        )
+        shape = (scenario_rows.size, country_rows.size)
+        columns = {
+            field: np.broadcast_to(results[field], shape)
+            for field in BATCH_RESULT_FIELDS
+        }
+        rounded = {field: _round_matrix(values) for field, values in columns.items()}
+        
+        rows = []
+        for i, (scenario_id, scenario_name) in enumerate(zip(business_scenario_ids, scenario_names)):
+            scenario_sections = {}
+            if 'market_analysis' in sections:
+                scenario_sections['market_analysis'] = self._generate_market_analysis(scenario_name, country_codes[0])
+            if 'calculation_factors' in sections:
+                scenario_sections['calculation_factors'] = {
+                    'base_roi_rate': float(base_roi_rate[i]),
+                    'market_factor': float(market_factor[i]),
+                    'time_in_years': time_in_years,
+                    'industry_multiplier': float(tables.industry_multiplier[scenario_rows[i]])
+                }
+            
+            for j, country_code in enumerate(country_codes):
+                row = {
+                    'scenario_id': scenario_id,
+                    'scenario_name': scenario_name,
+                    'mini_scenario_name': mini_scenario_name,
+                    'country_code': country_code,
+                }
+                row.update((field, rounded[field][i][j]) for field in BATCH_RESULT_FIELDS)
+                if 'market_analysis' in scenario_sections:
+                    row['market_analysis'] = scenario_sections['market_analysis']
+                if 'recommendations' in sections:
+                    row['recommendations'] = self._generate_recommendations(
+                        float(columns['roi_percentage'][i, j]),
+                        float(columns['risk_score'][i, j]),
+                        float(columns['after_tax_profit'][i, j]),
+                        total_investment,
+                        country_code
+                    )
+                if 'calculation_factors' in scenario_sections:
+                    row['calculation_factors'] = scenario_sections['calculation_factors']
+                rows.append(row)
+        return rows
+    
+    def calculate_cash_flows(
+        self,
+        initial_investment: float,
+        additional_costs: float,
+        time_period: float,
+        time_unit: str,
+        business_scenario_id: int,
+        mini_scenario_id: int,
+        country_code: str,
+        business_scenario_name: str,
+        mini_scenario_name: str,
+        frequency: str = 'years',
+        discount_rate: float = DEFAULT_DISCOUNT_RATE,
+        cash_flow_growth: float = 0.0
+    ) -> Dict[str, Any]:
+        """Project per-period cash flows for an investment, with NPV, IRR and payback.
+        
+        The total investment goes out at period 0. The principal plus the after-tax
+        profit of calculate_roi come back over the horizon, with each period's inflow
+        `cash_flow_growth` percent larger than the one before.
+        """
+        if frequency not in CASH_FLOW_FREQUENCIES:
+            raise ValueError(f"frequency must be one of {', '.join(CASH_FLOW_FREQUENCIES)}")
+        periods_per_year = CASH_FLOW_FREQUENCIES[frequency]
+        time_in_years = self._convert_to_years(time_period, time_unit)
+        periods = max(1, int(round(time_in_years * periods_per_year)))
+        if periods > MAX_CASH_FLOW_PERIODS:
+            raise ValueError(f"Projection is limited to {MAX_CASH_FLOW_PERIODS} periods")
+        
+        result = self.calculate_roi(
+            initial_investment, additional_costs, time_period, time_unit,
+            business_scenario_id, mini_scenario_id, country_code,
+            business_scenario_name, mini_scenario_name, sections=()
+        )
+        total_investment = initial_investment + additional_costs
+        returned = total_investment + result['after_tax_profit']
+        
+        weights = np.power(1 + cash_flow_growth / 100, np.arange(periods))
+        cash_flows = np.concatenate(([-total_investment], returned * weights / weights.sum()))
+        metrics = self.evaluate_cash_flows(cash_flows[None, :], discount_rate, periods_per_year)
+        
+        return {
+            'frequency': frequency,
+            'periods': periods,
+            'cash_flows': _round_column(cash_flows),
+            'total_investment': result['total_investment'],
+            'after_tax_profit': result['after_tax_profit'],
+            'roi_percentage': result['roi_percentage'],
+            'discount_rate': discount_rate,
+            **{metric: values[0] for metric, values in metrics.items() if metric != 'count'}
+        }
+    
+    def evaluate_cash_flows(
+        self,
+        cash_flows: Sequence[Sequence[float]],
+        discount_rate: float = DEFAULT_DISCOUNT_RATE,
+        periods_per_year: int = 1
+    ) -> Dict[str, Any]:
+        """NPV, IRR and payback for many cash-flow vectors at once.
+        
+        Row i holds the flows of investment i, period 0 first; ragged rows are padded
+        with zeros. `discount_rate` and the returned `irr` are annual percentages, the
+        other figures are per period. Missing IRRs and paybacks come back as None.
+        """
+        flows = as_cash_flow_matrix(cash_flows)
+        if flows.shape[1] > MAX_CASH_FLOW_PERIODS + 1:
+            raise ValueError(f"Cash flows are limited to {MAX_CASH_FLOW_PERIODS} periods")
+        if periods_per_year < 1:
+            raise ValueError("periods_per_year must be at least 1")
+        
+        period_rate = (1 + discount_rate / 100) ** (1 / periods_per_year) - 1
+        rate = irr(flows)
+        payback = payback_period(flows)
+        with np.errstate(over='ignore', invalid='ignore'):
+            annual_irr = (np.power(1 + rate, periods_per_year) - 1) * 100
+        
+        return {
+            'count': int(flows.shape[0]),
+            'npv': _round_column(npv(flows, period_rate)),
+            'irr': _round_column(annual_irr),
+            'irr_per_period': _round_column(rate * 100),
+            'payback_period': _round_column(payback),
+            'payback_years': _round_column(payback / periods_per_year),
+        }
+    
+    def goal_seek(
+        self,
+        solve_for: str,
+        target_metric: str,
+        target_value: float,
+        initial_investment: float,
+        additional_costs: float,
+        time_period: float,
+        time_unit: str,
+        business_scenario_name: str,
+        mini_scenario_name: str,
+        country_codes: Sequence[str],
+        frequency: str = 'years',
+        discount_rate: float = DEFAULT_DISCOUNT_RATE,
+        cash_flow_growth: float = 0.0
+    ) -> Dict[str, Any]:
+        """Find the initial investment or time period that makes a metric hit a target.
+        
+        Solves for every country in one pass. Profit-type metrics are linear in the
+        amount invested and annualized ROI has a closed-form horizon, so those are
+        inverted analytically; NPV over the horizon falls back to batched bisection.
+        NPV uses the level-payment projection of calculate_cash_flows. The input for
+        the unknown is ignored.
+        """
+        if solve_for not in GOAL_SEEK_TARGETS:
+            raise ValueError(f"solve_for must be one of {', '.join(GOAL_SEEK_TARGETS)}")
+        if target_metric not in GOAL_SEEK_TARGETS[solve_for]:
+            raise ValueError(
+                f"Cannot solve {solve_for} for {target_metric}; "
+                f"supported metrics: {', '.join(GOAL_SEEK_TARGETS[solve_for])}"
+            )
+        if frequency not in CASH_FLOW_FREQUENCIES:
+            raise ValueError(f"frequency must be one of {', '.join(CASH_FLOW_FREQUENCIES)}")
+        if not country_codes:
+            raise ValueError("At least one country is required")
+        
+        tables = get_factor_tables()
+        scenario_row = tables.scenario_row(business_scenario_name)
+        mini_column = tables.mini_column(mini_scenario_name)
+        country_rows = np.array([tables.country_row(code) for code in country_codes], dtype=np.intp)
+        
+        base_roi = float(tables.base_roi_rate[scenario_row, mini_column] * tables.market_factor[scenario_row])
+        effective_tax_rate = tables.tax_rate[country_rows, scenario_row]
+        base_risk = tables.base_risk[country_rows, scenario_row]
+        # After-tax profit per unit of total investment
+        after_tax_share = (base_roi / 100) * (1 - effective_tax_rate / 100)
+        
+        divisor = self._time_unit_divisor(time_unit)
+        periods_per_year = CASH_FLOW_FREQUENCIES[frequency]
+        period_rate = (1 + discount_rate / 100) ** (1 / periods_per_year) - 1
+        growth = 1 + cash_flow_growth / 100
+        
+        def npv_at(total_investment, time_in_years):
+            periods = np.maximum(time_in_years * periods_per_year, 1.0)
+            return _level_npv(total_investment, total_investment * (1 + after_tax_share), periods, period_rate, growth)
+        
+        method = 'analytic'
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            if solve_for == 'initial_investment':
+                time_in_years = np.full(country_rows.size, time_period / divisor)
+                per_unit = {
+                    'net_profit': np.full(country_rows.size, base_roi / 100),
+                    'tax_amount': (base_roi / 100) * (effective_tax_rate / 100),
+                    'after_tax_profit': after_tax_share,
+                    'total_investment': np.ones(country_rows.size),
+                    'npv': npv_at(1.0, time_in_years),
+                }[target_metric]
+                total_investment = target_value / per_unit
+                solved = np.isfinite(total_investment) & (total_investment - additional_costs >= 0)
+            else:
+                total_investment = np.full(country_rows.size, float(initial_investment + additional_costs))
+                if target_metric == 'npv':
+                    method = 'bisection'
+                    time_in_years = _bisect(
+                        lambda years: npv_at(total_investment, years),
+                        np.full(country_rows.size, 1 / periods_per_year),
+                        np.full(country_rows.size, float(GOAL_SEEK_MAX_YEARS)),
+                        target_value
+                    )
+                else:
+                    # (1 + roi) ** (1 / years) == 1 + target
+                    roi = base_roi if target_metric == 'annualized_roi' else base_roi * (1 - effective_tax_rate / 100)
+                    time_in_years = np.log1p(roi / 100) / np.log1p(target_value / 100) * np.ones(country_rows.size)
+                solved = np.isfinite(time_in_years) & (time_in_years > 0)
+            
+            total_investment = np.where(solved, total_investment, np.nan)
+            time_in_years = np.where(solved, time_in_years, np.nan)
+            results = self._compute_vectorized(
+                total_investment, time_in_years, base_roi, effective_tax_rate, base_risk
+            )
+            results['after_tax_annualized_roi'] = (
+                np.power(1 + base_roi * (1 - effective_tax_rate / 100) / 100, 1 / time_in_years) - 1
+            ) * 100
+            results['npv'] = npv_at(total_investment, time_in_years)
+        
+        columns = {
+            'initial_investment': _round_column(total_investment - additional_costs),
+            'time_period': _round_column(time_in_years * divisor),
+            'achieved': _round_column(np.broadcast_to(results[target_metric], country_rows.shape)),
+        }
+        columns.update(
+            (field, _round_column(np.broadcast_to(results[field], country_rows.shape)))
+            for field in BATCH_RESULT_FIELDS
+        )
+        
+        return {
+            'solve_for': solve_for,
+            'target_metric': target_metric,
+            'target_value': target_value,
+            'time_unit': time_unit,
+            'method': method,
+            'results': [
+                {
+                    'country_code': country_code,
+                    'status': 'solved' if solved[i] else 'unreachable',
+                    **{field: values[i] for field, values in columns.items()}
+                }
+                for i, country_code in enumerate(country_codes)
+            ]
+        }
+    
+    def _compute_vectorized(
+        self,
+        total_investment: np.ndarray,
+        time_in_years: np.ndarray,
+        base_roi: np.ndarray,
+        effective_tax_rate: np.ndarray,
+        base_risk: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Elementwise ROI math shared by the batch and grid paths; inputs only need to broadcast"""
+        net_profit = total_investment * (base_roi / 100)
+        
+        # Annualized ROI (CAGR); non-positive horizons fall back to the plain ROI
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            annualized = (np.power(1 + (base_roi / 100), 1 / time_in_years) - 1) * 100
+        annualized_roi = np.where(time_in_years <= 0, base_roi, annualized)
+        
+        tax_amount = net_profit * (effective_tax_rate / 100)
+        after_tax_profit = net_profit - tax_amount
+        
+        amount_risk = np.where(
+            total_investment > 100000, 1.0, np.where(total_investment > 50000, 0.5, 0.0)
+        )
+        risk_score = np.clip(base_risk + amount_risk, 0.0, 10.0)
+        
+        return {
+            'roi_percentage': base_roi,
+            'net_profit': net_profit,
+            'annualized_roi': annualized_roi,
+            'total_investment': total_investment,
+            'tax_amount': tax_amount,
+            'after_tax_profit': after_tax_profit,
+            'effective_tax_rate': effective_tax_rate,
+            'risk_score': risk_score,
         }
     
     def _convert_to_years(self, time_period: int, time_unit: str) -> float:
         """Convert time period to years"""
+        return time_period / self._time_unit_divisor(time_unit)
+    
+    def _time_unit_divisor(self, time_unit: str) -> float:
+        """Number of time units per year"""
         if time_unit.lower() == 'years':
-            return float(time_period)
+            return 1.0
         elif time_unit.lower() == 'months':
-            return time_period / 12.0
+            return 12.0
         elif time_unit.lower() == 'weeks':
-            return time_period / 52.0
+            return 52.0
         elif time_unit.lower() == 'days':
-            return time_period / 365.0
+            return 365.0
         else:
-            return float(time_period)  # Default to years
+            return 1.0  # Default to years
     
     def _get_scenario_factors(self, business_scenario: str, mini_scenario: str) -> float:
-        """Get base ROI rate for the specific scenario"""
-        
-        # Base rates for different business scenarios
-        base_rates = {
-            'E-commerce': {
-                'Dropshipping Store': 25.0,
-                'Amazon FBA': 30.0,
-                'Shopify Store': 22.0,
-                'Digital Products': 40.0,
-                'Subscription Box': 18.0,
-                'Print on Demand': 20.0,
-                'Affiliate Marketing': 35.0,
-            },
-            'SaaS': {
-                'B2B SaaS': 28.0,
-                'Mobile App': 35.0,
-                'API Service': 40.0,
-                'Browser Extension': 25.0,
-                'Desktop Software': 22.0,
-                'Cloud Platform': 20.0,
-                'Developer Tools': 30.0,
-            },
-            'Freelancer': {
-                'Web Development': 45.0,
-                'Graphic Design': 40.0,
-                'Content Writing': 50.0,
-                'Digital Marketing': 35.0,
-                'Consulting': 30.0,
-                'Translation': 35.0,
-                'Virtual Assistant': 60.0,
-            },
-            'Startup': {
-                'Tech Startup': 25.0,
-                'HealthTech Startup': 30.0,
-                'FinTech Startup': 35.0,
-                'EdTech Startup': 28.0,
-                'GreenTech Startup': 22.0,
-                'FoodTech Startup': 32.0,
-                'AI Startup': 40.0,
-            },
-            'Agency': {
-                'Digital Marketing Agency': 30.0,
-                'Web Design Agency': 35.0,
-                'Content Marketing Agency': 40.0,
-                'SEO Agency': 35.0,
-                'Social Media Agency': 30.0,
-                'PR Agency': 25.0,
-                'Branding Agency': 30.0,
-            }
-        }
-        
-        # Get base rate for the scenario
-        scenario_rates = base_rates.get(business_scenario, {})
-        base_rate = scenario_rates.get(mini_scenario, 20.0)  # Default 20%
-        
-        # Apply industry multiplier
-        industry_multiplier = self.industry_multipliers.get(business_scenario, 1.0)
-        adjusted_rate = base_rate * industry_multiplier
-        
-        return adjusted_rate
+        """Get base ROI rate for the specific scenario (industry multiplier applied)"""
+        tables = get_factor_tables()
+        return float(tables.base_roi_rate[tables.scenario_row(business_scenario), tables.mini_column(mini_scenario)])
     
     def _apply_market_conditions(self, business_scenario: str) -> float:
         """Apply current market conditions to ROI calculation"""
-        
-        # Simulate market conditions (in production, this would be real market data)
-        market_indicators = {
-            'E-commerce': 'bull_market',  # Strong growth in e-commerce
-            'SaaS': 'bull_market',        # Tech sector performing well
-            'FinTech': 'bull_market',     # Financial tech booming
-            'HealthTech': 'bull_market',  # Healthcare tech growing
-            'Travel': 'bear_market',      # Travel industry recovering
-            'Restaurant': 'stable_market', # Food service stable
-            'Real Estate': 'stable_market', # Real estate stable
-        }
-        
-        market_condition = market_indicators.get(business_scenario, 'stable_market')
-        return self.market_conditions[market_condition]
+        tables = get_factor_tables()
+        return float(tables.market_factor[tables.scenario_row(business_scenario)])
     
     def _calculate_annualized_roi(self, roi_percentage: float, time_in_years: float) -> float:
         """Calculate annualized ROI"""
@@ -227,52 +765,7 @@ class ROICalculatorService:
     
     def _calculate_taxes(self, net_profit: float, country_code: str, business_scenario: str) -> tuple:
         """Calculate taxes based on country and business type"""
-        
-        # Real corporate tax rates by country (2024 data)
-        tax_rates = {
-            'US': {'corporate': 21.0, 'capital_gains': 15.0, 'dividend': 15.0},    # Federal corporate tax rate
-            'GB': {'corporate': 25.0, 'capital_gains': 20.0, 'dividend': 7.5},     # UK corporation tax rate (updated 2024)
-            'DE': {'corporate': 29.9, 'capital_gains': 25.0, 'dividend': 26.4},    # German corporate tax (including trade tax)
-            'FR': {'corporate': 25.8, 'capital_gains': 30.0, 'dividend': 30.0},    # French corporate tax rate (updated 2024)
-            'CA': {'corporate': 26.5, 'capital_gains': 16.5, 'dividend': 15.0},    # Canadian federal + provincial average
-            'AU': {'corporate': 30.0, 'capital_gains': 23.5, 'dividend': 23.5},    # Australian corporate tax rate
-            'JP': {'corporate': 29.7, 'capital_gains': 20.3, 'dividend': 20.3},    # Japanese corporate tax rate
-            'SG': {'corporate': 17.0, 'capital_gains': 0.0, 'dividend': 0.0},      # Singapore corporate tax rate
-            'NL': {'corporate': 25.8, 'capital_gains': 30.0, 'dividend': 15.0},    # Dutch corporate tax rate
-            'CH': {'corporate': 18.0, 'capital_gains': 0.0, 'dividend': 35.0},     # Swiss corporate tax rate (average)
-            'SE': {'corporate': 20.6, 'capital_gains': 30.0, 'dividend': 30.0},    # Swedish corporate tax rate
-            'NO': {'corporate': 22.0, 'capital_gains': 22.0, 'dividend': 22.0},    # Norwegian corporate tax rate
-            'DK': {'corporate': 22.0, 'capital_gains': 27.0, 'dividend': 27.0},    # Danish corporate tax rate
-            'FI': {'corporate': 20.0, 'capital_gains': 30.0, 'dividend': 30.0},    # Finnish corporate tax rate
-            'IE': {'corporate': 12.5, 'capital_gains': 33.0, 'dividend': 25.0},    # Irish corporate tax rate
-            'ES': {'corporate': 25.0, 'capital_gains': 23.0, 'dividend': 23.0},    # Spanish corporate tax rate
-            'IT': {'corporate': 24.0, 'capital_gains': 26.0, 'dividend': 26.0},    # Italian corporate tax rate
-            'BE': {'corporate': 25.0, 'capital_gains': 0.0, 'dividend': 30.0},     # Belgian corporate tax rate
-            'AT': {'corporate': 25.0, 'capital_gains': 27.5, 'dividend': 27.5},    # Austrian corporate tax rate
-            'PL': {'corporate': 19.0, 'capital_gains': 19.0, 'dividend': 19.0},    # Polish corporate tax rate
-            'CZ': {'corporate': 19.0, 'capital_gains': 15.0, 'dividend': 15.0},    # Czech corporate tax rate
-            'HU': {'corporate': 9.0, 'capital_gains': 15.0, 'dividend': 15.0},     # Hungarian corporate tax rate
-            'SK': {'corporate': 21.0, 'capital_gains': 19.0, 'dividend': 19.0},    # Slovak corporate tax rate
-            'SI': {'corporate': 19.0, 'capital_gains': 27.5, 'dividend': 27.5},    # Slovenian corporate tax rate
-            'EE': {'corporate': 20.0, 'capital_gains': 20.0, 'dividend': 20.0},    # Estonian corporate tax rate
-        }
-        
-        # Get tax rates for the country
-        country_taxes = tax_rates.get(country_code, {'corporate': 25.0, 'capital_gains': 20.0, 'dividend': 20.0})
-        
-        # Determine applicable tax rate based on business type
-        if business_scenario in ['SaaS', 'FinTech', 'HealthTech', 'EdTech']:
-            # Tech companies often have different tax considerations
-            effective_tax_rate = country_taxes['corporate'] * 0.8  # 20% reduction for tech
-        elif business_scenario in ['E-commerce', 'Retail']:
-            # Retail businesses
-            effective_tax_rate = country_taxes['corporate']
-        elif business_scenario in ['Freelancer', 'Consulting']:
-            # Service businesses
-            effective_tax_rate = country_taxes['corporate'] * 1.1  # 10% increase for services
-        else:
-            # Default to corporate tax rate
-            effective_tax_rate = country_taxes['corporate']
+        effective_tax_rate = self._effective_tax_rate(country_code, business_scenario)
         
         # Calculate tax amount
         tax_amount = net_profit * (effective_tax_rate / 100)
@@ -280,147 +773,54 @@ class ROICalculatorService:
         
         return tax_amount, after_tax_profit, effective_tax_rate
     
+    def _effective_tax_rate(self, country_code: str, business_scenario: str) -> float:
+        """Effective tax rate (%) for a business type in a country"""
+        tables = get_factor_tables()
+        return float(tables.tax_rate[tables.country_row(country_code), tables.scenario_row(business_scenario)])
+    
     def _calculate_risk_score(self, business_scenario: str, country_code: str, investment_amount: float) -> float:
         """Calculate risk score (0-10) based on various factors"""
         
-        # Base risk scores for different scenarios
-        scenario_risks = {
-            'E-commerce': 4.0,
-            'SaaS': 5.0,
-            'Freelancer': 3.0,
-            'Agency': 4.5,
-            'Startup': 7.0,
-            'SMB': 4.0,
-            'Enterprise': 3.5,
-            'Consulting': 3.5,
-            'Restaurant': 6.0,
-            'Retail': 5.0,
-            'Manufacturing': 5.5,
-            'Healthcare': 4.0,
-            'Education': 3.5,
-            'Real Estate': 6.5,
-            'Hospitality': 6.5,
-            'Fitness': 5.0,
-            'Media': 5.5,
-            'Entertainment': 6.0,
-            'Logistics': 4.5,
-            'FinTech': 6.5,
-            'HealthTech': 6.0,
-            'EdTech': 5.5,
-            'GreenTech': 5.0,
-            'Food & Beverage': 5.5,
-            'Fashion': 5.5,
-            'Beauty': 4.5,
-            'Gaming': 6.0,
-            'Travel': 7.0,
-            'Automotive': 5.0,
-            'Construction': 5.5,
-            'Agriculture': 6.0,
-            'Pet Services': 4.0,
-            'Event Planning': 5.0,
-            'Creative Services': 4.5,
-            'Non-profit': 3.0,
-        }
-        
-        base_risk = scenario_risks.get(business_scenario, 5.0)
-        
-        # Country risk factors
-        country_risks = {
-            'US': 0.0, 'GB': 0.5, 'DE': 0.0, 'FR': 0.5, 'CA': 0.0,
-            'AU': 0.0, 'JP': 0.0, 'SG': -0.5, 'NL': 0.0, 'CH': -0.5,
-            'SE': 0.0, 'NO': 0.0, 'DK': 0.0, 'FI': 0.0, 'IE': 0.5,
-            'ES': 1.0, 'IT': 1.0, 'BE': 0.5, 'AT': 0.0, 'PL': 1.0,
-            'CZ': 1.0, 'HU': 1.5, 'SK': 1.0, 'SI': 1.0, 'EE': 1.0,
-        }
-        
-        country_risk = country_risks.get(country_code, 1.0)
-        
-        # Investment amount risk factor
-        if investment_amount > 100000:
-            amount_risk = 1.0  # Higher risk for large investments
-        elif investment_amount > 50000:
-            amount_risk = 0.5
-        else:
-            amount_risk = 0.0
-        
         # Calculate final risk score
-        final_risk = base_risk + country_risk + amount_risk
+        final_risk = self._scenario_country_risk(business_scenario, country_code) + self._investment_amount_risk(investment_amount)
         
         # Ensure risk score is between 0 and 10
         return max(0.0, min(10.0, final_risk))
     
+    def _scenario_country_risk(self, business_scenario: str, country_code: str) -> float:
+        """Unclamped risk contributed by the business scenario and the country"""
+        tables = get_factor_tables()
+        return float(tables.base_risk[tables.country_row(country_code), tables.scenario_row(business_scenario)])
+    
+    def _investment_amount_risk(self, investment_amount: float) -> float:
+        """Investment amount risk factor"""
+        if investment_amount > 100000:
+            return 1.0  # Higher risk for large investments
+        elif investment_amount > 50000:
+            return 0.5
+        else:
+            return 0.0
+    
     def _generate_market_analysis(self, business_scenario: str, country_code: str) -> Dict[str, Any]:
         """Generate market analysis for the business scenario"""
-        
-        # Market size estimates (in billions USD)
-        market_sizes = {
-            'E-commerce': 5000,
-            'SaaS': 1500,
-            'FinTech': 800,
-            'HealthTech': 600,
-            'EdTech': 400,
-            'GreenTech': 300,
-            'Gaming': 200,
-            'Real Estate': 3000,
-            'Healthcare': 4000,
-            'Education': 2000,
-            'Travel': 800,
-            'Automotive': 2500,
-            'Fashion': 1500,
-            'Food & Beverage': 3000,
-        }
-        
-        market_size = market_sizes.get(business_scenario, 500)
-        
-        # Growth rates
-        growth_rates = {
-            'E-commerce': 15.0,
-            'SaaS': 20.0,
-            'FinTech': 25.0,
-            'HealthTech': 22.0,
-            'EdTech': 18.0,
-            'GreenTech': 12.0,
-            'Gaming': 16.0,
-            'Real Estate': 8.0,
-            'Healthcare': 10.0,
-            'Education': 12.0,
-            'Travel': 5.0,
-            'Automotive': 6.0,
-            'Fashion': 8.0,
-            'Food & Beverage': 6.0,
-        }
-        
-        growth_rate = growth_rates.get(business_scenario, 10.0)
-        
-        # Competition levels
-        competition_levels = {
-            'E-commerce': 'High',
-            'SaaS': 'Medium',
-            'FinTech': 'Medium',
-            'HealthTech': 'Medium',
-            'EdTech': 'Medium',
-            'GreenTech': 'Low',
-            'Gaming': 'High',
-            'Real Estate': 'High',
-            'Healthcare': 'Medium',
-            'Education': 'Medium',
-            'Travel': 'High',
-            'Automotive': 'High',
-            'Fashion': 'High',
-            'Food & Beverage': 'High',
-        }
-        
-        competition_level = competition_levels.get(business_scenario, 'Medium')
-        
-        return {
-            'market_size': market_size,
-            'growth_rate': growth_rate,
-            'competition_level': competition_level,
-            'market_trends': self._generate_market_trends(business_scenario),
-            'key_players': self._generate_key_players(business_scenario),
-            'opportunities': self._generate_opportunities(business_scenario),
-            'threats': self._generate_threats(business_scenario),
-        }
+        tables = get_factor_tables()
+        row = tables.scenario_row(business_scenario)
+        
+        # The analysis does not depend on the country, so one copy per scenario is shared
+        key = (tables.version, row)
+        market_analysis = self._market_analysis_cache.get(key)
+        if market_analysis is None:
+            market_analysis = {
+                'market_size': tables.market_size[row],
+                'growth_rate': tables.growth_rate[row],
+                'competition_level': tables.competition_level[row],
+                'market_trends': self._generate_market_trends(business_scenario),
+                'key_players': self._generate_key_players(business_scenario),
+                'opportunities': self._generate_opportunities(business_scenario),
+                'threats': self._generate_threats(business_scenario),
+            }
+            self._market_analysis_cache.set(key, market_analysis)
+        return market_analysis
     
     def _generate_market_trends(self, business_scenario: str) -> List[Dict[str, Any]]:
         """Generate market trends data"""
@@ -533,34 +933,37 @@ class ROICalculatorService:
         
         # ROI-based recommendations
         if roi_percentage > 25:
-            recommendations.append("Excellent ROI potential - consider scaling up investment")
+            recommendations.append(RECOMMENDATIONS['roi_excellent'])
         elif roi_percentage > 15:
-            recommendations.append("Strong ROI - proceed with recommended investment amount")
+            recommendations.append(RECOMMENDATIONS['roi_strong'])
         elif roi_percentage > 10:
-            recommendations.append("Moderate ROI - consider optimization strategies")
+            recommendations.append(RECOMMENDATIONS['roi_moderate'])
         else:
-            recommendations.append("Low ROI - evaluate alternative investment opportunities")
+            recommendations.append(RECOMMENDATIONS['roi_low'])
         
         # Risk-based recommendations
         if risk_score > 7:
-            recommendations.append("High risk profile - implement comprehensive risk mitigation")
+            recommendations.append(RECOMMENDATIONS['risk_high'])
         elif risk_score > 5:
-            recommendations.append("Moderate risk - consider diversification strategies")
+            recommendations.append(RECOMMENDATIONS['risk_moderate'])
         else:
-            recommendations.append("Low risk profile - suitable for conservative investors")
+            recommendations.append(RECOMMENDATIONS['risk_low'])
         
         # Profit-based recommendations
         if after_tax_profit > total_investment * 0.2:
-            recommendations.append("Strong after-tax returns - attractive for long-term investment")
+            recommendations.append(RECOMMENDATIONS['profit_strong'])
         elif after_tax_profit > total_investment * 0.1:
-            recommendations.append("Decent after-tax returns - monitor performance closely")
+            recommendations.append(RECOMMENDATIONS['profit_decent'])
         else:
-            recommendations.append("Low after-tax returns - evaluate tax optimization strategies")
+            recommendations.append(RECOMMENDATIONS['profit_low'])
         
         # Country-specific recommendations
         if country_code in ['SG', 'HK', 'AE']:
-            recommendations.append("Consider tax advantages in the selected jurisdiction")
+            recommendations.append(RECOMMENDATIONS['tax_advantage'])
         elif country_code in ['US', 'GB', 'DE']:
-            recommendations.append("Stable regulatory environment - favorable for business growth")
+            recommendations.append(RECOMMENDATIONS['stable_regulation'])
         
-        return recommendations
\ No newline at end of file
+        return recommendations
+
+# Global calculator service instance
+calculator_service = ROICalculatorService()
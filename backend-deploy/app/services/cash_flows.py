@@ -0,0 +1,132 @@
+from typing import Sequence
+
+import numpy as np
+
+# Per-period rate bracket the IRR solver searches; -99% to 1,000,000% per period
+IRR_LOWER_BOUND = -0.99
+IRR_UPPER_BOUND = 1e4
+
+IRR_TOLERANCE = 1e-10
+IRR_MAX_ITERATIONS = 100
+
+def as_cash_flow_matrix(cash_flows: Sequence[Sequence[float]]) -> np.ndarray:
+    """Stack cash-flow vectors into a 2D float array, zero-padding ragged rows.
+
+    Trailing zero flows change neither NPV, IRR nor payback, so padding is exact.
+    """
+    if isinstance(cash_flows, np.ndarray):
+        return np.atleast_2d(cash_flows.astype(np.float64, copy=False))
+    rows = [np.asarray(row, dtype=np.float64).ravel() for row in cash_flows]
+    matrix = np.zeros((len(rows), max((row.size for row in rows), default=0)))
+    for i, row in enumerate(rows):
+        matrix[i, :row.size] = row
+    return matrix
+
+def _npv_and_slope(columns: np.ndarray, rate: np.ndarray):
+    """NPV of each cash-flow vector at its own per-period rate, and d NPV / d rate.
+
+    `columns` holds one period per row (the transposed cash-flow matrix). The
+    polynomial in the discount factor 1 / (1 + rate) is evaluated by Horner's
+    scheme, one period at a time, so no per-element powers are computed.
+    """
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        discount = 1 / (1 + rate)
+        value = np.zeros_like(discount)
+        derivative = np.zeros_like(discount)
+        for column in columns[::-1]:
+            derivative = derivative * discount + value
+            value = value * discount + column
+        slope = -derivative * discount * discount
+    return value, slope
+
+def npv(cash_flows: np.ndarray, rate) -> np.ndarray:
+    """Net present value of each row; flow t is discounted by (1 + rate) ** t"""
+    flows = as_cash_flow_matrix(cash_flows)
+    rate = np.broadcast_to(np.asarray(rate, dtype=np.float64), (flows.shape[0],))
+    return _npv_and_slope(np.ascontiguousarray(flows.T), rate)[0]
+
+def irr(cash_flows: np.ndarray) -> np.ndarray:
+    """Per-period internal rate of return of each row, NaN where none exists.
+
+    Solves all rows at once with a safeguarded Newton iteration: a bracket with a
+    sign change is kept per row and any Newton step that leaves it is replaced by
+    bisection, so every row converges even where Newton alone would diverge.
+    Rows with several sign changes get one of their roots.
+    """
+    flows = as_cash_flow_matrix(cash_flows)
+    columns = np.ascontiguousarray(flows.T)
+    rows = flows.shape[0]
+
+    low = np.full(rows, IRR_LOWER_BOUND)
+    high = np.full(rows, 0.1)
+    value_low = _npv_and_slope(columns, low)[0]
+    value_high = _npv_and_slope(columns, high)[0]
+
+    # Widen the upper end until the NPV changes sign or the bound is reached
+    while True:
+        widen = (np.sign(value_low) == np.sign(value_high)) & (high < IRR_UPPER_BOUND)
+        if not widen.any():
+            break
+        low[widen] = high[widen]
+        value_low[widen] = value_high[widen]
+        high[widen] = np.minimum(high[widen] * 10 + 1, IRR_UPPER_BOUND)
+        value_high[widen] = _npv_and_slope(columns[:, widen], high[widen])[0]
+
+    # Ends may overflow to +/-inf at very negative rates; only their sign matters
+    solvable = ~np.isnan(value_low) & ~np.isnan(value_high) & (np.sign(value_low) != np.sign(value_high))
+
+    # Start from the rate that turns total outflows into total inflows over the
+    # flow-weighted mean horizon, which is close to the root for conventional flows
+    periods = np.arange(flows.shape[1])
+    inflows = np.where(flows > 0, flows, 0.0)
+    outflows = np.where(flows < 0, -flows, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        horizon = (inflows @ periods) / inflows.sum(axis=1) - (outflows @ periods) / outflows.sum(axis=1)
+        guess = np.power(inflows.sum(axis=1) / outflows.sum(axis=1), 1 / horizon) - 1
+    inside = np.isfinite(guess) & (guess > low) & (guess < high)
+    rate = np.where(solvable, np.where(inside, guess, (low + high) / 2), np.nan)
+    active = solvable.copy()
+
+    for _ in range(IRR_MAX_ITERATIONS):
+        if not active.any():
+            break
+        index = np.flatnonzero(active)
+        value, slope = _npv_and_slope(columns[:, index], rate[index])
+
+        # Shrink the bracket around the root
+        same_side = np.sign(value) == np.sign(value_low[index])
+        low[index] = np.where(same_side, rate[index], low[index])
+        value_low[index] = np.where(same_side, value, value_low[index])
+        high[index] = np.where(same_side, high[index], rate[index])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate[index] - value / slope
+        inside = np.isfinite(newton) & (newton >= low[index]) & (newton <= high[index])
+        step = np.where(inside, newton, (low[index] + high[index]) / 2)
+
+        done = (value == 0) | (inside & (np.abs(step - rate[index]) <= IRR_TOLERANCE * (1 + np.abs(step))))
+        done |= high[index] - low[index] <= IRR_TOLERANCE * (1 + np.abs(step))
+        rate[index] = np.where(value == 0, rate[index], step)
+        active[index[done]] = False
+
+    return rate
+
+def payback_period(cash_flows: np.ndarray) -> np.ndarray:
+    """Periods until cumulative cash flow turns non-negative, NaN if it never does.
+
+    Interpolates linearly inside the period in which the balance crosses zero.
+    """
+    flows = as_cash_flow_matrix(cash_flows)
+    cumulative = np.cumsum(flows, axis=1)
+    recovered = cumulative >= 0
+    # First period from which the balance stays recovered
+    stays_recovered = np.flip(np.logical_and.accumulate(np.flip(recovered, axis=1), axis=1), axis=1)
+    has_payback = stays_recovered.any(axis=1)
+    first = np.argmax(stays_recovered, axis=1)
+
+    rows = np.arange(flows.shape[0])
+    previous = np.maximum(first - 1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = -cumulative[rows, previous] / flows[rows, first]
+    period = np.where(first == 0, 0.0, previous + fraction)
+    return np.where(has_payback, period, np.nan)
@@ -0,0 +1,188 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, Callable
+
+from fastapi.routing import APIRoute
+
+# Modules the forkserver imports once; process pool workers are forked from it with
+# these already loaded (tasks from other modules are imported per worker on first use)
+PROCESS_POOL_PRELOAD = ["app.services.pdf_generator"]
+
+# Executor per workload class: kind ("thread" or "process"), worker count and how
+# many calls may wait for a worker before new ones are rejected.
+#   db       blocking ORM calls
+#   crypto   password hashing; hashlib releases the GIL, so threads run in parallel
+#   pdf      reportlab is pure Python and holds the GIL. Threads by default;
+#            EXECUTOR_PDF_KIND=process renders in forkserver worker processes
+#   compute  vectorized numpy work, which releases the GIL
+WORKLOAD_POOLS = {
+    "db": ("thread", int(os.getenv("EXECUTOR_DB_WORKERS", "16")), int(os.getenv("EXECUTOR_DB_QUEUE", "256"))),
+    "crypto": ("thread", int(os.getenv("EXECUTOR_CRYPTO_WORKERS", str(os.cpu_count() or 2))), int(os.getenv("EXECUTOR_CRYPTO_QUEUE", "64"))),
+    "pdf": (os.getenv("EXECUTOR_PDF_KIND", "thread"), int(os.getenv("EXECUTOR_PDF_WORKERS", "2")), int(os.getenv("EXECUTOR_PDF_QUEUE", "16"))),
+    "compute": ("thread", int(os.getenv("EXECUTOR_COMPUTE_WORKERS", str(os.cpu_count() or 2))), int(os.getenv("EXECUTOR_COMPUTE_QUEUE", "64"))),
+}
+
+class PoolSaturated(RuntimeError):
+    """A workload pool's queue is full; the caller should retry later"""
+
+def _timed_call(fn: Callable, args, kwargs):
+    """Runs in the worker: returns the wall-clock start time with the result"""
+    started = time.time()
+    return started, fn(*args, **kwargs)
+
+class WorkloadPool:
+    """Bounded executor for one workload class, with queue and wait-time metrics"""
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind for {name}: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def _get_executor(self):
+        # Created on first use so unused process pools never start
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # Forkserver rather than spawn: workers fork from a clean server with
+                    # only the preload imported, not the running app. They still import
+                    # __main__ as __mp_main__, so the launcher must be guarded by __name__.
+                    context = multiprocessing.get_context("forkserver")
+                    context.set_forkserver_preload(PROCESS_POOL_PRELOAD)
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker"
+                    )
+            return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on this pool and await its result.
+
+        Raises PoolSaturated instead of queueing beyond max_queue waiting calls.
+        Process pools need fn and its arguments to be picklable.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._counters["rejected"] += 1
+                raise PoolSaturated(f"The {self.name} pool is saturated")
+            self._pending += 1
+            self._counters["submitted"] += 1
+
+        submitted = time.time()
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            call = functools.partial(contextvars.copy_context().run, self._track, _timed_call, fn, args, kwargs)
+        else:
+            call = functools.partial(_timed_call, fn, args, kwargs)
+            self._mark_running(1)
+        try:
+            started, result = await loop.run_in_executor(self._get_executor(), call)
+        except BaseException:
+            self._finish(submitted, None, failed=True)
+            raise
+        self._finish(submitted, started)
+        return result
+
+    def _track(self, call: Callable, *args):
+        """Thread-pool wrapper that keeps the running count exact"""
+        self._mark_running(1)
+        try:
+            return call(*args)
+        finally:
+            self._mark_running(-1)
+
+    def _mark_running(self, delta: int):
+        with self._lock:
+            self._running += delta
+
+    def _finish(self, submitted: float, started, failed: bool = False):
+        finished = time.time()
+        with self._lock:
+            self._pending -= 1
+            if self.kind == "process":
+                # Process tasks are not observable while queued; count them as running throughout
+                self._running -= 1
+            self._counters["failed" if failed else "completed"] += 1
+            if started is not None:
+                wait = max(0.0, started - submitted)
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._run_total += finished - started
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._counters["completed"]
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": max(0, self._pending - self._running),
+                **self._counters,
+                "wait_ms_avg": round(self._wait_total / completed * 1000, 3) if completed else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+                "run_ms_avg": round(self._run_total / completed * 1000, 3) if completed else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+class WorkloadPools:
+    """The WORKLOAD_POOLS executors, by workload class"""
+
+    def __init__(self, config: Dict[str, tuple] = WORKLOAD_POOLS):
+        self.pools = {name: WorkloadPool(name, *settings) for name, settings in config.items()}
+
+    async def run(self, workload: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the pool for its workload class"""
+        return await self.pools[workload].run(fn, *args, **kwargs)
+
+    def wrap(self, workload: str, handler: Callable) -> Callable:
+        """Async version of a blocking handler that runs on a workload pool, same signature"""
+        pool = self.pools[workload]
+
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            return await pool.run(handler, *args, **kwargs)
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.shutdown()
+
+# Global workload pools instance
+workload_pools = WorkloadPools()
+
+class DBPoolRoute(APIRoute):
+    """Route class for routers on the blocking Session: plain `def` handlers run on
+    the db pool instead of FastAPI's shared threadpool"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = workload_pools.wrap("db", endpoint)
+        super().__init__(path, endpoint, **kwargs)
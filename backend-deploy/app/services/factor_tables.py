@@ -0,0 +1,522 @@
+"""Process-wide, immutable factor tables for the ROI calculator.
+
+The reference factors below are compiled once into NumPy arrays indexed by
+integer scenario, mini-scenario and country rows, so a calculation is a
+handful of index lookups. The id -> row mapping comes from the reference
+tables in the database (falling back to the seed data), and the whole table
+set is swapped atomically by reload_factor_tables() when that data changes.
+"""
+import hashlib
+import itertools
+import threading
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+
+import numpy as np
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, BusinessScenario, MiniScenario, TaxCountry
+
+# Fallbacks used when an id is not present in the reference data
+DEFAULT_SCENARIO_NAME = "E-commerce"
+DEFAULT_MINI_SCENARIO_NAME = "General"
+
+# Market condition factors (would be fetched from real APIs in production)
+MARKET_CONDITIONS = {
+    'bull_market': 1.15,  # 15% boost in bull market
+    'bear_market': 0.85,  # 15% reduction in bear market
+    'stable_market': 1.0,  # No change in stable market
+}
+
+# Industry-specific multipliers
+INDUSTRY_MULTIPLIERS = {
+    'E-commerce': 1.2,
+    'SaaS': 1.3,
+    'Freelancer': 1.1,
+    'Agency': 1.15,
+    'Startup': 1.25,
+    'SMB': 1.05,
+    'Enterprise': 1.1,
+    'Consulting': 1.12,
+    'Restaurant': 0.95,
+    'Retail': 1.0,
+    'Manufacturing': 1.08,
+    'Healthcare': 1.15,
+    'Education': 1.1,
+    'Real Estate': 1.2,
+    'Hospitality': 0.9,
+    'Fitness': 1.05,
+    'Media': 1.18,
+    'Entertainment': 1.22,
+    'Logistics': 1.1,
+    'FinTech': 1.35,
+    'HealthTech': 1.3,
+    'EdTech': 1.25,
+    'GreenTech': 1.2,
+    'Food & Beverage': 1.0,
+    'Fashion': 1.15,
+    'Beauty': 1.12,
+    'Gaming': 1.28,
+    'Travel': 0.85,
+    'Automotive': 1.1,
+    'Construction': 1.05,
+    'Agriculture': 1.08,
+    'Pet Services': 1.1,
+    'Event Planning': 1.05,
+    'Creative Services': 1.15,
+    'Non-profit': 0.8,
+}
+
+# Base ROI rates (%) for different business scenarios and their mini scenarios
+BASE_RATES = {
+    'E-commerce': {
+        'Dropshipping Store': 25.0,
+        'Amazon FBA': 30.0,
+        'Shopify Store': 22.0,
+        'Digital Products': 40.0,
+        'Subscription Box': 18.0,
+        'Print on Demand': 20.0,
+        'Affiliate Marketing': 35.0,
+    },
+    'SaaS': {
+        'B2B SaaS': 28.0,
+        'Mobile App': 35.0,
+        'API Service': 40.0,
+        'Browser Extension': 25.0,
+        'Desktop Software': 22.0,
+        'Cloud Platform': 20.0,
+        'Developer Tools': 30.0,
+    },
+    'Freelancer': {
+        'Web Development': 45.0,
+        'Graphic Design': 40.0,
+        'Content Writing': 50.0,
+        'Digital Marketing': 35.0,
+        'Consulting': 30.0,
+        'Translation': 35.0,
+        'Virtual Assistant': 60.0,
+    },
+    'Startup': {
+        'Tech Startup': 25.0,
+        'HealthTech Startup': 30.0,
+        'FinTech Startup': 35.0,
+        'EdTech Startup': 28.0,
+        'GreenTech Startup': 22.0,
+        'FoodTech Startup': 32.0,
+        'AI Startup': 40.0,
+    },
+    'Agency': {
+        'Digital Marketing Agency': 30.0,
+        'Web Design Agency': 35.0,
+        'Content Marketing Agency': 40.0,
+        'SEO Agency': 35.0,
+        'Social Media Agency': 30.0,
+        'PR Agency': 25.0,
+        'Branding Agency': 30.0,
+    }
+}
+
+# Simulated market conditions (in production, this would be real market data)
+MARKET_INDICATORS = {
+    'E-commerce': 'bull_market',  # Strong growth in e-commerce
+    'SaaS': 'bull_market',        # Tech sector performing well
+    'FinTech': 'bull_market',     # Financial tech booming
+    'HealthTech': 'bull_market',  # Healthcare tech growing
+    'Travel': 'bear_market',      # Travel industry recovering
+    'Restaurant': 'stable_market', # Food service stable
+    'Real Estate': 'stable_market', # Real estate stable
+}
+
+# Real corporate tax rates by country (2024 data)
+TAX_RATES = {
+    'US': {'corporate': 21.0, 'capital_gains': 15.0, 'dividend': 15.0},    # Federal corporate tax rate
+    'GB': {'corporate': 25.0, 'capital_gains': 20.0, 'dividend': 7.5},     # UK corporation tax rate (updated 2024)
+    'DE': {'corporate': 29.9, 'capital_gains': 25.0, 'dividend': 26.4},    # German corporate tax (including trade tax)
+    'FR': {'corporate': 25.8, 'capital_gains': 30.0, 'dividend': 30.0},    # French corporate tax rate (updated 2024)
+    'CA': {'corporate': 26.5, 'capital_gains': 16.5, 'dividend': 15.0},    # Canadian federal + provincial average
+    'AU': {'corporate': 30.0, 'capital_gains': 23.5, 'dividend': 23.5},    # Australian corporate tax rate
+    'JP': {'corporate': 29.7, 'capital_gains': 20.3, 'dividend': 20.3},    # Japanese corporate tax rate
+    'SG': {'corporate': 17.0, 'capital_gains': 0.0, 'dividend': 0.0},      # Singapore corporate tax rate
+    'NL': {'corporate': 25.8, 'capital_gains': 30.0, 'dividend': 15.0},    # Dutch corporate tax rate
+    'CH': {'corporate': 18.0, 'capital_gains': 0.0, 'dividend': 35.0},     # Swiss corporate tax rate (average)
+    'SE': {'corporate': 20.6, 'capital_gains': 30.0, 'dividend': 30.0},    # Swedish corporate tax rate
+    'NO': {'corporate': 22.0, 'capital_gains': 22.0, 'dividend': 22.0},    # Norwegian corporate tax rate
+    'DK': {'corporate': 22.0, 'capital_gains': 27.0, 'dividend': 27.0},    # Danish corporate tax rate
+    'FI': {'corporate': 20.0, 'capital_gains': 30.0, 'dividend': 30.0},    # Finnish corporate tax rate
+    'IE': {'corporate': 12.5, 'capital_gains': 33.0, 'dividend': 25.0},    # Irish corporate tax rate
+    'ES': {'corporate': 25.0, 'capital_gains': 23.0, 'dividend': 23.0},    # Spanish corporate tax rate
+    'IT': {'corporate': 24.0, 'capital_gains': 26.0, 'dividend': 26.0},    # Italian corporate tax rate
+    'BE': {'corporate': 25.0, 'capital_gains': 0.0, 'dividend': 30.0},     # Belgian corporate tax rate
+    'AT': {'corporate': 25.0, 'capital_gains': 27.5, 'dividend': 27.5},    # Austrian corporate tax rate
+    'PL': {'corporate': 19.0, 'capital_gains': 19.0, 'dividend': 19.0},    # Polish corporate tax rate
+    'CZ': {'corporate': 19.0, 'capital_gains': 15.0, 'dividend': 15.0},    # Czech corporate tax rate
+    'HU': {'corporate': 9.0, 'capital_gains': 15.0, 'dividend': 15.0},     # Hungarian corporate tax rate
+    'SK': {'corporate': 21.0, 'capital_gains': 19.0, 'dividend': 19.0},    # Slovak corporate tax rate
+    'SI': {'corporate': 19.0, 'capital_gains': 27.5, 'dividend': 27.5},    # Slovenian corporate tax rate
+    'EE': {'corporate': 20.0, 'capital_gains': 20.0, 'dividend': 20.0},    # Estonian corporate tax rate
+}
+
+DEFAULT_TAX_RATES = {'corporate': 25.0, 'capital_gains': 20.0, 'dividend': 20.0}
+
+# Multiplier applied to the corporate rate depending on the business type
+TAX_TREATMENT_MULTIPLIERS = {
+    # Tech companies often have different tax considerations
+    'SaaS': 0.8, 'FinTech': 0.8, 'HealthTech': 0.8, 'EdTech': 0.8,  # 20% reduction for tech
+    # Retail businesses
+    'E-commerce': 1.0, 'Retail': 1.0,
+    # Service businesses
+    'Freelancer': 1.1, 'Consulting': 1.1,  # 10% increase for services
+}
+
+# Base risk scores for different scenarios
+SCENARIO_RISKS = {
+    'E-commerce': 4.0,
+    'SaaS': 5.0,
+    'Freelancer': 3.0,
+    'Agency': 4.5,
+    'Startup': 7.0,
+    'SMB': 4.0,
+    'Enterprise': 3.5,
+    'Consulting': 3.5,
+    'Restaurant': 6.0,
+    'Retail': 5.0,
+    'Manufacturing': 5.5,
+    'Healthcare': 4.0,
+    'Education': 3.5,
+    'Real Estate': 6.5,
+    'Hospitality': 6.5,
+    'Fitness': 5.0,
+    'Media': 5.5,
+    'Entertainment': 6.0,
+    'Logistics': 4.5,
+    'FinTech': 6.5,
+    'HealthTech': 6.0,
+    'EdTech': 5.5,
+    'GreenTech': 5.0,
+    'Food & Beverage': 5.5,
+    'Fashion': 5.5,
+    'Beauty': 4.5,
+    'Gaming': 6.0,
+    'Travel': 7.0,
+    'Automotive': 5.0,
+    'Construction': 5.5,
+    'Agriculture': 6.0,
+    'Pet Services': 4.0,
+    'Event Planning': 5.0,
+    'Creative Services': 4.5,
+    'Non-profit': 3.0,
+}
+
+# Country risk factors
+COUNTRY_RISKS = {
+    'US': 0.0, 'GB': 0.5, 'DE': 0.0, 'FR': 0.5, 'CA': 0.0,
+    'AU': 0.0, 'JP': 0.0, 'SG': -0.5, 'NL': 0.0, 'CH': -0.5,
+    'SE': 0.0, 'NO': 0.0, 'DK': 0.0, 'FI': 0.0, 'IE': 0.5,
+    'ES': 1.0, 'IT': 1.0, 'BE': 0.5, 'AT': 0.0, 'PL': 1.0,
+    'CZ': 1.0, 'HU': 1.5, 'SK': 1.0, 'SI': 1.0, 'EE': 1.0,
+}
+
+# Market size estimates (in billions USD)
+MARKET_SIZES = {
+    'E-commerce': 5000,
+    'SaaS': 1500,
+    'FinTech': 800,
+    'HealthTech': 600,
+    'EdTech': 400,
+    'GreenTech': 300,
+    'Gaming': 200,
+    'Real Estate': 3000,
+    'Healthcare': 4000,
+    'Education': 2000,
+    'Travel': 800,
+    'Automotive': 2500,
+    'Fashion': 1500,
+    'Food & Beverage': 3000,
+}
+
+# Growth rates
+GROWTH_RATES = {
+    'E-commerce': 15.0,
+    'SaaS': 20.0,
+    'FinTech': 25.0,
+    'HealthTech': 22.0,
+    'EdTech': 18.0,
+    'GreenTech': 12.0,
+    'Gaming': 16.0,
+    'Real Estate': 8.0,
+    'Healthcare': 10.0,
+    'Education': 12.0,
+    'Travel': 5.0,
+    'Automotive': 6.0,
+    'Fashion': 8.0,
+    'Food & Beverage': 6.0,
+}
+
+# Competition levels
+COMPETITION_LEVELS = {
+    'E-commerce': 'High',
+    'SaaS': 'Medium',
+    'FinTech': 'Medium',
+    'HealthTech': 'Medium',
+    'EdTech': 'Medium',
+    'GreenTech': 'Low',
+    'Gaming': 'High',
+    'Real Estate': 'High',
+    'Healthcare': 'Medium',
+    'Education': 'Medium',
+    'Travel': 'High',
+    'Automotive': 'High',
+    'Fashion': 'High',
+    'Food & Beverage': 'High',
+}
+
+
+def _frozen(values: Iterable[Any]) -> np.ndarray:
+    """Build a read-only float64 array"""
+    array = np.array(list(values), dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+class FactorTables:
+    """Immutable, array-backed calculator factors.
+    
+    Every axis (scenario, mini scenario, country) has one extra trailing row
+    holding the defaults for unknown keys, so lookups never miss.
+    """
+    
+    def __init__(
+        self,
+        scenarios: List[Tuple[int, str, Optional[float], Optional[float], Optional[float], Optional[float]]],
+        mini_scenarios: List[Tuple[int, str, Optional[int], Optional[float], Optional[float], Optional[float], Optional[float]]],
+        countries: List[Tuple[Optional[int], str]],
+        version: int,
+        reference_rows: Iterable[Any] = ()
+    ):
+        """scenarios: (id, name, typical_roi_min, typical_roi_max,
+                       recommended_investment_min, recommended_investment_max)
+        mini_scenarios: (id, name, business_scenario_id, typical_roi_min, typical_roi_max,
+                         recommended_investment_min, recommended_investment_max)
+        countries: (id, country_code)
+        reference_rows: full reference-data rows, folded into fingerprint
+        """
+        self.version = version
+        
+        # Scenario axis: reference-data scenarios plus any scenario the factor data knows by name
+        names = [scenario[1] for scenario in scenarios]
+        for table in (INDUSTRY_MULTIPLIERS, BASE_RATES, MARKET_INDICATORS, TAX_TREATMENT_MULTIPLIERS,
+                      SCENARIO_RISKS, MARKET_SIZES, GROWTH_RATES, COMPETITION_LEVELS):
+            names.extend(table)
+        self.scenario_names = tuple(dict.fromkeys(names))
+        self.scenario_rows = {name: row for row, name in enumerate(self.scenario_names)}
+        self.default_scenario_row = len(self.scenario_names)
+        self.scenario_ids = {scenario[0]: self.scenario_rows[scenario[1]] for scenario in scenarios}
+        self.mini_scenario_names = {mini[0]: mini[1] for mini in mini_scenarios}
+        
+        # Typical ROI range (%) from the reference data; NaN where the scenario has none
+        typical_roi = np.full((self.default_scenario_row + 1, 2), np.nan)
+        for _, name, roi_min, roi_max, _, _ in scenarios:
+            if roi_min is not None and roi_max is not None:
+                typical_roi[self.scenario_rows[name]] = (roi_min, roi_max)
+        typical_roi.flags.writeable = False
+        self.typical_roi = typical_roi
+        self.mini_typical_roi = {
+            mini_id: (business_scenario_id, roi_min, roi_max)
+            for mini_id, _, business_scenario_id, roi_min, roi_max, _, _ in mini_scenarios
+            if roi_min is not None and roi_max is not None
+        }
+        
+        # Recommended investment ranges; (min, max) per scenario id, and
+        # (id, business_scenario_id, name, min, max) per mini scenario
+        self.scenario_budgets = {
+            scenario_id: (budget_min, budget_max)
+            for scenario_id, _, _, _, budget_min, budget_max in scenarios
+        }
+        self.mini_scenario_budgets = tuple(
+            (mini_id, business_scenario_id, name, budget_min, budget_max)
+            for mini_id, name, business_scenario_id, _, _, budget_min, budget_max in mini_scenarios
+        )
+        
+        # Mini scenario axis: only names with a dedicated base rate get their own column
+        mini_names = dict.fromkeys(mini for rates in BASE_RATES.values() for mini in rates)
+        self.mini_columns = {name: column for column, name in enumerate(mini_names)}
+        self.default_mini_column = len(self.mini_columns)
+        
+        # Country axis
+        codes = [code for _, code in countries]
+        codes.extend(TAX_RATES)
+        codes.extend(COUNTRY_RISKS)
+        self.country_codes = tuple(dict.fromkeys(codes))
+        self.country_rows = {code: row for row, code in enumerate(self.country_codes)}
+        self.default_country_row = len(self.country_codes)
+        self.country_ids = {
+            country_id: self.country_rows[code] for country_id, code in countries if country_id is not None
+        }
+        self.country_db_ids = {code: country_id for country_id, code in countries if country_id is not None}
+        
+        scenario_axis = self.scenario_names + (None,)
+        country_axis = self.country_codes + (None,)
+        
+        self.industry_multiplier = _frozen(INDUSTRY_MULTIPLIERS.get(name, 1.0) for name in scenario_axis)
+        self.market_factor = _frozen(
+            MARKET_CONDITIONS[MARKET_INDICATORS.get(name, 'stable_market')] for name in scenario_axis
+        )
+        # Base ROI rate already includes the industry multiplier
+        self.base_roi_rate = _frozen(
+            [
+                [BASE_RATES.get(name, {}).get(mini, 20.0) * INDUSTRY_MULTIPLIERS.get(name, 1.0)
+                 for mini in list(self.mini_columns) + [None]]
+                for name in scenario_axis
+            ]
+        )
+        # Effective tax rate (%) per (country, scenario)
+        self.tax_rate = _frozen(
+            [
+                [TAX_RATES.get(code, DEFAULT_TAX_RATES)['corporate'] * TAX_TREATMENT_MULTIPLIERS.get(name, 1.0)
+                 for name in scenario_axis]
+                for code in country_axis
+            ]
+        )
+        # Unclamped scenario + country risk per (country, scenario); the investment amount is added per calculation
+        self.base_risk = _frozen(
+            [
+                [SCENARIO_RISKS.get(name, 5.0) + COUNTRY_RISKS.get(code, 1.0) for name in scenario_axis]
+                for code in country_axis
+            ]
+        )
+        
+        # Market analysis headline figures keep their original Python types for serialization
+        self.market_size = tuple(MARKET_SIZES.get(name, 500) for name in scenario_axis)
+        self.growth_rate = tuple(GROWTH_RATES.get(name, 10.0) for name in scenario_axis)
+        self.competition_level = tuple(COMPETITION_LEVELS.get(name, 'Medium') for name in scenario_axis)
+        
+        # Content hash of the reference data and compiled factors. Unlike version (a
+        # per-process counter) it is the same in every worker that loaded the same data.
+        digest = hashlib.sha256(repr((scenarios, mini_scenarios, countries, list(reference_rows))).encode())
+        for array in (self.typical_roi, self.industry_multiplier, self.market_factor,
+                      self.base_roi_rate, self.tax_rate, self.base_risk):
+            digest.update(array.tobytes())
+        digest.update(repr((self.market_size, self.growth_rate, self.competition_level)).encode())
+        self.fingerprint = int.from_bytes(digest.digest()[:4], "big") >> 1
+    
+    def scenario_row(self, business_scenario: str) -> int:
+        """Row for a business scenario name"""
+        return self.scenario_rows.get(business_scenario, self.default_scenario_row)
+    
+    def mini_column(self, mini_scenario: str) -> int:
+        """Column for a mini scenario name"""
+        return self.mini_columns.get(mini_scenario, self.default_mini_column)
+    
+    def country_row(self, country_code: str) -> int:
+        """Row for a country code"""
+        return self.country_rows.get(country_code, self.default_country_row)
+    
+    def country_id(self, country_code: str) -> Optional[int]:
+        """Reference-data id for a country code, None if it is not in the database"""
+        return self.country_db_ids.get(country_code)
+    
+    def country_code(self, country_id: Optional[int]) -> Optional[str]:
+        """Country code for a reference-data id"""
+        row = self.country_ids.get(country_id)
+        return self.country_codes[row] if row is not None else None
+    
+    def scenario_name(self, scenario_id: int) -> str:
+        """Business scenario name for a scenario id"""
+        row = self.scenario_ids.get(scenario_id)
+        return self.scenario_names[row] if row is not None else DEFAULT_SCENARIO_NAME
+    
+    def mini_scenario_name(self, mini_scenario_id: int) -> str:
+        """Mini scenario name for a mini scenario id"""
+        return self.mini_scenario_names.get(mini_scenario_id, DEFAULT_MINI_SCENARIO_NAME)
+    
+    def typical_roi_range(self, scenario_id: int, mini_scenario_id: Optional[int] = None) -> Optional[Tuple[float, float]]:
+        """Typical ROI range (%) for a scenario, preferring the mini scenario's own range"""
+        mini = self.mini_typical_roi.get(mini_scenario_id)
+        if mini is not None and mini[0] == scenario_id:
+            return float(mini[1]), float(mini[2])
+        
+        row = self.scenario_ids.get(scenario_id)
+        if row is None or np.isnan(self.typical_roi[row, 0]):
+            return None
+        return float(self.typical_roi[row, 0]), float(self.typical_roi[row, 1])
+
+_versions = itertools.count(1)
+_tables: Optional[FactorTables] = None
+_tables_lock = threading.Lock()
+
+def load_factor_tables(db: Optional[Session] = None) -> FactorTables:
+    """Build factor tables from the reference data in the database, falling back to seed data"""
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
+    
+    try:
+        scenarios = [
+            (row.id, row.name, row.typical_roi_min, row.typical_roi_max,
+             row.recommended_investment_min, row.recommended_investment_max)
+            for row in db.query(
+                BusinessScenario.id, BusinessScenario.name,
+                BusinessScenario.typical_roi_min, BusinessScenario.typical_roi_max,
+                BusinessScenario.recommended_investment_min, BusinessScenario.recommended_investment_max
+            ).order_by(BusinessScenario.id)
+        ]
+        mini_scenarios = [
+            (row.id, row.name, row.business_scenario_id, row.typical_roi_min, row.typical_roi_max,
+             row.recommended_investment_min, row.recommended_investment_max)
+            for row in db.query(
+                MiniScenario.id, MiniScenario.name, MiniScenario.business_scenario_id,
+                MiniScenario.typical_roi_min, MiniScenario.typical_roi_max,
+                MiniScenario.recommended_investment_min, MiniScenario.recommended_investment_max
+            ).order_by(MiniScenario.id)
+        ]
+        countries = [
+            (row.id, row.country_code)
+            for row in db.query(TaxCountry.id, TaxCountry.country_code).order_by(TaxCountry.id)
+        ]
+        # Timestamps are left out: every worker's startup reseed rewrites them
+        reference_rows = [
+            tuple(row)
+            for model in (BusinessScenario, MiniScenario, TaxCountry)
+            for row in db.query(
+                *[column for column in model.__table__.columns if not isinstance(column.type, DateTime)]
+            ).order_by(model.id)
+        ]
+    except Exception as e:
+        print(f"⚠️  Could not read reference data for factor tables: {e}")
+        scenarios, mini_scenarios, countries, reference_rows = [], [], [], []
+    finally:
+        if owns_session:
+            db.close()
+    
+    if not scenarios:
+        from app.complete_seed_data import create_comprehensive_seed_data
+        scenarios = [
+            (scenario['id'], scenario['name'], scenario['typical_roi_min'], scenario['typical_roi_max'],
+             scenario['recommended_investment_min'], scenario['recommended_investment_max'])
+            for scenario in create_comprehensive_seed_data()
+        ]
+    if not countries:
+        countries = [(None, code) for code in TAX_RATES]
+    
+    return FactorTables(scenarios, mini_scenarios, countries, version=next(_versions), reference_rows=reference_rows)
+
+def get_factor_tables() -> FactorTables:
+    """Return the current factor tables, loading them on first use"""
+    global _tables
+    tables = _tables
+    if tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = load_factor_tables()
+            tables = _tables
+    return tables
+
+def reload_factor_tables(db: Optional[Session] = None) -> FactorTables:
+    """Rebuild the factor tables and swap them in atomically.
+    
+    Readers that already hold the previous tables keep using them until they finish.
+    """
+    global _tables
+    tables = load_factor_tables(db)
+    with _tables_lock:
+        _tables = tables
+    return tables
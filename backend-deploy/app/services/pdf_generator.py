@@ -172,4 +172,8 @@ class PDFGeneratorService:
 
 
 # Create service instance
-pdf_generator_service = PDFGeneratorService()
\ No newline at end of file
+pdf_generator_service = PDFGeneratorService()
+
+def generate_simple_report(calculation_data: Dict[str, Any]) -> str:
+    """Module-level entry point so the report can be built in a worker process"""
+    return pdf_generator_service.generate_simple_report(calculation_data)
@@ -0,0 +1,155 @@
+import threading
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from app.services.factor_tables import FactorTables, get_factor_tables, DEFAULT_MINI_SCENARIO_NAME
+
+# Horizon the precomputed annualized ROI refers to
+RANKING_HORIZON_YEARS = 3.0
+
+# Columns the index can be sorted by, with True for descending order
+RANKING_SORT_KEYS = {
+    'after_tax_roi': True,
+    'annualized_roi': True,
+    'roi_percentage': True,
+    'risk_score': False,
+}
+
+class RankingIndex:
+    """Every scenario x mini scenario x country combination, precomputed and pre-sorted.
+
+    Risk is scored at the bottom of the combination's recommended investment
+    range, i.e. the smallest ticket that gets a user in.
+    """
+
+    def __init__(self, tables: FactorTables):
+        self.version = tables.version
+
+        # One entry per (scenario, mini scenario); scenarios without minis rank as "General"
+        combos = []
+        minis_by_scenario = {}
+        for mini_id, scenario_id, name, budget_min, budget_max in tables.mini_scenario_budgets:
+            minis_by_scenario.setdefault(scenario_id, []).append((mini_id, name, budget_min, budget_max))
+        for scenario_id in tables.scenario_ids:
+            scenario_min, scenario_max = tables.scenario_budgets.get(scenario_id, (None, None))
+            minis = minis_by_scenario.get(scenario_id) or [(None, DEFAULT_MINI_SCENARIO_NAME, None, None)]
+            for mini_id, name, budget_min, budget_max in minis:
+                combos.append((
+                    scenario_id, mini_id, name,
+                    budget_min if budget_min is not None else scenario_min,
+                    budget_max if budget_max is not None else scenario_max,
+                ))
+
+        self.scenario_id_list = tuple(combo[0] for combo in combos)
+        self.mini_scenario_id_list = tuple(combo[1] for combo in combos)
+        self.mini_scenario_name_list = tuple(combo[2] for combo in combos)
+        self.scenario_name_list = tuple(tables.scenario_name(scenario_id) for scenario_id in self.scenario_id_list)
+        self.country_codes = tables.country_codes
+
+        scenario_rows = np.array([tables.scenario_ids[combo[0]] for combo in combos], dtype=np.intp)
+        mini_columns = np.array([tables.mini_column(combo[2]) for combo in combos], dtype=np.intp)
+        budget_min = np.array([combo[3] if combo[3] is not None else 0.0 for combo in combos], dtype=np.float64)
+        budget_max = np.array([combo[4] if combo[4] is not None else np.inf for combo in combos], dtype=np.float64)
+
+        # Matrices are (combo, country), flattened combo-major
+        countries = len(self.country_codes)
+        roi = tables.base_roi_rate[scenario_rows, mini_columns] * tables.market_factor[scenario_rows]
+        tax = tables.tax_rate[:countries, :][:, scenario_rows].T
+        amount_risk = np.where(budget_min > 100000, 1.0, np.where(budget_min > 50000, 0.5, 0.0))
+        risk = np.clip(tables.base_risk[:countries, :][:, scenario_rows].T + amount_risk[:, None], 0.0, 10.0)
+        after_tax = roi[:, None] * (1 - tax / 100)
+        annualized = (np.power(1 + roi / 100, 1 / RANKING_HORIZON_YEARS) - 1) * 100
+
+        shape = (len(combos), countries)
+        self.combo = np.repeat(np.arange(len(combos)), countries)
+        self.country = np.tile(np.arange(countries), len(combos))
+        self.columns = {
+            'roi_percentage': np.broadcast_to(roi[:, None], shape).ravel(),
+            'after_tax_roi': after_tax.ravel(),
+            'annualized_roi': np.broadcast_to(annualized[:, None], shape).ravel(),
+            'risk_score': risk.ravel(),
+            'effective_tax_rate': tax.ravel(),
+            'budget_min': np.broadcast_to(budget_min[:, None], shape).ravel(),
+            'budget_max': np.broadcast_to(budget_max[:, None], shape).ravel(),
+        }
+        # Stable sorts keep ties in scenario/mini/country order
+        self.orders = {
+            key: np.argsort(-self.columns[key] if descending else self.columns[key], kind='stable')
+            for key, descending in RANKING_SORT_KEYS.items()
+        }
+
+    def __len__(self) -> int:
+        return self.combo.size
+
+    def top(
+        self,
+        k: int = 10,
+        sort_by: str = 'after_tax_roi',
+        budget_min: Optional[float] = None,
+        budget_max: Optional[float] = None,
+        max_risk: Optional[float] = None,
+        country_codes: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Best k combinations whose recommended investment range overlaps the budget"""
+        if sort_by not in RANKING_SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(RANKING_SORT_KEYS)}")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        mask = np.ones(len(self), dtype=bool)
+        if budget_min is not None:
+            mask &= self.columns['budget_max'] >= budget_min
+        if budget_max is not None:
+            mask &= self.columns['budget_min'] <= budget_max
+        if max_risk is not None:
+            mask &= self.columns['risk_score'] <= max_risk
+        if country_codes:
+            wanted = np.zeros(len(self.country_codes), dtype=bool)
+            known = {code: index for index, code in enumerate(self.country_codes)}
+            wanted[[known[code] for code in country_codes if code in known]] = True
+            mask &= wanted[self.country]
+
+        order = self.orders[sort_by]
+        matches = order[mask[order]]
+
+        results = []
+        for rank, entry in enumerate(matches[:k].tolist(), start=1):
+            combo = self.combo[entry]
+            budget_max_value = self.columns['budget_max'][entry]
+            results.append({
+                'rank': rank,
+                'business_scenario_id': self.scenario_id_list[combo],
+                'business_scenario_name': self.scenario_name_list[combo],
+                'mini_scenario_id': self.mini_scenario_id_list[combo],
+                'mini_scenario_name': self.mini_scenario_name_list[combo],
+                'country_code': self.country_codes[self.country[entry]],
+                'recommended_investment_min': round(float(self.columns['budget_min'][entry]), 2),
+                'recommended_investment_max': round(float(budget_max_value), 2) if np.isfinite(budget_max_value) else None,
+                **{
+                    column: round(float(self.columns[column][entry]), 2)
+                    for column in ('after_tax_roi', 'roi_percentage', 'annualized_roi', 'risk_score', 'effective_tax_rate')
+                },
+            })
+
+        return {
+            'index_version': self.version,
+            'horizon_years': RANKING_HORIZON_YEARS,
+            'matches': int(matches.size),
+            'results': results,
+        }
+
+_index: Optional[RankingIndex] = None
+_index_lock = threading.Lock()
+
+def get_ranking_index() -> RankingIndex:
+    """Ranking index for the current factor tables, rebuilt whenever they are reloaded"""
+    global _index
+    tables = get_factor_tables()
+    index = _index
+    if index is None or index.version != tables.version:
+        with _index_lock:
+            if _index is None or _index.version != tables.version:
+                _index = RankingIndex(tables)
+            index = _index
+    return index
@@ -0,0 +1,124 @@
+import json
+import math
+import struct
+from typing import Dict, Any, Optional
+
+from app.services.calculator import calculator_service, BATCH_RESULT_FIELDS, RECOMMENDATIONS
+
+# Layout of an encoded calculate_roi result:
+#   header   version, section flags, int mask (core fields that were ints), 8 core doubles
+#   factors  4 doubles, if FLAG_FACTORS
+#   market   scenario name (u8 length + utf-8) if FLAG_MARKET_REF, or JSON (u32 length) if FLAG_MARKET_INLINE
+#   recs     u8 count, then per item a catalogue index or INLINE_TEXT + u16 length + utf-8
+RESULT_FORMAT_VERSION = 1
+
+FLAG_FACTORS = 0x01
+FLAG_MARKET_REF = 0x02
+FLAG_MARKET_INLINE = 0x04
+FLAG_RECOMMENDATIONS = 0x08
+
+_HEADER = struct.Struct("<BBB8d")
+_FACTORS = struct.Struct("<4d")
+FACTOR_FIELDS = ("base_roi_rate", "market_factor", "time_in_years", "industry_multiplier")
+
+_CATALOGUE = tuple(RECOMMENDATIONS.values())
+_CATALOGUE_INDEX = {text: index for index, text in enumerate(_CATALOGUE)}
+INLINE_TEXT = 0xFF
+
+def encode_result(result: Dict[str, Any], business_scenario_name: Optional[str] = None) -> bytes:
+    """Pack a calculate_roi result into bytes.
+
+    With the scenario name the market analysis is stored as a reference to the
+    calculator's shared per-scenario copy instead of being serialized.
+    """
+    flags = 0
+    int_mask = 0
+    core = []
+    for position, field in enumerate(BATCH_RESULT_FIELDS):
+        value = result.get(field)
+        if isinstance(value, int) and not isinstance(value, bool):
+            int_mask |= 1 << position
+        core.append(math.nan if value is None else float(value))
+
+    tail = []
+    factors = result.get("calculation_factors")
+    if factors is not None:
+        flags |= FLAG_FACTORS
+        tail.append(_FACTORS.pack(*(float(factors[field]) for field in FACTOR_FIELDS)))
+
+    market_analysis = result.get("market_analysis")
+    if market_analysis is not None:
+        if business_scenario_name is not None and \
+                market_analysis is calculator_service._generate_market_analysis(business_scenario_name, None):
+            flags |= FLAG_MARKET_REF
+            name = business_scenario_name.encode()
+            tail.append(struct.pack("<B", len(name)) + name)
+        else:
+            flags |= FLAG_MARKET_INLINE
+            data = json.dumps(market_analysis, separators=(",", ":"), default=str).encode()
+            tail.append(struct.pack("<I", len(data)) + data)
+
+    recommendations = result.get("recommendations")
+    if recommendations is not None:
+        flags |= FLAG_RECOMMENDATIONS
+        items = [struct.pack("<B", len(recommendations))]
+        for text in recommendations:
+            index = _CATALOGUE_INDEX.get(text)
+            if index is not None:
+                items.append(struct.pack("<B", index))
+            else:
+                data = text.encode()
+                items.append(struct.pack("<BH", INLINE_TEXT, len(data)) + data)
+        tail.append(b"".join(items))
+
+    return _HEADER.pack(RESULT_FORMAT_VERSION, flags, int_mask, *core) + b"".join(tail)
+
+def decode_result(data: bytes) -> Dict[str, Any]:
+    """Rebuild the result dict from encode_result's bytes (same key order as calculate_roi)"""
+    version, flags, int_mask, *core = _HEADER.unpack_from(data)
+    if version != RESULT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported result format version {version}")
+    offset = _HEADER.size
+
+    result = {}
+    for position, (field, value) in enumerate(zip(BATCH_RESULT_FIELDS, core)):
+        if math.isnan(value):
+            result[field] = None
+        elif int_mask & (1 << position):
+            result[field] = int(value)
+        else:
+            result[field] = value
+
+    factors = None
+    if flags & FLAG_FACTORS:
+        factors = dict(zip(FACTOR_FIELDS, _FACTORS.unpack_from(data, offset)))
+        offset += _FACTORS.size
+
+    if flags & FLAG_MARKET_REF:
+        length = data[offset]
+        name = data[offset + 1:offset + 1 + length].decode()
+        offset += 1 + length
+        result["market_analysis"] = calculator_service._generate_market_analysis(name, None)
+    elif flags & FLAG_MARKET_INLINE:
+        (length,) = struct.unpack_from("<I", data, offset)
+        result["market_analysis"] = json.loads(data[offset + 4:offset + 4 + length])
+        offset += 4 + length
+
+    if flags & FLAG_RECOMMENDATIONS:
+        count = data[offset]
+        offset += 1
+        recommendations = []
+        for _ in range(count):
+            index = data[offset]
+            offset += 1
+            if index == INLINE_TEXT:
+                (length,) = struct.unpack_from("<H", data, offset)
+                recommendations.append(data[offset + 2:offset + 2 + length].decode())
+                offset += 2 + length
+            else:
+                recommendations.append(_CATALOGUE[index])
+        result["recommendations"] = recommendations
+
+    if factors is not None:
+        result["calculation_factors"] = factors
+    return result
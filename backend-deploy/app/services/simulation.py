@@ -0,0 +1,207 @@
+import math
+import os
+import secrets
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.calculator import calculator_service
+from app.services.factor_tables import get_factor_tables
+
+# Upper bound on paths per request so a single simulation cannot pin a worker
+MAX_SIMULATION_PATHS = int(os.getenv("SIMULATION_MAX_PATHS", "200000"))
+
+# Paths drawn per chunk; peak memory is a few arrays of this size regardless of the path count
+SIMULATION_CHUNK_SIZE = 50000
+
+# Resolution of the internal histograms that percentiles are read from
+FINE_HISTOGRAM_BINS = 4096
+
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# z-score that makes the typical ROI range a central 90% interval
+TYPICAL_RANGE_Z = 1.6449
+
+class _StreamingHistogram:
+    """Fixed-bin histogram with running moments, filled chunk by chunk"""
+
+    def __init__(self, low: float, high: float, bins: int = FINE_HISTOGRAM_BINS):
+        if high - low < 1e-9:
+            low, high = low - 0.5, high + 0.5
+        self.low = low
+        self.high = high
+        self.width = (high - low) / bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.total = 0
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, values: np.ndarray):
+        """Accumulate a chunk of samples"""
+        index = np.clip(((values - self.low) / self.width).astype(np.int64), 0, self.counts.size - 1)
+        self.counts += np.bincount(index, minlength=self.counts.size)
+        self.total += values.size
+        self.sum += float(values.sum())
+        self.sum_squares += float(np.square(values).sum())
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    def mean(self) -> float:
+        return self.sum / self.total
+
+    def std(self) -> float:
+        variance = self.sum_squares / self.total - self.mean() ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    def quantiles(self, percentiles: Sequence[float]) -> np.ndarray:
+        """Percentiles interpolated linearly inside the fine bins"""
+        edges = self.low + self.width * np.arange(self.counts.size + 1)
+        cumulative = np.concatenate(([0], np.cumsum(self.counts))) / self.total
+        values = np.interp(np.asarray(percentiles, dtype=np.float64) / 100, cumulative, edges)
+        return np.clip(values, self.minimum, self.maximum)
+
+    def coarse(self, bins: int) -> Tuple[List[float], List[float]]:
+        """Histogram over the observed range as (edges, frequencies)"""
+        edges = np.linspace(self.minimum, self.maximum, bins + 1)
+        cumulative = np.interp(edges, self.low + self.width * np.arange(self.counts.size + 1),
+                               np.concatenate(([0], np.cumsum(self.counts))) / self.total)
+        cumulative[0], cumulative[-1] = 0.0, 1.0
+        return [round(edge, 4) for edge in edges.tolist()], [round(freq, 6) for freq in np.diff(cumulative).tolist()]
+
+class ROISimulationService:
+    """Monte Carlo ROI simulation around the scenarios' typical ROI ranges"""
+
+    def simulate(
+        self,
+        initial_investment: float,
+        additional_costs: float,
+        time_period: float,
+        time_unit: str,
+        business_scenario_id: int,
+        mini_scenario_id: int,
+        country_code: str,
+        paths: int = 10000,
+        seed: Optional[int] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        histogram_bins: int = 20,
+        market_volatility: float = 0.10,
+        tax_volatility: float = 2.0
+    ) -> Dict[str, Any]:
+        """Simulate the distribution of ROI outcomes for one investment.
+
+        Each path draws an ROI from a normal distribution whose central 90% spans the
+        typical ROI range, a log-normal market factor around the scenario's market
+        condition, and an effective tax rate around the country's rate. Taxes only
+        apply to gains and losses are capped at the total investment.
+        """
+        if not 1 <= paths <= MAX_SIMULATION_PATHS:
+            raise ValueError(f"paths must be between 1 and {MAX_SIMULATION_PATHS}")
+        if not 1 <= histogram_bins <= 200:
+            raise ValueError("histogram_bins must be between 1 and 200")
+        if any(not 0 <= p <= 100 for p in percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        if market_volatility < 0 or tax_volatility < 0:
+            raise ValueError("volatility must not be negative")
+        if seed is None:
+            seed = secrets.randbelow(2 ** 32)
+
+        tables = get_factor_tables()
+        business_scenario_name = tables.scenario_name(business_scenario_id)
+        scenario_row = tables.scenario_row(business_scenario_name)
+        market_factor = float(tables.market_factor[scenario_row])
+        tax_rate = float(tables.tax_rate[tables.country_row(country_code), scenario_row])
+        time_in_years = calculator_service._convert_to_years(time_period, time_unit)
+        total_investment = initial_investment + additional_costs
+
+        roi_range = tables.typical_roi_range(business_scenario_id, mini_scenario_id)
+        if roi_range is None:
+            # No reference range: spread around the calculator's base rate
+            base_rate = float(tables.base_roi_rate[scenario_row, tables.mini_column(tables.mini_scenario_name(mini_scenario_id))])
+            roi_range = (base_rate * 0.5, base_rate * 1.5)
+        roi_mean = (roi_range[0] + roi_range[1]) / 2
+        roi_sd = (roi_range[1] - roi_range[0]) / (2 * TYPICAL_RANGE_Z)
+
+        # Histogram bounds cover +/- 6 standard deviations of every source of uncertainty
+        roi_bounds = (roi_mean - 6 * roi_sd, roi_mean + 6 * roi_sd)
+        drift = -0.5 * market_volatility ** 2
+        market_bounds = (market_factor * math.exp(drift - 6 * market_volatility),
+                         market_factor * math.exp(drift + 6 * market_volatility))
+        corners = [r * m for r in roi_bounds for m in market_bounds]
+        low, high = max(min(corners), -100.0), max(max(corners), -100.0)
+
+        roi_histogram = _StreamingHistogram(low, high)
+        after_tax_histogram = _StreamingHistogram(low, high)
+        losses = 0
+
+        rng = np.random.default_rng(seed)
+        remaining = paths
+        while remaining > 0:
+            size = min(remaining, SIMULATION_CHUNK_SIZE)
+            remaining -= size
+
+            roi = roi_mean + roi_sd * rng.standard_normal(size)
+            market = market_factor * np.exp(drift + market_volatility * rng.standard_normal(size))
+            taxes = np.clip(tax_rate + tax_volatility * rng.standard_normal(size), 0.0, 100.0)
+
+            roi_total = np.maximum(roi * market, -100.0)
+            after_tax_roi = np.where(roi_total > 0, roi_total * (1 - taxes / 100), roi_total)
+
+            roi_histogram.add(roi_total)
+            after_tax_histogram.add(after_tax_roi)
+            losses += int(np.count_nonzero(after_tax_roi < 0))
+
+        # Profits and annualized ROI are monotone in ROI, so their percentiles follow directly
+        roi_quantiles = roi_histogram.quantiles(percentiles)
+        after_tax_quantiles = after_tax_histogram.quantiles(percentiles)
+        if time_in_years > 0:
+            annualized_quantiles = (np.power(1 + roi_quantiles / 100, 1 / time_in_years) - 1) * 100
+        else:
+            annualized_quantiles = roi_quantiles
+
+        def as_percentiles(values: np.ndarray) -> Dict[str, float]:
+            return {f"p{p:g}": round(value, 2) for p, value in zip(percentiles, values.tolist())}
+
+        edges, frequencies = after_tax_histogram.coarse(histogram_bins)
+
+        return {
+            'paths': paths,
+            'seed': seed,
+            'business_scenario_name': business_scenario_name,
+            'total_investment': round(total_investment, 2),
+            'time_in_years': time_in_years,
+            'assumptions': {
+                'typical_roi_range': [round(roi_range[0], 2), round(roi_range[1], 2)],
+                'market_factor': market_factor,
+                'market_volatility': market_volatility,
+                'effective_tax_rate': round(tax_rate, 2),
+                'tax_volatility': tax_volatility,
+            },
+            'mean': {
+                'roi_percentage': round(roi_histogram.mean(), 2),
+                'after_tax_roi': round(after_tax_histogram.mean(), 2),
+                'net_profit': round(total_investment * roi_histogram.mean() / 100, 2),
+                'after_tax_profit': round(total_investment * after_tax_histogram.mean() / 100, 2),
+            },
+            'std': {
+                'roi_percentage': round(roi_histogram.std(), 2),
+                'after_tax_roi': round(after_tax_histogram.std(), 2),
+            },
+            'percentiles': {
+                'roi_percentage': as_percentiles(roi_quantiles),
+                'after_tax_roi': as_percentiles(after_tax_quantiles),
+                'annualized_roi': as_percentiles(annualized_quantiles),
+                'net_profit': as_percentiles(total_investment * roi_quantiles / 100),
+                'after_tax_profit': as_percentiles(total_investment * after_tax_quantiles / 100),
+            },
+            'probability_of_loss': round(losses / paths, 4),
+            'histogram': {
+                'metric': 'after_tax_roi',
+                'edges': edges,
+                'frequencies': frequencies,
+            },
+        }
+
+# Global simulation service instance
+simulation_service = ROISimulationService()
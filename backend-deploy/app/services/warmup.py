@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from sqlalchemy import func
+
+from app.cache import cache_manager
+from app.database import SessionLocal, TaxCountry, ROICalculation
+from app.services.calculator import calculator_service
+from app.services.factor_tables import get_factor_tables
+from app.services.market_data import MarketDataService
+
+# Upper bound on warm-up (seconds); the service reports ready once it is reached
+# even if some stages did not finish. 0 skips warm-up.
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))
+
+# Precompute this many of the most frequent calculations among the latest WARMUP_RECENT_ROWS
+WARMUP_TOP_CALCULATIONS = int(os.getenv("WARMUP_TOP_CALCULATIONS", "200"))
+WARMUP_RECENT_ROWS = int(os.getenv("WARMUP_RECENT_ROWS", "10000"))
+
+class CacheWarmer:
+    """Fills the market analysis, tax data and calculation caches after startup"""
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.stats: Dict[str, Any] = {"state": "pending"}
+
+    def run(self, timeout: float = WARMUP_TIMEOUT) -> Dict[str, Any]:
+        """Run every warm-up stage until done or out of time, then mark the service ready"""
+        started = time.monotonic()
+        deadline = started + timeout
+        stats = {"state": "running", "market_analysis": 0, "tax_data": 0, "calculations": 0, "timed_out": False}
+        self.stats = stats
+        db = SessionLocal()
+        try:
+            for stage in (self._warm_market_analysis, self._warm_tax_data, self._warm_calculations):
+                if not stage(db, deadline, stats):
+                    stats["timed_out"] = True
+                    break
+        except Exception as e:
+            stats["error"] = str(e)
+            print(f"❌ Cache warm-up failed: {e}")
+        finally:
+            db.close()
+            stats["state"] = "done"
+            stats["seconds"] = round(time.monotonic() - started, 3)
+            self.ready.set()
+        return stats
+
+    def start(self, timeout: float = WARMUP_TIMEOUT) -> Optional[threading.Thread]:
+        """Warm up in a background thread; with a zero timeout the service is ready at once"""
+        if timeout <= 0:
+            self.stats = {"state": "skipped"}
+            self.ready.set()
+            return None
+
+        def run():
+            stats = self.run(timeout)
+            print(
+                f"🔥 Cache warm-up {'timed out' if stats['timed_out'] else 'finished'} in {stats['seconds']}s: "
+                f"{stats['market_analysis']} market analyses, {stats['tax_data']} countries, "
+                f"{stats['calculations']} calculations"
+            )
+
+        thread = threading.Thread(target=run, name="cache-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_market_analysis(self, db, deadline: float, stats: Dict[str, Any]) -> bool:
+        tables = get_factor_tables()
+        market_data = MarketDataService()
+        for scenario_id in tables.scenario_ids:
+            if time.monotonic() > deadline:
+                return False
+            name = tables.scenario_name(scenario_id)
+            calculator_service._generate_market_analysis(name, None)
+            cache_manager.get_or_compute(
+                f"market_data:{scenario_id}", lambda name=name: market_data.get_market_data(name), 86400
+            )
+            stats["market_analysis"] += 1
+        return True
+
+    def _warm_tax_data(self, db, deadline: float, stats: Dict[str, Any]) -> bool:
+        for country in db.query(TaxCountry).all():
+            if time.monotonic() > deadline:
+                return False
+            cache_manager.set_tax_data(country.country_code, {
+                "country_code": country.country_code,
+                "country_name": country.country_name,
+                "corporate_tax_rate": country.corporate_tax_rate,
+                "currency": country.currency,
+                "gdp_per_capita": country.gdp_per_capita,
+                "ease_of_business_rank": country.ease_of_business_rank
+            })
+            stats["tax_data"] += 1
+        return True
+
+    def _warm_calculations(self, db, deadline: float, stats: Dict[str, Any]) -> bool:
+        if WARMUP_TOP_CALCULATIONS <= 0:
+            return True
+        recent = db.query(ROICalculation.id).order_by(ROICalculation.id.desc()).limit(WARMUP_RECENT_ROWS).subquery()
+        columns = (
+            ROICalculation.business_scenario_id,
+            ROICalculation.mini_scenario_id,
+            ROICalculation.country_id,
+            ROICalculation.initial_investment,
+            ROICalculation.additional_costs,
+            ROICalculation.time_period,
+            ROICalculation.time_unit,
+        )
+        popular = (
+            db.query(*columns)
+            .join(recent, recent.c.id == ROICalculation.id)
+            .filter(ROICalculation.country_id.isnot(None))
+            .group_by(*columns)
+            .order_by(func.count().desc())
+            .limit(WARMUP_TOP_CALCULATIONS)
+            .all()
+        )
+
+        tables = get_factor_tables()
+        for row in popular:
+            if time.monotonic() > deadline:
+                return False
+            country_code = tables.country_code(row.country_id)
+            if country_code is None:
+                continue
+            calculator_service.calculate_roi(
+                initial_investment=row.initial_investment or 0,
+                additional_costs=row.additional_costs or 0,
+                time_period=row.time_period or 1,
+                time_unit=row.time_unit or "years",
+                business_scenario_id=row.business_scenario_id,
+                mini_scenario_id=row.mini_scenario_id,
+                country_code=country_code,
+                business_scenario_name=tables.scenario_name(row.business_scenario_id),
+                mini_scenario_name=tables.mini_scenario_name(row.mini_scenario_id)
+            )
+            stats["calculations"] += 1
+        return True
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
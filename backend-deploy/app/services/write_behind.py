@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, DisconnectionError
+
+from app.database import SessionLocal, ROICalculation
+
+# Flush when this many rows are buffered or the oldest has waited WRITE_BEHIND_FLUSH_MS
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500"))
+WRITE_BEHIND_FLUSH_MS = int(os.getenv("WRITE_BEHIND_FLUSH_MS", "200"))
+
+# Rows held in memory at most; beyond this, producers wait for the writer to catch up
+WRITE_BEHIND_MAX_BUFFER = int(os.getenv("WRITE_BEHIND_MAX_BUFFER", "10000"))
+WRITE_BEHIND_PUT_TIMEOUT = float(os.getenv("WRITE_BEHIND_PUT_TIMEOUT", "5"))
+
+# Failed batches are retried with exponential backoff. Lost connections are
+# retried until they succeed; any other error, including other OperationalErrors
+# such as lock timeouts, falls back to row-by-row inserts after
+# WRITE_BEHIND_MAX_RETRIES so one bad row cannot hold up the rest.
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "5"))
+WRITE_BEHIND_MAX_BACKOFF = float(os.getenv("WRITE_BEHIND_MAX_BACKOFF", "10"))
+
+class BufferFull(RuntimeError):
+    """The write-behind buffer stayed full for the whole put timeout"""
+
+def _is_disconnect(error: Exception) -> bool:
+    """The database connection was lost, as opposed to the statement failing"""
+    return isinstance(error, DisconnectionError) or (
+        isinstance(error, DBAPIError) and error.connection_invalidated
+    )
+
+class WriteBehindQueue:
+    """Buffers rows for one model and bulk-inserts them from a background thread.
+
+    Rows are dicts of column values. They stay visible through pending() from
+    the moment they are accepted until their batch is committed or dropped.
+    """
+
+    def __init__(self, model, batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+                 flush_ms: int = WRITE_BEHIND_FLUSH_MS, max_buffer: int = WRITE_BEHIND_MAX_BUFFER,
+                 max_retries: int = WRITE_BEHIND_MAX_RETRIES, key: str = "session_id"):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+        self.key = key
+        self._buffer = deque()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._in_flight = 0
+        self._oldest: Optional[float] = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"accepted": 0, "written": 0, "batches": 0, "failures": 0, "dropped": 0, "waits": 0, "rejected": 0}
+        self._last_flush_ms = 0.0
+
+    def offer(self, row: Dict[str, Any]) -> bool:
+        """Buffer a row without blocking; False when the buffer is full"""
+        with self._condition:
+            if self._buffered() >= self.max_buffer:
+                return False
+            self._append(row)
+            return True
+
+    def put(self, row: Dict[str, Any], timeout: float = WRITE_BEHIND_PUT_TIMEOUT):
+        """Buffer a row, waiting up to timeout seconds for room (blocking; run it off the event loop)"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if self._buffered() >= self.max_buffer:
+                self._counters["waits"] += 1
+            while self._buffered() >= self.max_buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["rejected"] += 1
+                    raise BufferFull(f"{self.model.__tablename__} write buffer is full")
+                self._condition.wait(remaining)
+            self._append(row)
+
+    def pending(self, key: str) -> Optional[Dict[str, Any]]:
+        """A row that was accepted but is not committed yet"""
+        with self._condition:
+            return self._pending.get(key)
+
+    def _buffered(self) -> int:
+        return len(self._buffer) + self._in_flight
+
+    def _append(self, row: Dict[str, Any]):
+        self._buffer.append(row)
+        if row.get(self.key) is not None:
+            self._pending[row[self.key]] = row
+        self._counters["accepted"] += 1
+        if self._oldest is None:
+            # Wake the writer so it starts the flush timer for this row
+            self._oldest = time.monotonic()
+            self._condition.notify_all()
+        elif len(self._buffer) >= self.batch_size:
+            self._condition.notify_all()
+
+    def start(self) -> threading.Thread:
+        """Start the background writer"""
+        with self._condition:
+            self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=f"{self.model.__tablename__}-writer", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = 30) -> int:
+        """Flush everything still buffered, then stop the writer. Returns rows left unwritten."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._condition:
+            return self._buffered()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopping and not self._due():
+                    wait = None if self._oldest is None else self._oldest + self.flush_interval - time.monotonic()
+                    self._condition.wait(wait)
+                if not self._buffer:
+                    return
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._in_flight = len(batch)
+                self._oldest = time.monotonic() if self._buffer else None
+            self._flush(batch)
+
+    def _due(self) -> bool:
+        if len(self._buffer) >= self.batch_size:
+            return True
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        """Insert one batch, retrying with backoff; always releases the batch"""
+        attempt = 0
+        written = 0
+        while True:
+            started = time.monotonic()
+            try:
+                self._insert(batch)
+                written = len(batch)
+                break
+            except Exception as e:
+                attempt += 1
+                with self._condition:
+                    self._counters["failures"] += 1
+                print(f"❌ Failed to write {len(batch)} {self.model.__tablename__} rows (attempt {attempt}): {e}")
+                if attempt >= self.max_retries and not _is_disconnect(e):
+                    written = self._insert_each(batch)
+                    break
+                if self._stopping and attempt >= self.max_retries:
+                    # Shutting down with the database unreachable: give up on the batch
+                    break
+                time.sleep(min(0.1 * 2 ** attempt, WRITE_BEHIND_MAX_BACKOFF))
+
+        with self._condition:
+            self._last_flush_ms = round((time.monotonic() - started) * 1000, 3)
+            self._counters["written"] += written
+            self._counters["dropped"] += len(batch) - written
+            self._counters["batches"] += 1
+            for row in batch:
+                if self._pending.get(row.get(self.key)) is row:
+                    del self._pending[row[self.key]]
+            self._in_flight = 0
+            self._condition.notify_all()
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        db = SessionLocal()
+        try:
+            db.execute(insert(self.model), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _insert_each(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows one at a time, dropping only the ones that fail on their own"""
+        written = 0
+        for row in rows:
+            try:
+                self._insert([row])
+                written += 1
+            except Exception as e:
+                print(f"❌ Dropped {self.model.__tablename__} row {row.get(self.key)}: {e}")
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "table": self.model.__tablename__,
+                "buffered": len(self._buffer),
+                "in_flight": self._in_flight,
+                "max_buffer": self.max_buffer,
+                "batch_size": self.batch_size,
+                "flush_ms": int(self.flush_interval * 1000),
+                **self._counters,
+                "last_flush_ms": self._last_flush_ms,
+                "running": self._thread is not None and self._thread.is_alive(),
+            }
+
+# Global calculation writer instance
+calculation_writer = WriteBehindQueue(ROICalculation)
@@ -0,0 +1,66 @@
+"""Check that /compare's matrix engine returns exactly what /calculate returns.
+
+Runs calculate_roi_matrix on random inputs and compares every result field with
+calculate_roi for the same scenario and country. The one tolerated difference
+is the last digit of annualized ROI above 1e9 %, where NumPy's pow and math.pow
+can differ by one ulp (the batch path has the same caveat). Reads the configured database
+(or the built-in seed data when it is empty) and writes nothing.
+
+    cd backend-deploy && PYTHONPATH=. python scripts/check_matrix_parity.py [rounds] [seed]
+"""
+import math
+import random
+import sys
+
+from app.services.calculator import calculator_service, BATCH_RESULT_FIELDS
+from app.services.factor_tables import get_factor_tables
+
+TIME_UNITS = ("days", "weeks", "months", "years")
+
+def same(field: str, actual, expected) -> bool:
+    if actual == expected:
+        return True
+    return (field == "annualized_roi" and actual is not None and expected is not None
+            and abs(expected) > 1e9 and math.isclose(actual, expected, rel_tol=1e-12))
+
+def main(rounds: int = 200, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    tables = get_factor_tables()
+    scenario_ids = sorted(tables.scenario_ids)
+    country_codes = list(tables.country_codes)
+    mini_names = sorted(set(tables.mini_scenario_names.values())) or ["General"]
+
+    cells = mismatches = 0
+    for _ in range(rounds):
+        ids = rng.sample(scenario_ids, rng.randint(1, min(8, len(scenario_ids))))
+        codes = rng.sample(country_codes, rng.randint(1, min(5, len(country_codes))))
+        inputs = {
+            "initial_investment": round(rng.uniform(100, 5_000_000), rng.choice((0, 2))),
+            "additional_costs": round(rng.uniform(0, 50_000), rng.choice((0, 2))),
+            "time_period": rng.choice((rng.randint(1, 60), round(rng.uniform(0.5, 30), 1))),
+            "time_unit": rng.choice(TIME_UNITS),
+        }
+        mini_scenario_name = rng.choice(mini_names)
+        rows = calculator_service.calculate_roi_matrix(
+            business_scenario_ids=ids, country_codes=codes,
+            mini_scenario_name=mini_scenario_name, sections=(), **inputs
+        )
+        for row in rows:
+            expected = calculator_service.calculate_roi(
+                business_scenario_id=row["scenario_id"], mini_scenario_id=0,
+                country_code=row["country_code"], business_scenario_name=row["scenario_name"],
+                mini_scenario_name=mini_scenario_name, sections=(), **inputs
+            )
+            cells += 1
+            for field in BATCH_RESULT_FIELDS:
+                if not same(field, row[field], expected[field]):
+                    mismatches += 1
+                    if mismatches <= 10:
+                        print(f"❌ {field}: matrix {row[field]} != scalar {expected[field]} "
+                              f"({row['scenario_name']}, {row['country_code']}, {inputs})")
+
+    print(f"{'✅' if not mismatches else '❌'} {cells} cells, {mismatches} mismatched fields")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:3])))
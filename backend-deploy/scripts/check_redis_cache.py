@@ -0,0 +1,63 @@
+"""Smoke test RedisCache: get/set/incr/items/clear/stats and TTL behaviour.
+
+Runs against the in-process RESP stand-in (scripts/resp_stand_in.py) unless a
+redis:// URL is given. Only keys under a throwaway prefix are touched.
+
+    cd backend-deploy && PYTHONPATH=. python scripts/check_redis_cache.py [redis://host:port/db]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.cache_backends import RespClient, RedisCache
+from resp_stand_in import RespStandIn
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+    print(f"✅ {message}")
+
+def main(url: str = None) -> int:
+    url = url or RespStandIn().start().url
+    client = RespClient.from_url(url)
+    cache = RedisCache(client, prefix=f"investroi-smoke-{os.getpid()}:")
+    other = RedisCache(client, prefix=f"investroi-smoke-{os.getpid()}-other:")
+    print(f"Checking RedisCache against {url}")
+
+    check(cache.get("session:missing") is None, "missing key reads as None")
+    cache.set("session:a", {"roi": 12.5, "tags": ["x"]}, 60)
+    check(cache.get("session:a") == {"roi": 12.5, "tags": ["x"]}, "set/get round-trips JSON values")
+    cache.set("http_response:a", b"\x00{\"raw\":1}", 60)
+    check(cache.get("http_response:a") == b"\x00{\"raw\":1}", "set/get round-trips bytes values")
+
+    cache.set("session:short", 1, 0.05)
+    time.sleep(0.1)
+    check(cache.get("session:short") is None, "entries expire after their TTL")
+
+    check(cache.incr("counter:a", 5, ttl=60) == 5, "incr creates a missing key")
+    check(cache.incr("counter:a", 2, ttl=3600) == 7, "incr adds to an existing key")
+    ttl_ms = client.execute("PTTL", cache.prefix + "counter:a")
+    check(0 < ttl_ms <= 60000, "incr sets the TTL on creation and keeps it afterwards")
+    cache.incr("counter:short", 1, ttl=0.05)
+    cache.incr("counter:short", 1, ttl=60)
+    time.sleep(0.1)
+    check(cache.get("counter:short") is None, "repeated incr does not extend the expiry")
+
+    cache.set("session:b", 2, 60)
+    other.set("session:c", 3, 60)
+    check(dict(cache.items("session")) == {"session:a": {"roi": 12.5, "tags": ["x"]}, "session:b": 2},
+          "items returns one namespace under this prefix")
+
+    check("entries" not in cache.stats(), "stats does not scan keys by default")
+    check(cache.stats(detailed=True)["entries"] == 4, "detailed stats counts this prefix's keys")
+
+    cache.clear()
+    check(cache.get("session:a") is None and not dict(cache.items("session")), "clear removes this prefix's keys")
+    check(other.get("session:c") == 3, "clear leaves other prefixes alone")
+    other.clear()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
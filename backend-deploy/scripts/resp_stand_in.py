@@ -0,0 +1,152 @@
+"""Minimal in-memory Redis (RESP2) stand-in for exercising RedisCache without a server.
+
+Implements only the commands RespClient and RedisCache send: PING, AUTH, SELECT,
+GET, SET [PX ms] [NX], MGET, INCRBY, PEXPIRE, PTTL, DEL, SCAN ... MATCH ... COUNT,
+MULTI and EXEC. Not for production use.
+
+    cd backend-deploy && python scripts/resp_stand_in.py [port]
+"""
+import fnmatch
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+class RespStore:
+    """Keys with optional expiry, shared by every connection"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def live(self, key: bytes) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self.data[key]
+            return None
+        return entry
+
+class CommandError(Exception):
+    pass
+
+def execute(store: RespStore, args: list) -> Any:
+    """Run one command with the store lock held; returns a reply value"""
+    command = args[0].upper()
+    if command == b"PING":
+        return "PONG"
+    if command in (b"AUTH", b"SELECT"):
+        return "OK"
+    if command == b"GET":
+        entry = store.live(args[1])
+        return entry[0] if entry else None
+    if command == b"MGET":
+        return [(store.live(key) or (None,))[0] for key in args[1:]]
+    if command == b"SET":
+        key, value, options = args[1], args[2], [arg.upper() for arg in args[3:]]
+        if b"NX" in options and store.live(key) is not None:
+            return None
+        expires_at = time.time() + int(options[options.index(b"PX") + 1]) / 1000 if b"PX" in options else None
+        store.data[key] = (value, expires_at)
+        return "OK"
+    if command == b"INCRBY":
+        entry = store.live(args[1])
+        try:
+            value = (int(entry[0]) if entry else 0) + int(args[2])
+        except ValueError:
+            raise CommandError("ERR value is not an integer or out of range")
+        store.data[args[1]] = (str(value).encode(), entry[1] if entry else None)
+        return value
+    if command == b"PEXPIRE":
+        entry = store.live(args[1])
+        if entry is None:
+            return 0
+        store.data[args[1]] = (entry[0], time.time() + int(args[2]) / 1000)
+        return 1
+    if command == b"PTTL":
+        entry = store.live(args[1])
+        if entry is None:
+            return -2
+        return -1 if entry[1] is None else int((entry[1] - time.time()) * 1000)
+    if command == b"DEL":
+        return sum(store.data.pop(key, None) is not None for key in args[1:] if store.live(key) is not None)
+    if command == b"SCAN":
+        # Everything in one page; callers must still follow the cursor protocol
+        pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+        keys = [key for key in list(store.data) if store.live(key) is not None and fnmatch.fnmatchcase(key.decode(), pattern)]
+        return [b"0", keys]
+    raise CommandError(f"ERR unknown command '{command.decode()}'")
+
+def encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, CommandError):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def read_command(self) -> Optional[list]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        store = self.server.store
+        queued = None
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            command = args[0].upper()
+            if command == b"MULTI":
+                queued, reply = [], "OK"
+            elif command == b"EXEC":
+                with store.lock:
+                    reply = [self.run(store, queued_args) for queued_args in queued or []]
+                queued = None
+            elif queued is not None:
+                queued.append(args)
+                reply = "QUEUED"
+            else:
+                with store.lock:
+                    reply = self.run(store, args)
+            self.wfile.write(encode(reply))
+
+    @staticmethod
+    def run(store: RespStore, args: list) -> Any:
+        try:
+            return execute(store, args)
+        except CommandError as e:
+            return e
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0):
+        super().__init__(("127.0.0.1", port), RespHandler)
+        self.store = RespStore()
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def start(self) -> "RespStandIn":
+        threading.Thread(target=self.serve_forever, name="resp-stand-in", daemon=True).start()
+        return self
+
+if __name__ == "__main__":
+    server = RespStandIn(int(sys.argv[1]) if len(sys.argv) > 1 else 6379)
+    print(f"RESP stand-in listening on {server.url}")
+    server.serve_forever()
@@ -8,33 +8,38 @@ import sys
 import os
 import subprocess
 
-print("🚀 Starting InvestWise Pro Backend...")
+# Everything runs from main() so worker processes started with spawn or forkserver,
+# which import this file as __mp_main__, do not rerun the launcher
+def main():
+    print("🚀 Starting InvestWise Pro Backend...")
 
-# Install dependencies if needed
-try:
-    import fastapi
-    print("✅ FastAPI already available")
-except ImportError:
-    print("📦 Installing Python dependencies...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "--user", "-r", "requirements.txt"], check=True)
+    # Install dependencies if needed
+    try:
+        import fastapi
+        print("✅ FastAPI already available")
+    except ImportError:
+        print("📦 Installing Python dependencies...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "--user", "-r", "requirements.txt"], check=True)
 
-# Add backend-deploy to Python path
-backend_path = os.path.join(os.path.dirname(__file__), 'backend-deploy')
-sys.path.insert(0, backend_path)
+    # Add backend-deploy to Python path
+    backend_path = os.path.join(os.path.dirname(__file__), 'backend-deploy')
+    sys.path.insert(0, backend_path)
 
-print(f"📁 Backend path: {backend_path}")
-print(f"🐍 Python path: {sys.path[:3]}...")
+    print(f"📁 Backend path: {backend_path}")
+    print(f"🐍 Python path: {sys.path[:3]}...")
 
-# Import and run the FastAPI app
-try:
-    from app.main import app
-    print("✅ FastAPI app imported successfully")
-except ImportError as e:
-    print(f"❌ Failed to import app: {e}")
-    sys.exit(1)
-
-if __name__ == "__main__":
+    # Import and run the FastAPI app
+    try:
+        from app.main import app
+        print("✅ FastAPI app imported successfully")
+    except ImportError as e:
+        print(f"❌ Failed to import app: {e}")
+        sys.exit(1)
+    
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
     print(f"🎯 Starting server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file